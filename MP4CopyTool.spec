@@ -1,4 +1,5 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
 
 a = Analysis(
@@ -10,25 +11,25 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=['matplotlib', 'tkinter.ttk', 'numpy.testing', 'numpy.f2py'],
+    excludes=['matplotlib', 'numpy.testing', 'numpy.f2py'],
     noarchive=False,
     optimize=2,
 )
 pyz = PYZ(a.pure)
 
+# 目录模式（onedir）：单文件模式每次启动都要把 Python 运行库和 OpenCV/NumPy 的 DLL
+# 解压到临时目录，占去大部分启动时间；目录模式直接从 dist/MP4CopyTool/ 加载。
+# cv2 在函数内导入（只在 MP4 头部解析失败时使用），PyInstaller 仍能静态发现并打包。
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [('O', None, 'OPTION'), ('O', None, 'OPTION')],
+    exclude_binaries=True,
     name='MP4CopyTool',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
     upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +37,22 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+# 以下 DLL 不用 UPX 压缩：体积大的库每次加载都要先解压，耗时超过读盘节省的时间，
+# 压缩后的 VC 运行库也可能无法加载。upx_exclude 按文件名精确匹配，
+# 带版本号的 OpenCV/NumPy 库名从 a.binaries 中找出。
+upx_exclude = ['vcruntime140.dll', 'vcruntime140_1.dll', 'msvcp140.dll', 'tcl86t.dll', 'tk86t.dll']
+upx_exclude += [
+    os.path.basename(dest) for dest, _, _ in a.binaries
+    if os.path.basename(dest).lower().startswith(('python3', 'opencv_', 'cv2', 'libopenblas'))
+]
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=upx_exclude,
+    name='MP4CopyTool',
+)
\ No newline at end of file
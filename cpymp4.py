@@ -9,10 +9,21 @@ MP4文件拷贝工具
 日期：
 
 注意：此文件是重构后的入口文件，实际逻辑在src目录下实现。
+不带参数运行时启动图形界面；带参数时以命令行方式运行（见 src/frameworks/cli.py），不导入 Tkinter。
+--startup-time [报告文件] 测量图形界面的启动耗时（见 src/frameworks/startup_profile.py）。
 """
 
-from src.frameworks.main import main
+import sys
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--startup-time":
+        from src.frameworks.startup_profile import profile_startup
+        sys.exit(profile_startup(sys.argv[2:]))
+    
+    if len(sys.argv) > 1:
+        from src.frameworks.cli import main as cli_main
+        sys.exit(cli_main())
+    
+    from src.frameworks.main import main
     main()
\ No newline at end of file
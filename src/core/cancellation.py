@@ -0,0 +1,73 @@
+"""
+取消与暂停
+
+清洁架构的最内层，定义在扫描和传输之间传递的取消令牌。
+长时间运行的操作在处理每个目录、文件和数据块之间调用 checkpoint()，
+以便及时响应暂停和取消请求。
+"""
+
+import threading
+
+
+class OperationCancelledError(Exception):
+    """
+    操作已被取消
+    
+    由 CancellationToken.checkpoint() 抛出，在调用栈中逐层传递，
+    直到负责清理和汇总结果的代码将其捕获。
+    """
+    
+    def __init__(self, message: str = "操作已取消"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """
+    取消令牌（线程安全）
+    
+    同一个令牌可以在多个线程之间共享：界面线程调用 pause()、resume()、cancel()，
+    工作线程在安全点调用 checkpoint()。暂停时 checkpoint() 阻塞直到恢复或取消，
+    取消后 checkpoint() 抛出 OperationCancelledError。取消不可撤销。
+    """
+    
+    def __init__(self):
+        """初始化取消令牌（未暂停、未取消）"""
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+    
+    def cancel(self) -> None:
+        """请求取消，同时唤醒所有因暂停而阻塞的线程"""
+        self._cancelled.set()
+        self._running.set()
+    
+    def pause(self) -> None:
+        """请求暂停，工作线程在下一个安全点阻塞"""
+        if not self._cancelled.is_set():
+            self._running.clear()
+    
+    def resume(self) -> None:
+        """从暂停中恢复"""
+        self._running.set()
+    
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancelled.is_set()
+    
+    @property
+    def is_paused(self) -> bool:
+        """是否处于暂停状态"""
+        return not self._running.is_set()
+    
+    def checkpoint(self) -> None:
+        """
+        安全点：暂停时阻塞，取消时抛出异常
+        
+        Raises:
+            OperationCancelledError: 已请求取消
+        """
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancelled.is_set():
+            raise OperationCancelledError()
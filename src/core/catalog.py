@@ -0,0 +1,357 @@
+"""
+视频目录实体
+
+清洁架构的最内层，以紧凑的列式结构保存一次扫描得到的全部视频文件：
+路径、时长、大小、修改时间分别存放在并行数组中，按需创建轻量的只读视图。
+同时维护按时长排序的索引，使时长范围查询只需两次二分查找。
+"""
+
+import os
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from .entities import VideoFile, ScanDelta
+
+
+# 大小 / 修改时间未知时在数组中的占位值
+_UNKNOWN = -1
+
+_numpy_module = None
+_numpy_checked = False
+
+
+def _numpy():
+    """
+    首次使用时导入 NumPy（可选依赖）
+    
+    Returns:
+        NumPy 模块，未安装时返回None
+    """
+    global _numpy_module, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = None
+        _numpy_checked = True
+    return _numpy_module
+
+
+class VideoFileView:
+    """
+    视频目录中一行的只读视图
+    
+    与 VideoFile 具有相同的属性（path、duration、filename、size、mtime_ns），
+    数据仍保存在目录的列式数组中，视图本身只占用两个槽位。
+    """
+    
+    __slots__ = ('_catalog', 'row')
+    
+    def __init__(self, catalog: 'VideoCatalog', row: int):
+        self._catalog = catalog
+        self.row = row
+    
+    @property
+    def path(self) -> str:
+        return self._catalog._paths[self.row]
+    
+    @property
+    def duration(self) -> float:
+        return self._catalog._durations[self.row]
+    
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self._catalog._paths[self.row])
+    
+    @property
+    def size(self) -> Optional[int]:
+        size = self._catalog._sizes[self.row]
+        return None if size == _UNKNOWN else size
+    
+    @property
+    def mtime_ns(self) -> Optional[int]:
+        mtime_ns = self._catalog._mtimes[self.row]
+        return None if mtime_ns == _UNKNOWN else mtime_ns
+    
+    def to_video_file(self) -> VideoFile:
+        """
+        转换为独立的 VideoFile 实体
+        
+        Returns:
+            VideoFile: 视频文件实体
+        """
+        return VideoFile(self.path, self.duration, self.filename, self.size, self.mtime_ns)
+    
+    def __repr__(self) -> str:
+        return f"VideoFileView(path={self.path!r}, duration={self.duration!r})"
+
+
+class VideoCatalog:
+    """
+    视频目录
+    
+    行号为文件加入目录时的顺序下标。每个条目除路径字符串外约占 32 字节
+    （时长、大小、修改时间各 8 字节的数组元素，以及路径列表中的一个指针；
+    20 万条目实测约 33.5 字节，差额为数组的预留空间），路径字符串与扫描时共用同一个对象。
+    路径到行号的字典只在首次调用 index_of 时建立。
+    filter_by_duration 为每个结果创建一个视图（连同行号整数约 90 字节），
+    只需计数时应使用 count_in_duration_range。
+    时长索引在追加后延迟重建，连续的多次查询共享同一份索引；
+    安装了 NumPy 时排序和范围查询使用向量化实现。
+    """
+    
+    def __init__(self, videos: Optional[Iterable[VideoFile]] = None):
+        """
+        初始化视频目录
+        
+        Args:
+            videos: 初始的视频文件（可选）
+        """
+        self._paths: List[str] = []
+        self._durations = array('d')
+        self._sizes = array('q')
+        self._mtimes = array('q')
+        self._row_by_path: Optional[Dict[str, int]] = None
+        # 按时长升序排列的行号和对应时长（并行数组）
+        self._sorted_rows: Sequence[int] = array('q')
+        self._sorted_durations: Sequence[float] = array('d')
+        self._index_dirty = False
+        if videos is not None:
+            self.extend(videos)
+    
+    def __len__(self) -> int:
+        return len(self._paths)
+    
+    def __getitem__(self, row: int) -> VideoFileView:
+        if row < 0:
+            row += len(self._paths)
+        if not 0 <= row < len(self._paths):
+            raise IndexError(row)
+        return VideoFileView(self, row)
+    
+    def __iter__(self) -> Iterator[VideoFileView]:
+        for row in range(len(self._paths)):
+            yield VideoFileView(self, row)
+    
+    def extend(self, videos: Iterable[VideoFile]) -> None:
+        """
+        追加视频文件，数据拆分到各列数组中
+        
+        Args:
+            videos: 要追加的视频文件
+        """
+        for video in videos:
+            if self._row_by_path is not None:
+                self._row_by_path[video.path] = len(self._paths)
+            self._paths.append(video.path)
+            self._durations.append(video.duration)
+            self._sizes.append(_UNKNOWN if video.size is None else video.size)
+            self._mtimes.append(_UNKNOWN if video.mtime_ns is None else video.mtime_ns)
+            self._index_dirty = True
+    
+    def apply_delta(self, delta: ScanDelta) -> None:
+        """
+        合并一次增量扫描的结果
+        
+        删除会压缩各列数组，之后的行号随之改变；修改在原行上更新；新增追加到末尾。
+        delta.full 为 True 时清空后整体替换。
+        
+        Args:
+            delta: 扫描增量
+        """
+        if delta.full:
+            self._paths = []
+            self._durations = array('d')
+            self._sizes = array('q')
+            self._mtimes = array('q')
+            self._row_by_path = None
+            self._index_dirty = True
+            self.extend(delta.added)
+            return
+        
+        if delta.removed:
+            self._remove_paths(delta.removed)
+        for video in delta.modified:
+            row = self.index_of(video.path)
+            if row is None:
+                self.extend([video])
+                continue
+            self._durations[row] = video.duration
+            self._sizes[row] = _UNKNOWN if video.size is None else video.size
+            self._mtimes[row] = _UNKNOWN if video.mtime_ns is None else video.mtime_ns
+            self._index_dirty = True
+        self.extend(delta.added)
+    
+    def _remove_paths(self, paths: Iterable[str]) -> None:
+        """
+        删除指定路径的行并压缩各列数组
+        
+        Args:
+            paths: 要删除的文件路径
+        """
+        removed = {row for row in map(self.index_of, paths) if row is not None}
+        if not removed:
+            return
+        keep = [row for row in range(len(self._paths)) if row not in removed]
+        self._paths = [self._paths[row] for row in keep]
+        self._durations = array('d', (self._durations[row] for row in keep))
+        self._sizes = array('q', (self._sizes[row] for row in keep))
+        self._mtimes = array('q', (self._mtimes[row] for row in keep))
+        self._row_by_path = None
+        self._index_dirty = True
+    
+    def index_of(self, path: str) -> Optional[int]:
+        """
+        查找文件所在行号
+        
+        Args:
+            path: 文件路径
+        
+        Returns:
+            Optional[int]: 行号，不存在返回None
+        """
+        if self._row_by_path is None:
+            self._row_by_path = {p: row for row, p in enumerate(self._paths)}
+        return self._row_by_path.get(path)
+    
+    def views(self, rows: Iterable[int]) -> List[VideoFileView]:
+        """
+        为指定行创建视图
+        
+        Args:
+            rows: 行号
+        
+        Returns:
+            List[VideoFileView]: 视图列表
+        """
+        if not isinstance(rows, (list, array)) and hasattr(rows, 'tolist'):
+            # NumPy 数组一次转换为 Python 整数，避免逐个创建 NumPy 标量
+            rows = rows.tolist()
+        return [VideoFileView(self, row) for row in rows]
+    
+    def rows_sorted_by_duration(self) -> Sequence[int]:
+        """
+        获取按时长升序排列的行号
+        
+        Returns:
+            Sequence[int]: 行号序列（内部索引，调用方不应修改）
+        """
+        self._ensure_index()
+        return self._sorted_rows
+    
+    def rows_sorted_by(self, column: str, reverse: bool = False) -> List[int]:
+        """
+        获取按指定列排序的行号
+        
+        Args:
+            column: 列名（path / duration / size / mtime_ns）
+            reverse: 是否降序
+        
+        Returns:
+            List[int]: 行号列表
+        """
+        if column == "duration":
+            rows = self.rows_sorted_by_duration()
+            # NumPy 索引转换为 Python 整数列表，避免列表中保存逐个的 NumPy 标量
+            rows = rows.tolist() if hasattr(rows, 'tolist') else list(rows)
+            if reverse:
+                rows.reverse()
+            return rows
+        if column == "path":
+            return sorted(range(len(self._paths)), key=self._paths.__getitem__, reverse=reverse)
+        
+        values = self._sizes if column == "size" else self._mtimes
+        np = _numpy()
+        if np is not None and len(values):
+            order = np.argsort(np.frombuffer(values, dtype=np.int64), kind='stable')
+            return (order[::-1] if reverse else order).tolist()
+        return sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+    
+    def rows_in_duration_range(self, min_duration: float = 0.0,
+                               max_duration: float = float('inf')) -> Sequence[int]:
+        """
+        查询时长在 (min_duration, max_duration] 范围内的行号
+        
+        规则与 FilterCriteria.matches 一致，结果按时长升序排列。
+        
+        Args:
+            min_duration: 最小时长（左开区间）
+            max_duration: 最大时长（右闭区间）
+        
+        Returns:
+            Sequence[int]: 行号序列
+        """
+        lo, hi = self._duration_bounds(min_duration, max_duration)
+        return self._sorted_rows[lo:hi]
+    
+    def count_in_duration_range(self, min_duration: float = 0.0,
+                                max_duration: float = float('inf')) -> int:
+        """
+        统计时长在 (min_duration, max_duration] 范围内的文件数
+        
+        Args:
+            min_duration: 最小时长（左开区间）
+            max_duration: 最大时长（右闭区间）
+        
+        Returns:
+            int: 文件数
+        """
+        lo, hi = self._duration_bounds(min_duration, max_duration)
+        return hi - lo
+    
+    def filter_by_duration(self, min_duration: float = 0.0,
+                           max_duration: float = float('inf')) -> List[VideoFileView]:
+        """
+        按时长过滤视频文件，结果保持加入目录时的顺序
+        
+        Args:
+            min_duration: 最小时长（左开区间）
+            max_duration: 最大时长（右闭区间）
+        
+        Returns:
+            List[VideoFileView]: 符合条件的视频文件视图
+        """
+        rows = self.rows_in_duration_range(min_duration, max_duration)
+        if isinstance(rows, array):
+            rows = sorted(rows)
+        else:
+            rows = _numpy().sort(rows)
+        return self.views(rows)
+    
+    def _duration_bounds(self, min_duration: float, max_duration: float):
+        """
+        二分查找 (min_duration, max_duration] 在时长索引中的切片边界
+        
+        Args:
+            min_duration: 最小时长（左开区间）
+            max_duration: 最大时长（右闭区间）
+        
+        Returns:
+            Tuple[int, int]: 切片的起止下标
+        """
+        self._ensure_index()
+        if isinstance(self._sorted_durations, array):
+            lo = bisect_right(self._sorted_durations, min_duration)
+            hi = bisect_right(self._sorted_durations, max_duration)
+        else:
+            lo, hi = (int(i) for i in _numpy().searchsorted(
+                self._sorted_durations, [min_duration, max_duration], side='right'))
+        return lo, max(lo, hi)
+    
+    def _ensure_index(self) -> None:
+        """
+        目录有新增文件时重建时长索引
+        """
+        if not self._index_dirty:
+            return
+        np = _numpy()
+        if np is not None:
+            durations = np.frombuffer(self._durations, dtype=np.float64).copy()
+            self._sorted_rows = np.argsort(durations, kind='stable')
+            self._sorted_durations = durations[self._sorted_rows]
+        else:
+            durations = self._durations
+            self._sorted_rows = array('q', sorted(range(len(durations)), key=durations.__getitem__))
+            self._sorted_durations = array('d', (durations[row] for row in self._sorted_rows))
+        self._index_dirty = False
@@ -4,26 +4,35 @@
 清洁架构的最内层，包含业务的核心数据结构和领域规则。
 """
 
-from dataclasses import dataclass
-from typing import Optional
+import fnmatch
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 
-@dataclass
+# Python 3.10 起 dataclass 可以生成 __slots__（不能与带默认值的字段手写 __slots__ 共存）
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class VideoFile:
     """
     视频文件实体类
     
     表示系统中的视频文件，包含文件路径和时长等核心属性。
+    使用 __slots__ 而不是实例字典，对象本身约 88 字节（不含字段引用的字符串和数值）。
     """
     
     path: str  # 文件路径
     duration: float  # 视频时长（秒）
     filename: Optional[str] = None  # 文件名（可选）
+    size: Optional[int] = None  # 扫描时的文件大小（字节，可选）
+    mtime_ns: Optional[int] = None  # 扫描时的修改时间（纳秒，可选）
     
     def __post_init__(self):
         """初始化后处理，自动提取文件名"""
         if not self.filename:
-            import os
             self.filename = os.path.basename(self.path)
 
 
@@ -32,11 +41,61 @@ class FilterCriteria:
     """
     文件过滤条件实体类
     
-    定义用于筛选视频文件的条件，如时长范围。
+    定义用于筛选视频文件的条件：时长范围，以及无需打开文件即可判断的
+    大小范围、修改时间范围和文件名通配符。后者可以在扫描目录时提前判断，
+    不符合的文件不必探测时长。
     """
     
     min_duration: float = 0.0  # 最小时长（秒），左开区间
     max_duration: float = float('inf')  # 最大时长（秒），右闭区间
+    min_size: Optional[int] = None  # 最小文件大小（字节，闭区间，可选）
+    max_size: Optional[int] = None  # 最大文件大小（字节，闭区间，可选）
+    min_mtime: Optional[float] = None  # 最早修改时间（Unix 时间戳，闭区间，可选）
+    max_mtime: Optional[float] = None  # 最晚修改时间（Unix 时间戳，闭区间，可选）
+    name_patterns: List[str] = field(default_factory=list)  # 文件名通配符（不区分大小写），为空时不限制
+    
+    @property
+    def has_duration_bounds(self) -> bool:
+        """是否限制了时长范围"""
+        return self.min_duration > 0.0 or self.max_duration != float('inf')
+    
+    @property
+    def has_entry_bounds(self) -> bool:
+        """是否设置了大小、修改时间或文件名条件"""
+        return (self.min_size is not None or self.max_size is not None
+                or self.min_mtime is not None or self.max_mtime is not None
+                or bool(self.name_patterns))
+    
+    def matches_entry(self, filename: str, size: Optional[int], mtime_ns: Optional[int]) -> bool:
+        """
+        仅根据目录项信息判断文件是否可能满足条件（不检查时长）
+        
+        大小或修改时间未知时不按对应条件排除。
+        
+        Args:
+            filename: 文件名
+            size: 文件大小（字节）
+            mtime_ns: 修改时间（纳秒）
+            
+        Returns:
+            bool: 如果满足条件返回True，否则返回False
+        """
+        if size is not None:
+            if self.min_size is not None and size < self.min_size:
+                return False
+            if self.max_size is not None and size > self.max_size:
+                return False
+        if mtime_ns is not None:
+            mtime = mtime_ns / 1e9
+            if self.min_mtime is not None and mtime < self.min_mtime:
+                return False
+            if self.max_mtime is not None and mtime > self.max_mtime:
+                return False
+        if self.name_patterns:
+            lowered = filename.lower()
+            if not any(fnmatch.fnmatchcase(lowered, pattern.lower()) for pattern in self.name_patterns):
+                return False
+        return True
     
     def matches(self, video: VideoFile) -> bool:
         """
@@ -48,7 +107,165 @@ class FilterCriteria:
         Returns:
             bool: 如果满足条件返回True，否则返回False
         """
-        return self.min_duration < video.duration <= self.max_duration
+        if not self.min_duration < video.duration <= self.max_duration:
+            return False
+        return not self.has_entry_bounds or self.matches_entry(video.filename, video.size, video.mtime_ns)
+
+
+@dataclass
+class ScanDelta:
+    """
+    目录扫描增量实体类
+    
+    描述输入目录自上次扫描以来的变化。full 为 True 时表示没有可比较的历史扫描，
+    added 即为完整的文件列表，调用方应整体替换而不是合并。
+    """
+    
+    added: List[VideoFile] = field(default_factory=list)  # 新增的文件
+    removed: List[str] = field(default_factory=list)  # 已删除的文件路径
+    modified: List[VideoFile] = field(default_factory=list)  # 内容已变化（大小/修改时间不同）的文件
+    full: bool = False  # 是否为完整扫描结果
+    
+    @property
+    def is_empty(self) -> bool:
+        """是否没有任何变化"""
+        return not self.full and not (self.added or self.removed or self.modified)
+
+
+class TransferMode:
+    """
+    文件传输方式
+    """
+    
+    COPY = "copy"  # 复制
+    MOVE = "move"  # 移动
+    LINK = "link"  # 同一文件系统内创建硬链接/reflink，跨设备时复制
+
+
+class TransferOrder:
+    """
+    传输顺序策略
+    """
+    
+    WALK = "walk"  # 扫描顺序（不重新排序）
+    PHYSICAL = "physical"  # 按文件在磁盘上的物理位置（FIEMAP，不支持时按 inode），减少机械硬盘寻道
+    DIRECTORY = "directory"  # 按目录聚集，同一目录的文件连续传输
+    LARGEST_FIRST = "largest"  # 大文件优先
+    SMALLEST_FIRST = "smallest"  # 小文件优先，尽早看到完成的文件
+    INTERLEAVE = "interleave"  # 在多个源设备间轮流交错，设备内按物理位置
+
+
+@dataclass
+class TransferPlan:
+    """
+    文件传输计划实体类
+    
+    描述一次复制或移动操作：已选定的视频文件列表和目标目录。
+    用例层直接按计划执行，无需重新扫描输入目录。
+    """
+    
+    videos: List[VideoFile]  # 要传输的视频文件
+    output_dir: str  # 目标目录
+    mode: str = TransferMode.COPY  # 传输方式，见 TransferMode
+    source_dir: Optional[str] = None  # 输入目录（可选，用于校验与输出目录不同）
+    check_stale: bool = False  # 传输前是否按大小/修改时间检查文件是否已变化
+    prefer_reflink: bool = False  # 链接方式下优先使用 reflink 克隆而不是硬链接
+    skip_identical: bool = False  # 同步模式：目标已存在相同文件时跳过（不适用于移动）
+    full_hash: bool = False  # 同步模式下除抽样指纹外再比较完整文件哈希
+    verify: bool = False  # 复制/移动时计算校验值、核对目标并写入校验清单（不适用于链接）
+    order: str = TransferOrder.WALK  # 文件的排列顺序所依据的策略，见 TransferOrder
+    conflicts: List[VideoFile] = field(default_factory=list)  # 与前面的文件目标文件名相同而不传输的文件
+
+
+class TransferState:
+    """
+    传输日志中单个文件的状态
+    """
+    
+    PENDING = "pending"  # 已计划，尚未开始
+    STARTED = "started"  # 正在传输（可能带有已写入的字节偏移检查点）
+    DONE = "done"  # 已完成
+    FAILED = "failed"  # 失败，恢复时重试
+    SKIPPED = "skipped"  # 已跳过（如文件自扫描后已变化）
+
+
+@dataclass
+class TransferJob:
+    """
+    传输日志中记录的一次传输任务
+    
+    程序中断后据此恢复：只处理尚未完成的文件，并从字节偏移检查点继续复制。
+    """
+    
+    job_id: str  # 任务标识
+    plan: TransferPlan  # 原始传输计划
+    destinations: List[str]  # 每个文件的目标路径，顺序与 plan.videos 一致
+    states: List[str]  # 每个文件的状态，见 TransferState
+    offsets: List[int]  # 每个文件已确认写入的字节数
+    
+    def pending_indices(self) -> List[int]:
+        """
+        获取尚未完成（未完成也未跳过）的文件下标
+        
+        Returns:
+            List[int]: 文件在计划中的下标
+        """
+        return [
+            index for index, state in enumerate(self.states)
+            if state not in (TransferState.DONE, TransferState.SKIPPED)
+        ]
+
+
+@dataclass
+class TransferItemResult:
+    """
+    单个文件的传输结果实体类
+    """
+    
+    video: VideoFile  # 被传输的视频文件
+    destination: str  # 目标路径
+    success: bool  # 是否传输成功
+    message: str = ""  # 失败或跳过的原因
+    skipped: bool = False  # 是否被跳过（如文件自扫描后已变化）
+    up_to_date: bool = False  # 目标已是相同文件，无需传输（同步模式，此时 success 为True）
+    checksum: Optional[str] = None  # 校验模式下的校验值，"算法:十六进制摘要"
+    strategy: Optional[str] = None  # 实际使用的复制策略（如 reflink、copy_file_range）
+    cancelled: bool = False  # 是否因任务被取消而未完成（不完整的输出已清理）
+
+
+@dataclass
+class TransferProgress:
+    """
+    传输进度实体类
+    
+    在文件传输过程中按字节报告的进度快照，速度单位为字节/秒。
+    """
+    
+    video: VideoFile  # 最近有进展的文件
+    file_bytes: int  # 该文件已传输的字节数
+    file_size: int  # 该文件的大小
+    file_rate: float  # 该文件的平均传输速度
+    bytes_done: int  # 本次任务已完成的字节数
+    bytes_total: int  # 本次任务需要传输的总字节数
+    rate: float  # 整体传输速度（指数移动平均）
+    eta: Optional[float]  # 预计剩余时间（秒），速度未知时为None
+    files_done: int  # 已处理完的文件数
+    files_total: int  # 文件总数
+    
+    @property
+    def fraction(self) -> float:
+        """整体完成比例（0~1）"""
+        return min(1.0, self.bytes_done / self.bytes_total) if self.bytes_total else 1.0
+    
+    @property
+    def mb_per_second(self) -> float:
+        """整体传输速度（MB/s）"""
+        return self.rate / (1024 * 1024)
+    
+    @property
+    def file_mb_per_second(self) -> float:
+        """当前文件的传输速度（MB/s）"""
+        return self.file_rate / (1024 * 1024)
 
 
 class FileOperationResult:
@@ -58,7 +275,10 @@ class FileOperationResult:
     表示文件操作（复制、移动）的结果。
     """
     
-    def __init__(self, success: bool, message: str = "", count: int = 0):
+    def __init__(self, success: bool, message: str = "", count: int = 0,
+                 items: Optional[List[TransferItemResult]] = None,
+                 metrics: Optional[Dict[str, object]] = None,
+                 cancelled: bool = False):
         """
         初始化操作结果
         
@@ -66,7 +286,13 @@ class FileOperationResult:
             success: 操作是否成功
             message: 结果消息
             count: 成功操作的文件数量
+            items: 每个文件的传输结果（可选），顺序与传输计划一致
+            metrics: 传输指标（可选），如 order、bytes、elapsed、throughput_mb_s
+            cancelled: 操作是否被取消（此时 count 和 items 反映取消前已完成的部分）
         """
         self.success = success
         self.message = message
-        self.count = count
\ No newline at end of file
+        self.count = count
+        self.items = items if items is not None else []
+        self.metrics = metrics if metrics is not None else {}
+        self.cancelled = cancelled
\ No newline at end of file
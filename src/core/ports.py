@@ -5,9 +5,12 @@
 这些接口由外部适配器实现，内部用例层通过这些接口与外部交互。
 """
 
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
-from .entities import VideoFile, FilterCriteria, FileOperationResult
+from .entities import (
+    VideoFile, FilterCriteria, FileOperationResult, ScanDelta, TransferPlan, TransferJob
+)
+from .cancellation import CancellationToken
 
 
 class VideoFileRepository(ABC):
@@ -31,15 +34,128 @@ class VideoFileRepository(ABC):
         pass
     
     @abstractmethod
-    def find_mp4_files(self, directory: str) -> List[VideoFile]:
+    def find_mp4_files(self, directory: str,
+                       criteria: Optional[FilterCriteria] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> List[VideoFile]:
         """
         查找目录中的所有MP4文件
         
+        提供过滤条件时只返回满足条件的文件。适配器应先按目录项信息
+        （大小、修改时间、文件名）排除文件，被排除的文件不再探测时长。
+        
         Args:
             directory: 要搜索的目录
+            criteria: 过滤条件（可选）
+            cancel_token: 取消令牌（可选），扫描在目录和文件之间检查暂停和取消
             
         Returns:
             List[VideoFile]: 找到的视频文件列表
+        
+        Raises:
+            OperationCancelledError: 扫描被取消
+        """
+        pass
+    
+    def iter_mp4_files(self, directory: str,
+                       criteria: Optional[FilterCriteria] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> Iterator[VideoFile]:
+        """
+        逐个产出目录中的MP4文件
+        
+        每个文件探测完成后立即产出，调用方无需等待整棵目录树扫描结束。
+        默认实现基于 find_mp4_files，适配器可覆盖以实现真正的流式扫描。
+        
+        Args:
+            directory: 要搜索的目录
+            criteria: 过滤条件（可选），规则同 find_mp4_files
+            cancel_token: 取消令牌（可选），规则同 find_mp4_files
+            
+        Yields:
+            VideoFile: 找到的视频文件
+        
+        Raises:
+            OperationCancelledError: 扫描被取消
+        """
+        yield from self.find_mp4_files(directory, criteria, cancel_token)
+    
+    def rescan_mp4_files(self, directory: str) -> ScanDelta:
+        """
+        增量重新扫描目录，返回自上次完整扫描以来的变化
+        
+        默认实现不记录历史扫描，总是返回完整扫描结果（ScanDelta.full 为 True）；
+        适配器可覆盖以只重新列举发生变化的目录。
+        
+        Args:
+            directory: 要扫描的目录
+            
+        Returns:
+            ScanDelta: 扫描增量
+        """
+        return ScanDelta(added=self.find_mp4_files(directory), full=True)
+
+
+class DurationCache(ABC):
+    """
+    时长缓存接口
+    
+    以文件身份（路径、大小、修改时间、inode）为键持久化视频时长，
+    文件未变化时可直接复用，避免重复探测。
+    """
+    
+    @abstractmethod
+    def get(self, path: str, size: int, mtime_ns: int, inode: int) -> Optional[float]:
+        """
+        查询缓存的视频时长
+        
+        Args:
+            path: 文件路径
+            size: 文件大小（字节）
+            mtime_ns: 修改时间（纳秒）
+            inode: 文件 inode 编号
+            
+        Returns:
+            Optional[float]: 缓存的时长（秒），未命中或文件已变化返回None
+        """
+        pass
+    
+    @abstractmethod
+    def put(self, path: str, size: int, mtime_ns: int, inode: int, duration: float) -> None:
+        """
+        写入视频时长
+        
+        Args:
+            path: 文件路径
+            size: 文件大小（字节）
+            mtime_ns: 修改时间（纳秒）
+            inode: 文件 inode 编号
+            duration: 视频时长（秒）
+        """
+        pass
+    
+    @abstractmethod
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        使缓存失效
+        
+        Args:
+            path: 要失效的文件路径，为None时清空全部缓存
+        """
+        pass
+    
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        将待写入的数据持久化
+        """
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取缓存统计信息
+        
+        Returns:
+            Dict[str, int]: 包含 hits、misses、entries 等计数
         """
         pass
 
@@ -52,33 +168,117 @@ class FileSystemService(ABC):
     """
     
     @abstractmethod
-    def copy_file(self, source_path: str, destination_path: str) -> bool:
+    def copy_file(self, source_path: str, destination_path: str,
+                  resume_offset: int = 0,
+                  checkpoint: Optional[Callable[[int], None]] = None,
+                  verify: bool = False,
+                  progress: Optional[Callable[[int], None]] = None,
+                  cancel_token: Optional[CancellationToken] = None) -> bool:
         """
         复制文件
         
+        数据先写入临时文件，完成后原子地重命名为目标文件，
+        中断时不会留下看起来完整的目标文件。
+        
         Args:
             source_path: 源文件路径
             destination_path: 目标文件路径
+            resume_offset: 从上次中断的临时文件的该字节偏移处继续复制（临时文件无效时从头开始）
+            checkpoint: 检查点回调（可选），参数为已持久化写入的字节数；
+                        提供时失败后保留临时文件以便恢复
+            verify: 为True时在复制的数据流上计算校验值，并在替换目标文件前回读核对，
+                    不一致视为失败；校验值可用 get_last_checksum 获取
+            progress: 进度回调（可选），参数为该文件已复制的字节数，
+                      在复制过程中（可能在工作线程中）定期调用
+            cancel_token: 取消令牌（可选），在数据块之间检查暂停和取消；
+                          取消时删除临时文件，不留下不完整的输出
             
         Returns:
             bool: 复制成功返回True
+        
+        Raises:
+            OperationCancelledError: 复制被取消
         """
         pass
     
     @abstractmethod
-    def move_file(self, source_path: str, destination_path: str) -> bool:
+    def move_file(self, source_path: str, destination_path: str,
+                  resume_offset: int = 0,
+                  checkpoint: Optional[Callable[[int], None]] = None,
+                  verify: bool = False,
+                  progress: Optional[Callable[[int], None]] = None,
+                  cancel_token: Optional[CancellationToken] = None) -> bool:
         """
         移动文件
         
+        跨设备移动时先复制（规则同 copy_file）再删除源文件；要求校验时只在核对通过后删除源文件。
+        
         Args:
             source_path: 源文件路径
             destination_path: 目标文件路径
+            resume_offset: 跨设备复制时继续复制的字节偏移
+            checkpoint: 检查点回调（可选），规则同 copy_file
+            verify: 是否校验，规则同 copy_file
+            progress: 进度回调（可选），规则同 copy_file；同一文件系统内重命名时不会调用
+            cancel_token: 取消令牌（可选），规则同 copy_file；取消时不删除源文件
             
         Returns:
             bool: 移动成功返回True
+        
+        Raises:
+            OperationCancelledError: 移动被取消
         """
         pass
     
+    @abstractmethod
+    def link_file(self, source_path: str, destination_path: str, prefer_reflink: bool = False) -> bool:
+        """
+        以“虚拟复制”方式在目标位置创建文件
+        
+        源和目标位于同一文件系统时创建硬链接（或 reflink 克隆），不占用额外空间；
+        跨设备或文件系统不支持链接时回退为普通复制。
+        
+        Args:
+            source_path: 源文件路径
+            destination_path: 目标文件路径
+            prefer_reflink: 为True时优先创建写时复制克隆而不是硬链接
+            
+        Returns:
+            bool: 成功返回True
+        """
+        pass
+    
+    def get_last_copy_strategy(self) -> Optional[str]:
+        """
+        获取当前线程最近一次复制/移动所使用的策略（如 reflink、copy_file_range）
+        
+        Returns:
+            Optional[str]: 策略名称，实现不支持时返回None
+        """
+        return None
+    
+    def get_last_checksum(self) -> Optional[str]:
+        """
+        获取当前线程最近一次校验复制/移动得到的校验值
+        
+        Returns:
+            Optional[str]: "算法:十六进制摘要"（如 "sha256:..."），未校验或实现不支持时返回None
+        """
+        return None
+    
+    def write_checksum_manifest(self, directory: str, checksums: Dict[str, str]) -> Optional[str]:
+        """
+        把校验值写入目录中的清单文件，与已有清单合并
+        
+        Args:
+            directory: 清单所在目录
+            checksums: 文件名 -> "算法:十六进制摘要"
+            
+        Returns:
+            Optional[str]: 清单文件路径，实现不支持或写入失败时返回None
+        """
+        return None
+    
     @abstractmethod
     def ensure_directory_exists(self, directory: str) -> bool:
         """
@@ -92,6 +292,83 @@ class FileSystemService(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_file_signature(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        获取文件的大小和修改时间，用于廉价地判断文件是否变化
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            Optional[Tuple[int, int]]: (大小, 修改时间纳秒)，文件不存在返回None
+        """
+        pass
+    
+    @abstractmethod
+    def get_file_fingerprint(self, path: str, full: bool = False) -> Optional[str]:
+        """
+        计算文件内容指纹，用于判断两个文件是否相同
+        
+        默认只对文件大小和开头、中间、结尾的少量数据块做哈希，读取量与文件大小无关；
+        full 为True时对完整内容做哈希。不同模式的指纹不可相互比较。
+        
+        Args:
+            path: 文件路径
+            full: 是否对完整内容做哈希
+            
+        Returns:
+            Optional[str]: 指纹字符串，文件无法读取返回None
+        """
+        pass
+    
+    @abstractmethod
+    def get_device_id(self, path: str) -> Optional[int]:
+        """
+        获取路径所在存储设备的标识（st_dev），用于按设备限制并发
+        
+        Args:
+            path: 文件或目录路径
+            
+        Returns:
+            Optional[int]: 设备标识，无法获取返回None
+        """
+        pass
+    
+    def prefetch(self, path: str) -> None:
+        """
+        提示即将读取该文件，实现可以据此提前预读（默认不做任何事）
+        
+        Args:
+            path: 文件路径
+        """
+        pass
+    
+    def get_cache_residency(self, path: str) -> Optional[float]:
+        """
+        获取文件内容在操作系统页缓存中的比例，用于衡量传输对缓存的占用
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            Optional[float]: 0~1 之间的比例，实现不支持时返回None
+        """
+        return None
+    
+    def get_physical_location(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        获取文件数据在存储设备上的大致位置，用于按位置排列传输顺序以减少寻道
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            Optional[Tuple[int, int]]: (设备标识, 位置)，位置为第一个数据区段的物理偏移，
+            文件系统不支持查询时为 inode 编号；实现不支持或文件不存在时返回None
+        """
+        return None
+    
     @abstractmethod
     def paths_are_equal(self, path1: str, path2: str) -> bool:
         """
@@ -107,6 +384,74 @@ class FileSystemService(ABC):
         pass
 
 
+class TransferJournal(ABC):
+    """
+    传输日志接口
+    
+    预写式记录每次传输任务的计划和每个文件的状态，
+    程序崩溃或被强制结束后可以据此只完成剩余的工作。
+    """
+    
+    @abstractmethod
+    def begin(self, plan: TransferPlan, destinations: List[str]) -> str:
+        """
+        在开始传输前持久化记录传输计划
+        
+        Args:
+            plan: 传输计划
+            destinations: 每个文件的目标路径，顺序与 plan.videos 一致
+            
+        Returns:
+            str: 任务标识
+        """
+        pass
+    
+    @abstractmethod
+    def record(self, job_id: str, index: int, state: str, offset: int = 0, message: str = "") -> None:
+        """
+        记录单个文件的状态变化（可在工作线程中调用）
+        
+        Args:
+            job_id: 任务标识
+            index: 文件在计划中的下标
+            state: 新状态，见 TransferState
+            offset: 已确认写入的字节数（检查点）
+            message: 失败或跳过的原因
+        """
+        pass
+    
+    @abstractmethod
+    def finish(self, job_id: str, completed: bool = True) -> None:
+        """
+        结束任务的记录
+        
+        Args:
+            job_id: 任务标识
+            completed: 为True时任务已全部完成，删除其日志；否则保留以便之后恢复
+        """
+        pass
+    
+    @abstractmethod
+    def load_unfinished(self) -> List[TransferJob]:
+        """
+        读取所有未完成的传输任务（不包括当前正在执行的任务）
+        
+        Returns:
+            List[TransferJob]: 未完成的任务，按创建时间排序
+        """
+        pass
+    
+    @abstractmethod
+    def has_unfinished(self) -> bool:
+        """
+        是否存在未完成的传输任务（只检查日志是否存在，不解析内容）
+        
+        Returns:
+            bool: 存在返回True
+        """
+        pass
+
+
 class UserInterfaceService(ABC):
     """
     用户界面服务接口
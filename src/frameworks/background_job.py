@@ -0,0 +1,120 @@
+"""
+后台任务执行器
+
+清洁架构的框架层，在后台线程中执行耗时任务（扫描、传输），
+通过线程安全队列把进度事件交给 Tkinter 主线程定时处理，避免界面卡死。
+"""
+
+import queue
+import threading
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+
+class BackgroundJobRunner:
+    """
+    后台任务执行器
+    
+    同一时间只运行一个任务。任务函数在工作线程中执行，只能通过 emit 发送事件；
+    事件处理和完成回调都在 Tk 主线程中以固定帧率调用，可以安全地更新界面。
+    """
+    
+    def __init__(self, master: tk.Misc, frame_interval_ms: int = 33, max_events_per_frame: int = 5000):
+        """
+        初始化后台任务执行器
+        
+        Args:
+            master: Tkinter 窗口，用于 after() 定时处理队列
+            frame_interval_ms: 处理事件队列的间隔（毫秒），默认约 30 帧/秒
+            max_events_per_frame: 每帧最多处理的事件数，防止单帧处理过久
+        """
+        self.master = master
+        self.frame_interval_ms = frame_interval_ms
+        self.max_events_per_frame = max_events_per_frame
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._on_event: Optional[Callable[[str, Any], None]] = None
+        self._on_done: Optional[Callable[[Any, Optional[BaseException]], None]] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """
+        是否有任务正在运行（包括已结束但完成回调尚未处理的任务）
+        """
+        return self._thread is not None
+    
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待当前任务的工作线程结束（如窗口关闭前等待已取消的任务完成清理）
+        
+        Args:
+            timeout: 最长等待时间（秒），None表示一直等待
+        
+        Returns:
+            bool: 没有任务或任务已结束返回True，超时返回False
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+    
+    def start(self,
+              job: Callable[[Callable[[str, Any], None]], Any],
+              on_event: Callable[[str, Any], None],
+              on_done: Callable[[Any, Optional[BaseException]], None]) -> bool:
+        """
+        启动后台任务
+        
+        Args:
+            job: 任务函数，参数为 emit(kind, payload)，返回值传给 on_done
+            on_event: 事件处理函数，在主线程中调用
+            on_done: 完成回调 (返回值, 异常)，在主线程中调用
+        
+        Returns:
+            bool: 已有任务在运行时返回False
+        """
+        if self.is_running:
+            return False
+        
+        self._on_event = on_event
+        self._on_done = on_done
+        self._thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+        self._thread.start()
+        self.master.after(self.frame_interval_ms, self._drain)
+        return True
+    
+    def _run(self, job: Callable[[Callable[[str, Any], None]], Any]) -> None:
+        """
+        在工作线程中执行任务，结束时向队列发送完成事件
+        
+        Args:
+            job: 任务函数
+        """
+        def emit(kind: str, payload: Any = None) -> None:
+            self._queue.put((kind, payload))
+        
+        try:
+            result = job(emit)
+            self._queue.put((None, (result, None)))
+        except Exception as e:
+            self._queue.put((None, (None, e)))
+    
+    def _drain(self) -> None:
+        """
+        在主线程中处理队列中的事件，任务未结束时安排下一帧
+        """
+        for _ in range(self.max_events_per_frame):
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind is None:
+                # 完成事件：任务线程已结束
+                self._thread = None
+                result, error = payload
+                self._on_done(result, error)
+                return
+            self._on_event(kind, payload)
+        
+        self.master.after(self.frame_interval_ms, self._drain)
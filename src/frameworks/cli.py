@@ -0,0 +1,287 @@
+"""
+命令行入口
+
+清洁架构的框架层，不经过图形界面直接调用 VideoFileProcessor，适合在无图形环境的服务器上
+由 cron 等定时任务运行。结果以 JSON 输出到标准输出，退出码表示整体结果。
+本模块不导入 Tkinter；OpenCV 只在 MP4 头部解析失败需要回退时才会被导入。
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+from typing import Dict, List, Optional
+from src.core.cancellation import CancellationToken, OperationCancelledError
+from src.core.entities import (
+    VideoFile, FilterCriteria, FileOperationResult, TransferItemResult, TransferMode, TransferOrder
+)
+from src.frameworks.main import create_video_processor
+from src.interfaces.file_system_adapter import PythonFileSystemAdapter
+from src.use_cases.transfer_planner import TransferPlanner
+
+
+# 退出码
+EXIT_OK = 0  # 全部成功
+EXIT_PARTIAL = 1  # 部分文件失败或与其他输入目录中的文件重名
+EXIT_USAGE = 2  # 参数错误（与 argparse 一致）
+EXIT_ERROR = 3  # 操作无法进行（如无法创建输出目录、读取传输日志失败）
+EXIT_CANCELLED = 130  # 被 SIGINT / SIGTERM 取消
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    创建命令行参数解析器
+    
+    Returns:
+        argparse.ArgumentParser: 参数解析器
+    """
+    parser = argparse.ArgumentParser(
+        prog="cpymp4",
+        description="从输入目录提取指定时长的MP4文件并复制、移动或链接到输出目录，结果以 JSON 输出。"
+                    "不带参数运行时启动图形界面。"
+    )
+    parser.add_argument("inputs", nargs="*", metavar="INPUT",
+                        help="输入目录，可以指定多个；所有目录的文件合并为一个传输计划，共用同一个工作线程池")
+    parser.add_argument("-o", "--output", help="输出目录")
+    parser.add_argument("--min-duration", type=float, default=0.0, metavar="SECONDS",
+                        help="最小时长（秒，开区间），默认 0")
+    parser.add_argument("--max-duration", type=float, default=float('inf'), metavar="SECONDS",
+                        help="最大时长（秒，闭区间），默认不限")
+    parser.add_argument("-m", "--mode", default=TransferMode.COPY,
+                        choices=(TransferMode.COPY, TransferMode.MOVE, TransferMode.LINK),
+                        help="传输方式，默认 copy")
+    parser.add_argument("-w", "--workers", type=int, default=4,
+                        help="同时进行的传输数上限，默认 4")
+    parser.add_argument("--per-device", type=int, default=1,
+                        help="每个源/目标设备同时进行的传输数上限，默认 1（适合机械硬盘）")
+    parser.add_argument("--scan-workers", type=int, default=8,
+                        help="扫描时并行探测时长的线程数，默认 8")
+    parser.add_argument("--skip-hidden", action="store_true",
+                        help="扫描时跳过隐藏目录和系统目录（如 . 开头的目录、$RECYCLE.BIN）")
+    parser.add_argument("--order", default=TransferOrder.WALK, choices=TransferPlanner.POLICIES,
+                        help="传输顺序，默认 walk（扫描顺序）")
+    parser.add_argument("--skip-identical", action="store_true",
+                        help="输出目录中已有相同文件时跳过（增量同步，move 方式无效）")
+    parser.add_argument("--full-hash", action="store_true",
+                        help="与 --skip-identical 一起使用，再比较完整文件哈希")
+    parser.add_argument("--verify", action="store_true",
+                        help="校验传输结果并在输出目录写入校验清单（link 方式无效）")
+    parser.add_argument("--buffer-size", type=int, default=PythonFileSystemAdapter.BUFFER_SIZE // 1024,
+                        metavar="KB", help="用户态复制循环的缓冲区大小（KB），默认 8192")
+    parser.add_argument("--prefetch", type=int, default=PythonFileSystemAdapter.PREFETCH_BYTES // 1024,
+                        metavar="KB", help="传输当前文件时预读下一个文件开头的大小（KB），0 表示不预读，默认 8192")
+    parser.add_argument("--drop-behind", action="store_true",
+                        help="复制过程中释放已处理部分的页缓存，不挤占其他程序的缓存")
+    parser.add_argument("--direct-io", action="store_true",
+                        help="用户态复制时使用 O_DIRECT 绕过页缓存（仅 Linux）")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="只扫描并列出符合条件的文件，不进行传输")
+    parser.add_argument("--resume", action="store_true",
+                        help="继续传输日志中未完成的任务（忽略输入目录和过滤条件）")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行主入口
+    
+    SIGINT / SIGTERM 会取消正在进行的扫描或传输：不完整的输出被删除，
+    已完成的文件保留，未完成的任务留在传输日志中，可用 --resume 继续。
+    
+    Args:
+        argv: 命令行参数（不含程序名），None表示使用 sys.argv
+    
+    Returns:
+        int: 退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.resume:
+        if not args.inputs:
+            parser.error("至少需要一个输入目录（或使用 --resume）")
+        if not args.output:
+            parser.error("需要指定输出目录 -o/--output")
+        for directory in args.inputs:
+            if not os.path.isdir(directory):
+                parser.error(f"输入目录不存在: {directory}")
+    if args.workers < 1 or args.per_device < 1 or args.scan_workers < 1:
+        parser.error("线程数必须大于 0")
+    if args.buffer_size < 1 or args.prefetch < 0:
+        parser.error("缓冲区大小必须大于 0，预读大小不能为负数")
+    
+    processor = create_video_processor(
+        args.workers, args.per_device, args.scan_workers,
+        buffer_size=args.buffer_size * 1024,
+        drop_behind=args.drop_behind,
+        direct_io=args.direct_io,
+        prefetch_bytes=args.prefetch * 1024,
+        skip_hidden=args.skip_hidden
+    )
+    
+    token = CancellationToken()
+    _install_signal_handlers(token)
+    
+    if args.resume:
+        report = {'resume': True}
+        result = processor.resume_interrupted_transfers(cancel_token=token)
+        return _emit(report, result)
+    
+    report = {
+        'mode': args.mode,
+        'inputs': [os.path.abspath(directory) for directory in args.inputs],
+        'output': os.path.abspath(args.output),
+        'min_duration': args.min_duration,
+        'max_duration': None if args.max_duration == float('inf') else args.max_duration,
+    }
+    
+    fs = processor.file_system_service
+    for directory in args.inputs:
+        if fs.paths_are_equal(directory, args.output):
+            report.update(success=False, message=f"输入目录和输出目录不能相同: {directory}")
+            return _write(report, EXIT_ERROR)
+    
+    # 过滤条件下推到扫描阶段，各输入目录依次扫描
+    criteria = FilterCriteria(args.min_duration, args.max_duration)
+    videos: List[VideoFile] = []
+    try:
+        for directory in args.inputs:
+            videos.extend(processor.get_videos_from_directory(directory, criteria, token))
+    except OperationCancelledError:
+        report.update(success=False, cancelled=True, message="扫描已取消", matched=len(videos))
+        return _write(report, EXIT_CANCELLED)
+    
+    # 输出目录是平铺的：不同输入目录（或子目录）中的同名文件只传输第一个
+    if args.dry_run:
+        videos, conflicts = processor.split_destination_conflicts(videos)
+        report.update(success=True, message=f"找到 {len(videos)} 个符合条件的文件",
+                      matched=len(videos), conflicts=[video.path for video in conflicts],
+                      files=[_describe_video(video) for video in videos])
+        return _write(report, EXIT_PARTIAL if conflicts else EXIT_OK)
+    
+    try:
+        plan = processor.create_transfer_plan(
+            videos,
+            args.output,
+            args.mode,
+            check_stale=True,
+            skip_identical=args.skip_identical,
+            full_hash=args.full_hash,
+            verify=args.verify,
+            order=args.order
+        )
+    except ValueError as e:
+        report.update(success=False, message=str(e))
+        return _write(report, EXIT_ERROR)
+    report['matched'] = len(plan.videos)
+    report['conflicts'] = [video.path for video in plan.conflicts]
+    
+    result = processor.execute_transfer_plan(plan, cancel_token=token)
+    return _emit(report, result, len(plan.conflicts))
+
+
+def _install_signal_handlers(token: CancellationToken) -> None:
+    """
+    把 SIGINT / SIGTERM 转为取消请求，使复制循环有机会删除不完整的临时文件
+    
+    Args:
+        token: 取消令牌
+    """
+    def handler(signum, frame):
+        token.cancel()
+    
+    for name in ('SIGINT', 'SIGTERM'):
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            signal.signal(signum, handler)
+
+
+def _emit(report: Dict[str, object], result: FileOperationResult, conflicts: int = 0) -> int:
+    """
+    把传输结果写入报告并输出
+    
+    Args:
+        report: 报告（已包含输入参数）
+        result: 传输结果
+        conflicts: 因重名未传输的文件数
+    
+    Returns:
+        int: 退出码
+    """
+    statuses = [_item_status(item) for item in result.items]
+    summary = {status: statuses.count(status)
+               for status in ('transferred', 'up_to_date', 'skipped', 'failed', 'cancelled')}
+    report.update(
+        success=result.success,
+        cancelled=result.cancelled,
+        message=result.message,
+        count=result.count,
+        summary=summary,
+        files=[dict(_describe_video(item.video), destination=item.destination, status=status,
+                    message=item.message or None, checksum=item.checksum, strategy=item.strategy)
+               for item, status in zip(result.items, statuses)],
+        metrics=result.metrics
+    )
+    if result.cancelled:
+        code = EXIT_CANCELLED
+    elif not result.success:
+        code = EXIT_ERROR
+    elif summary['failed'] or conflicts:
+        code = EXIT_PARTIAL
+    else:
+        code = EXIT_OK
+    return _write(report, code)
+
+
+def _item_status(item: TransferItemResult) -> str:
+    """
+    单个文件结果的状态名称
+    
+    Args:
+        item: 传输结果
+    
+    Returns:
+        str: transferred / up_to_date / skipped / failed / cancelled
+    """
+    if item.cancelled:
+        return 'cancelled'
+    if item.up_to_date:
+        return 'up_to_date'
+    if item.success:
+        return 'transferred'
+    return 'skipped' if item.skipped else 'failed'
+
+
+def _describe_video(video: VideoFile) -> Dict[str, object]:
+    """
+    视频文件的 JSON 描述
+    
+    Args:
+        video: 视频文件
+    
+    Returns:
+        Dict[str, object]: source、duration、size
+    """
+    return {'source': video.path, 'duration': video.duration, 'size': video.size}
+
+
+def _write(report: Dict[str, object], code: int) -> int:
+    """
+    以一行 JSON 输出报告
+    
+    Args:
+        report: 报告
+        code: 退出码，同时写入报告
+    
+    Returns:
+        int: 退出码
+    """
+    report['exit_code'] = code
+    json.dump(report, sys.stdout, default=str)
+    sys.stdout.write('\n')
+    sys.stdout.flush()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
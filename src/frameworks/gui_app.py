@@ -5,11 +5,17 @@
 """
 
 import tkinter as tk
+from tkinter import ttk
 import sys
-from typing import List, Optional
-from src.core.entities import VideoFile
+import time
+from typing import List, Optional, Set
+from src.core.cancellation import CancellationToken, OperationCancelledError
+from src.core.catalog import VideoCatalog
+from src.core.entities import VideoFile, FilterCriteria, TransferMode, TransferOrder, TransferProgress
 from src.use_cases.video_file_processor import VideoFileProcessor
 from src.core.ports import UserInterfaceService
+from src.frameworks.background_job import BackgroundJobRunner
+from src.frameworks.virtual_list_view import VirtualFileListView
 
 
 class MP4CopyToolApp:
@@ -19,6 +25,29 @@ class MP4CopyToolApp:
     实现基于Tkinter的图形界面，处理用户交互并调用用例层处理业务逻辑。
     """
     
+    # 扫描时每批显示的最大条目数和最长间隔（秒）
+    SCAN_BATCH_SIZE = 200
+    SCAN_BATCH_INTERVAL = 0.05
+    
+    # 已处理文件高亮的合并刷新间隔（毫秒）
+    HIGHLIGHT_INTERVAL_MS = 100
+    
+    # 自动刷新时检查目录变化的间隔（毫秒）
+    WATCH_INTERVAL_MS = 3000
+    
+    # 关闭窗口时等待已取消的任务清理临时文件的最长时间（秒）
+    CLOSE_TIMEOUT = 5.0
+    
+    # 传输顺序选项：显示名称 -> 策略
+    ORDER_CHOICES = {
+        "扫描顺序": TransferOrder.WALK,
+        "磁盘位置": TransferOrder.PHYSICAL,
+        "按目录": TransferOrder.DIRECTORY,
+        "大文件优先": TransferOrder.LARGEST_FIRST,
+        "小文件优先": TransferOrder.SMALLEST_FIRST,
+        "多盘交错": TransferOrder.INTERLEAVE,
+    }
+    
     def __init__(self, 
                  master: tk.Tk,
                  video_processor: VideoFileProcessor,
@@ -41,7 +70,15 @@ class MP4CopyToolApp:
         # 初始化变量
         self.input_dir: str = ""
         self.output_dir: str = ""
-        self.file_list: List[VideoFile] = []
+        self._scanned_dir: str = ""  # 文件列表对应的输入目录
+        self._watch_scheduled = False
+        self.catalog = VideoCatalog()  # 已扫描的视频文件及时长索引
+        self._pending_highlights: Set[int] = set()  # 待高亮的行号
+        self._highlight_scheduled = False
+        
+        # 后台任务执行器：扫描和传输在工作线程中进行，进度经队列回到主线程
+        self.job_runner = BackgroundJobRunner(master)
+        self.cancel_token: Optional[CancellationToken] = None  # 当前任务的取消令牌
         
         # 创建UI组件
         self._create_widgets()
@@ -51,6 +88,16 @@ class MP4CopyToolApp:
         
         # 绑定窗口关闭事件
         master.protocol("WM_DELETE_WINDOW", self._on_closing)
+        
+        # 提示上次运行中断的传输任务（读取传输日志推迟到窗口显示之后）
+        master.after_idle(self._check_interrupted_transfers)
+    
+    def _check_interrupted_transfers(self):
+        """
+        检查上次运行是否有中断的传输任务，有则在状态栏提示
+        """
+        if self.video_processor.has_interrupted_transfers():
+            self.lbl_status.config(text="发现上次未完成的传输任务，可点击「继续未完成任务」")
     
     def _create_widgets(self):
         """
@@ -59,29 +106,49 @@ class MP4CopyToolApp:
         # 输入目录相关组件
         self.lbl_input = tk.Label(self.master, text="输入目录：未选择")
         self.btn_input = tk.Button(self.master, text="选择输入目录", command=self.select_input)
+        self.btn_refresh = tk.Button(self.master, text="刷新", command=self.refresh_changes)  # 增量刷新
+        self.watch_var = tk.BooleanVar(value=False)
+        self.chk_watch = tk.Checkbutton(self.master, text="自动刷新", variable=self.watch_var,
+                                        command=self._toggle_watch)
         
         # 输出目录相关组件
         self.lbl_output = tk.Label(self.master, text="输出目录：未选择")
         self.btn_output = tk.Button(self.master, text="选择输出目录", command=self.select_output)
         
-        # 文件列表相关组件
-        self.listbox = tk.Listbox(self.master, width=80, height=15)  # 文件列表框
-        self.scrollbar = tk.Scrollbar(self.master, orient="vertical")  # 垂直滚动条
-        
-        # 绑定滚动条和列表框
-        self.scrollbar.config(command=self.listbox.yview)
-        self.listbox.config(yscrollcommand=self.scrollbar.set)
+        # 文件列表相关组件（虚拟列表，只渲染可见行，自带滚动条）
+        self.file_view = VirtualFileListView(self.master, self.ui_service.format_duration, height=15)
         
         # 时长选择相关组件
         self.lbl_duration = tk.Label(self.master, text="时长范围（秒）:")
+        self.options_frame = tk.Frame(self.master)
+        self.sync_var = tk.BooleanVar(value=False)
+        self.chk_sync = tk.Checkbutton(self.options_frame, text="跳过相同文件", variable=self.sync_var)  # 增量同步
+        self.verify_var = tk.BooleanVar(value=False)
+        self.chk_verify = tk.Checkbutton(self.options_frame, text="校验", variable=self.verify_var)  # 复制时计算校验值
+        self.order_var = tk.StringVar(value="扫描顺序")
+        self.order_menu = tk.OptionMenu(self.options_frame, self.order_var, *self.ORDER_CHOICES)  # 传输顺序
         self.entry_min = tk.Entry(self.master, width=8)  # 最小时长输入框
         self.entry_max = tk.Entry(self.master, width=8)  # 最大时长输入框
         self.lbl_example = tk.Label(self.master, text="示例: (0,30] 或 [55,120] 或 [56,)")  # 提示文本
         
+        # 输入时长范围时实时预览符合条件的文件
+        self.entry_min.bind("<KeyRelease>", self.preview_filter)
+        self.entry_max.bind("<KeyRelease>", self.preview_filter)
+        
         # 操作按钮相关组件
         self.copy_btn = tk.Button(self.master, text="开始拷贝", command=self.start_copy)
         self.move_btn = tk.Button(self.master, text="开始移动", command=self.start_move)
+        self.link_btn = tk.Button(self.master, text="开始链接", command=self.start_link)  # 同盘硬链接
+        self.resume_btn = tk.Button(self.master, text="继续未完成任务", command=self.start_resume)  # 恢复中断的传输
         self.badge = tk.Canvas(self.master, width=20, height=20, highlightthickness=0)  # 计数徽章
+        self.lbl_status = tk.Label(self.master, text="")  # 扫描状态
+        self.progress_bar = ttk.Progressbar(self.master, mode="determinate", maximum=1000)  # 传输字节进度
+        self.lbl_rate = tk.Label(self.master, text="")  # 传输速度和剩余时间
+        self.control_frame = tk.Frame(self.master)
+        self.pause_btn = tk.Button(self.control_frame, text="暂停", command=self.toggle_pause,
+                                   state=tk.DISABLED)  # 暂停/继续当前任务
+        self.cancel_btn = tk.Button(self.control_frame, text="取消", command=self.cancel_job,
+                                    state=tk.DISABLED)  # 取消当前任务
     
     def _layout_widgets(self):
         """
@@ -89,17 +156,30 @@ class MP4CopyToolApp:
         """
         self.lbl_input.grid(row=0, column=0, sticky="w", padx=5)
         self.btn_input.grid(row=0, column=1, padx=5)
+        self.btn_refresh.grid(row=0, column=2, padx=5)
         self.lbl_output.grid(row=1, column=0, sticky="w", padx=5)
         self.btn_output.grid(row=1, column=1, padx=5)
-        self.listbox.grid(row=2, column=0, columnspan=2, padx=5, pady=5)
-        self.scrollbar.grid(row=2, column=2, sticky="ns")
+        self.chk_watch.grid(row=1, column=2, padx=5)
+        self.file_view.grid(row=2, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
         self.lbl_duration.grid(row=3, column=0, sticky="w", padx=5)
         self.entry_min.grid(row=3, column=0, padx=(70,5))
         self.entry_max.grid(row=3, column=0, padx=(120,5))
         self.lbl_example.grid(row=3, column=1, sticky="w")
+        self.chk_sync.pack(side="left")
+        self.chk_verify.pack(side="left")
+        self.order_menu.pack(side="left")
+        self.options_frame.grid(row=3, column=2, padx=5)
         self.copy_btn.grid(row=4, column=0, pady=10)
         self.move_btn.grid(row=4, column=1, padx=(0, 40), pady=10)
-        self.badge.grid(row=4, column=2)
+        self.link_btn.grid(row=4, column=2, pady=10)
+        self.badge.grid(row=4, column=3, padx=(0, 5))
+        self.resume_btn.grid(row=5, column=2, padx=5)
+        self.lbl_status.grid(row=5, column=0, columnspan=2, sticky="w", padx=5)
+        self.progress_bar.grid(row=6, column=0, columnspan=2, sticky="ew", padx=5, pady=(0, 5))
+        self.lbl_rate.grid(row=6, column=2, sticky="w", padx=5, pady=(0, 5))
+        self.pause_btn.pack(side=tk.LEFT, padx=(0, 5))
+        self.cancel_btn.pack(side=tk.LEFT)
+        self.control_frame.grid(row=7, column=2, padx=5, pady=(0, 5))
     
     def update_badge(self, count: int):
         """
@@ -123,8 +203,16 @@ class MP4CopyToolApp:
         if self.input_dir:
             # 更新标签显示
             self.lbl_input.config(text=f"输入目录：{self.input_dir}")
-            # 刷新文件列表
-            self.refresh_file_list()
+            if self.job_runner.is_running:
+                # 自动刷新正在进行（其他任务运行时按钮已禁用），完成后再扫描新目录
+                if self.input_dir != self._scanned_dir:
+                    self.lbl_status.config(text="正在自动刷新，完成后扫描新的输入目录...")
+                return
+            # 刷新文件列表（再次选择同一目录时只处理变化的部分）
+            if self.input_dir == self._scanned_dir:
+                self.refresh_changes()
+            else:
+                self.refresh_file_list()
     
     def select_output(self):
         """
@@ -138,19 +226,267 @@ class MP4CopyToolApp:
     def refresh_file_list(self):
         """
         刷新并显示输入目录中的MP4文件列表
+        
+        扫描在后台线程中进行，结果分批显示在文件列表中。
         """
-        self.listbox.delete(0, tk.END)  # 清空列表框
+        if self.job_runner.is_running:
+            return
+        
+        self.catalog = VideoCatalog()
+        self.file_view.set_catalog(self.catalog)  # 清空文件列表
+        self._pending_highlights.clear()
+        self._scanned_dir = self.input_dir
         
         if not self.input_dir:
+            self.lbl_status.config(text="")
+            return
+        
+        input_dir = self.input_dir
+        token = self._new_cancel_token()
+        
+        def scan_job(emit):
+            # 逐个获取视频文件，按数量或时间间隔分批发送给界面
+            batch = []
+            last_flush = time.monotonic()
+            for video in self.video_processor.iter_videos_from_directory(input_dir, cancel_token=token):
+                batch.append(video)
+                now = time.monotonic()
+                if len(batch) >= self.SCAN_BATCH_SIZE or now - last_flush >= self.SCAN_BATCH_INTERVAL:
+                    emit("scan_batch", batch)
+                    batch = []
+                    last_flush = now
+            if batch:
+                emit("scan_batch", batch)
+        
+        self.lbl_status.config(text="正在扫描...")
+        self._set_busy(True)
+        self.job_runner.start(scan_job, self._on_job_event, self._on_scan_done)
+    
+    def refresh_changes(self, quiet: bool = False):
+        """
+        增量刷新文件列表
+        
+        只重新列举发生变化的目录，把新增、删除和修改的文件合并到当前列表中。
+        
+        Args:
+            quiet: 是否静默执行（自动刷新时不禁用按钮、不弹出错误）
+        """
+        if self.job_runner.is_running or not self.input_dir:
+            return
+        if self.input_dir != self._scanned_dir:
+            self.refresh_file_list()
+            return
+        
+        input_dir = self.input_dir
+        
+        def rescan_job(emit):
+            return self.video_processor.rescan_directory(input_dir)
+        
+        if not quiet:
+            self.lbl_status.config(text="正在检查变化...")
+            self._set_busy(True)
+        self.job_runner.start(
+            rescan_job,
+            self._on_job_event,
+            lambda delta, error: self._on_rescan_done(delta, error, quiet)
+        )
+    
+    def _on_rescan_done(self, delta, error: Optional[BaseException], quiet: bool):
+        """
+        增量刷新完成回调（主线程）
+        
+        Args:
+            delta: 扫描增量（ScanDelta）
+            error: 扫描过程中的异常，成功为None
+            quiet: 是否为静默刷新
+        """
+        if not quiet:
+            self._set_busy(False)
+        if self.input_dir != self._scanned_dir:
+            # 刷新期间选择了新的输入目录，放弃旧目录的结果并扫描新目录
+            self.refresh_file_list()
+            return
+        if error is not None:
+            if not quiet:
+                self.lbl_status.config(text=f"共 {len(self.catalog)} 个文件")
+                self.ui_service.show_message("错误", f"刷新失败: {error}", "error")
+            return
+        if delta.is_empty:
+            if not quiet:
+                self.lbl_status.config(text=f"共 {len(self.catalog)} 个文件，没有变化")
+            return
+        
+        self.catalog.apply_delta(delta)
+        self._pending_highlights.clear()
+        if delta.full:
+            self.file_view.set_catalog(self.catalog)
+            self.lbl_status.config(text=f"共 {len(self.catalog)} 个文件")
+        else:
+            self.file_view.refresh_all()
+            self.lbl_status.config(
+                text=f"共 {len(self.catalog)} 个文件（新增 {len(delta.added)}，"
+                     f"删除 {len(delta.removed)}，修改 {len(delta.modified)}）"
+            )
+        self.preview_filter()
+    
+    def _toggle_watch(self):
+        """
+        开启或关闭自动刷新
+        """
+        if self.watch_var.get() and not self._watch_scheduled:
+            self._watch_scheduled = True
+            self.master.after(self.WATCH_INTERVAL_MS, self._watch_tick)
+    
+    def _watch_tick(self):
+        """
+        自动刷新定时器：空闲时静默检查输入目录的变化
+        
+        每次只比较各目录的修改时间，没有变化时开销很小。
+        """
+        self._watch_scheduled = False
+        if not self.watch_var.get():
+            return
+        if self.input_dir and not self.job_runner.is_running:
+            self.refresh_changes(quiet=True)
+        self._watch_scheduled = True
+        self.master.after(self.WATCH_INTERVAL_MS, self._watch_tick)
+    
+    def _on_scan_done(self, result, error: Optional[BaseException]):
+        """
+        扫描完成回调（主线程）
+        
+        Args:
+            result: 任务返回值（未使用）
+            error: 扫描过程中的异常，成功为None
+        """
+        self._set_busy(False)
+        self.preview_filter()
+        if error is not None:
+            # 文件列表不完整：下次刷新时重新完整扫描，而不是与旧的扫描记录比较
+            self._scanned_dir = ""
+        if isinstance(error, OperationCancelledError):
+            self.lbl_status.config(text=f"扫描已取消，已找到 {len(self.catalog)} 个文件")
+            return
+        self.lbl_status.config(text=f"共 {len(self.catalog)} 个文件")
+        if error is not None:
+            self.ui_service.show_message("错误", f"扫描失败: {error}", "error")
+    
+    def _on_job_event(self, kind: str, payload):
+        """
+        处理后台任务发送的事件（主线程）
+        
+        Args:
+            kind: 事件类型
+            payload: 事件数据
+        """
+        if kind == "scan_batch":
+            self._append_to_view(payload)
+            self.lbl_status.config(text=f"正在扫描... 已找到 {len(self.catalog)} 个文件")
+        elif kind == "progress":
+            self._file_progress_callback(*payload)
+        elif kind == "bytes":
+            self._show_transfer_progress(payload)
+    
+    def _set_busy(self, busy: bool):
+        """
+        任务运行期间禁用会启动新任务的按钮
+        
+        Args:
+            busy: 是否有任务正在运行
+        """
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.btn_input, self.btn_refresh, self.btn_output,
+                       self.copy_btn, self.move_btn, self.link_btn, self.resume_btn):
+            button.config(state=state)
+        
+        # 暂停和取消只对带取消令牌的任务（扫描、传输）可用
+        if not busy:
+            self.cancel_token = None
+        control_state = tk.NORMAL if busy and self.cancel_token is not None else tk.DISABLED
+        self.pause_btn.config(text="暂停", state=control_state)
+        self.cancel_btn.config(state=control_state)
+    
+    def _report_busy(self):
+        """
+        提示有任务正在运行（自动刷新在后台进行时按钮不会被禁用）
+        """
+        self.ui_service.show_message("提示", "正在刷新文件列表，请稍后再试")
+    
+    def _new_cancel_token(self) -> CancellationToken:
+        """
+        为即将启动的任务创建取消令牌（需在 _set_busy(True) 之前调用）
+        
+        Returns:
+            CancellationToken: 取消令牌
+        """
+        self.cancel_token = CancellationToken()
+        return self.cancel_token
+    
+    def toggle_pause(self):
+        """
+        暂停或继续当前任务
+        
+        暂停时正在复制的文件停在下一个数据块之前，已写入的数据保留。
+        """
+        token = self.cancel_token
+        if token is None or token.is_cancelled:
+            return
+        if token.is_paused:
+            token.resume()
+            self.pause_btn.config(text="暂停")
+            self.lbl_rate.config(text="")
+        else:
+            token.pause()
+            self.pause_btn.config(text="继续")
+            self.lbl_rate.config(text="已暂停")
+    
+    def cancel_job(self):
+        """
+        取消当前任务：正在写入的不完整文件会被删除，已完成的文件保留
+        """
+        token = self.cancel_token
+        if token is None:
+            return
+        token.cancel()
+        self.pause_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.lbl_rate.config(text="正在取消...")
+    
+    def _append_to_view(self, videos: List[VideoFile]):
+        """
+        在文件列表末尾追加一批视频文件
+        
+        Args:
+            videos: 要显示的视频文件
+        """
+        if not videos:
             return
         
-        # 获取视频文件列表
-        self.file_list = self.video_processor.get_videos_from_directory(self.input_dir)
+        self.catalog.extend(videos)
+        self.file_view.refresh_appended()
+    
+    def preview_filter(self, event=None):
+        """
+        根据当前输入的时长范围实时更新计数徽章并高亮符合条件的文件
+        
+        时长索引已排序，每次输入只需两次二分查找，不会重新扫描。
         
-        # 在列表框中显示文件
-        for video in self.file_list:
-            formatted_duration = self.ui_service.format_duration(video.duration)
-            self.listbox.insert(tk.END, f"{video.path} | 时长: {formatted_duration}")
+        Args:
+            event: 触发的键盘事件（可选）
+        """
+        if not self.entry_min.get().strip() and not self.entry_max.get().strip():
+            self.update_badge(0)
+            self.file_view.set_match_criteria(None)
+            return
+        
+        try:
+            min_sec, max_sec = self._parse_duration_filter()
+        except ValueError:
+            # 输入尚未完整（如只输入了 "("），暂不预览
+            return
+        
+        self.update_badge(self.catalog.count_in_duration_range(min_sec, max_sec))
+        self.file_view.set_match_criteria(FilterCriteria(min_sec, max_sec))
     
     def _parse_duration_filter(self) -> tuple:
         """
@@ -177,90 +513,133 @@ class MP4CopyToolApp:
             video: 当前处理的视频文件
             count: 已处理的文件数量
         """
-        # 查找视频在列表中的索引
-        for i, v in enumerate(self.file_list):
-            if v.path == video.path:
-                # 高亮显示已处理的文件
-                self.listbox.itemconfig(i, bg='#e0ffe0')
-                break
-        
-        # 更新界面
-        self.master.update()
+        # 通过索引查找视频所在行，合并到下一次刷新中高亮
+        row = self.catalog.index_of(video.path)
+        if row is None:
+            return
+        self._pending_highlights.add(row)
+        if not self._highlight_scheduled:
+            self._highlight_scheduled = True
+            self.master.after(self.HIGHLIGHT_INTERVAL_MS, self._flush_highlights)
     
-    def start_copy(self):
-        """
-        开始复制符合条件的文件
+    def _show_transfer_progress(self, progress: Optional[TransferProgress]):
         """
-        # 目录校验
-        if not self.input_dir:
-            self.ui_service.show_message("警告", "请选择输入目录", "warning")
-            return
+        更新进度条以及传输速度和剩余时间
         
-        if not self.output_dir:
-            self.ui_service.show_message("警告", "请选择输出目录", "warning")
+        Args:
+            progress: 传输进度，为None时清空显示
+        """
+        if progress is None:
+            self.progress_bar["value"] = 0
+            self.lbl_rate.config(text="")
             return
-        
-        # 解析时长过滤条件
-        min_sec, max_sec = self._parse_duration_filter()
-        
-        # 筛选符合条件的文件
-        filtered_videos = self.video_processor.filter_videos_by_duration(
-            self.file_list, min_sec, max_sec
-        )
-        
-        # 更新计数徽章
-        self.update_badge(len(filtered_videos))
-        
-        # 检查是否有符合条件的文件
-        if not filtered_videos:
-            self.ui_service.show_message("提示", "没有符合要求的文件")
+        self.progress_bar["value"] = progress.fraction * 1000
+        token = self.cancel_token
+        if token is not None and (token.is_paused or token.is_cancelled):
+            # 暂停或取消之前已进入队列的事件不覆盖状态提示
             return
-        
-        # 执行复制操作
-        result = self.video_processor.copy_filtered_videos(
-            self.input_dir,
-            self.output_dir,
-            min_sec,
-            max_sec,
-            self._file_progress_callback
+        eta = self.ui_service.format_duration(progress.eta) if progress.eta is not None else "--:--:--"
+        self.lbl_rate.config(
+            text=f"{progress.files_done}/{progress.files_total}  "
+                 f"{progress.mb_per_second:.1f} MB/s  剩余 {eta}"
         )
-        
-        # 更新计数徽章
-        self.update_badge(0)
-        
-        # 显示结果
-        if result.success:
-            self.ui_service.show_message("完成", result.message)
-        else:
-            self.ui_service.show_message("错误", result.message, "error")
     
-    def _on_closing(self):
+    def _flush_highlights(self):
         """
-        处理窗口关闭事件
-        确保程序能够完全退出
+        批量高亮自上次刷新以来已处理的文件
         """
-        self.master.destroy()
-        sys.exit(0)
+        self._highlight_scheduled = False
+        # 高亮显示已处理的文件
+        self.file_view.mark_done(self._pending_highlights)
+        self._pending_highlights.clear()
+    
+    def start_copy(self):
+        """
+        开始复制符合条件的文件
+        """
+        self._start_transfer(TransferMode.COPY)
     
     def start_move(self):
         """
         开始移动符合条件的文件
         """
+        self._start_transfer(TransferMode.MOVE)
+    
+    def start_link(self):
+        """
+        开始以硬链接方式“虚拟复制”符合条件的文件（跨设备时复制）
+        """
+        self._start_transfer(TransferMode.LINK)
+    
+    def start_resume(self):
+        """
+        继续上次中断的传输任务（根据传输日志只处理剩余的文件）
+        """
+        if self.job_runner.is_running:
+            self._report_busy()
+            return
+        
+        token = self._new_cancel_token()
+        
+        def resume_job(emit):
+            return self.video_processor.resume_interrupted_transfers(
+                lambda video, count: emit("progress", (video, count)),
+                lambda progress: emit("bytes", progress),
+                token
+            )
+        
+        def on_done(result, error: Optional[BaseException]):
+            self._set_busy(False)
+            self._show_transfer_progress(None)
+            self.lbl_status.config(text=f"共 {len(self.catalog)} 个文件" if self._scanned_dir else "")
+            if error is not None:
+                self.ui_service.show_message("错误", f"发生错误: {error}", "error")
+            elif result.success:
+                self.ui_service.show_message("已取消" if result.cancelled else "完成", result.message)
+                # 恢复的任务可能移动了当前列表中的文件
+                self.refresh_changes()
+            else:
+                self.ui_service.show_message("错误", result.message, "error")
+        
+        self.lbl_status.config(text="正在继续未完成的传输任务...")
+        self._set_busy(True)
+        self.job_runner.start(resume_job, self._on_job_event, on_done)
+    
+    def _start_transfer(self, mode: str):
+        """
+        按已扫描的文件列表创建传输计划并执行
+        
+        Args:
+            mode: 传输方式，见 TransferMode
+        """
+        if self.job_runner.is_running:
+            self._report_busy()
+            return
+        
         # 目录校验
         if not self.input_dir:
             self.ui_service.show_message("警告", "请选择输入目录", "warning")
             return
         
+        # 文件列表必须来自当前的输入目录，否则计划中会是旧目录的文件
+        if self.input_dir != self._scanned_dir:
+            self.ui_service.show_message("警告", "文件列表不是当前输入目录的完整扫描结果，请刷新后再试", "warning")
+            return
+        
         if not self.output_dir:
             self.ui_service.show_message("警告", "请选择输出目录", "warning")
             return
         
         # 解析时长过滤条件
-        min_sec, max_sec = self._parse_duration_filter()
+        try:
+            min_sec, max_sec = self._parse_duration_filter()
+        except ValueError:
+            self.ui_service.show_message("警告", "时长范围格式不正确", "warning")
+            return
         
-        # 筛选符合条件的文件
+        # 筛选符合条件的文件（使用目录的时长索引）
         filtered_videos = self.video_processor.filter_videos_by_duration(
-            self.file_list, min_sec, max_sec
+            self.catalog, min_sec, max_sec
         )
         
         # 更新计数徽章
@@ -271,22 +650,69 @@ class MP4CopyToolApp:
             self.ui_service.show_message("提示", "没有符合要求的文件")
             return
         
-        # 执行移动操作
-        result = self.video_processor.move_filtered_videos(
-            self.input_dir,
-            self.output_dir,
-            min_sec,
-            max_sec,
-            self._file_progress_callback
-        )
-        
-        # 更新计数徽章
-        self.update_badge(0)
-        
-        # 显示结果
-        if result.success:
-            self.ui_service.show_message("完成", result.message)
-            # 移动完成后刷新文件列表（因为原位置的文件已被移除）
-            self.refresh_file_list()
-        else:
-            self.ui_service.show_message("错误", result.message, "error")
\ No newline at end of file
+        # 界面变量只能在主线程读取
+        output_dir = self.output_dir
+        source_dir = self.input_dir
+        skip_identical = self.sync_var.get()
+        verify = self.verify_var.get()
+        order = self.ORDER_CHOICES[self.order_var.get()]
+        token = self._new_cancel_token()
+        
+        def transfer_job(emit):
+            # 排序时可能要读取每个文件的物理位置和设备号，在工作线程中创建计划，不阻塞界面；
+            # 直接按已扫描的文件执行，传输前检查文件是否已变化
+            plan = self.video_processor.create_transfer_plan(
+                filtered_videos,
+                output_dir,
+                mode,
+                source_dir=source_dir,
+                check_stale=True,
+                skip_identical=skip_identical,
+                verify=verify,
+                order=order
+            )
+            # 进度回调在工作线程中触发，只把事件放入队列
+            return self.video_processor.execute_transfer_plan(
+                plan,
+                lambda video, count: emit("progress", (video, count)),
+                lambda progress: emit("bytes", progress),
+                token
+            )
+        
+        def on_done(result, error: Optional[BaseException]):
+            self._set_busy(False)
+            self._show_transfer_progress(None)
+            
+            # 更新计数徽章
+            self.update_badge(0)
+            self.lbl_status.config(text=f"共 {len(self.catalog)} 个文件")
+            
+            # 显示结果
+            if error is not None:
+                self.ui_service.show_message("错误", f"发生错误: {error}", "error")
+            elif result.success:
+                self.ui_service.show_message("已取消" if result.cancelled else "完成", result.message)
+                if result.metrics.get('files'):
+                    self.lbl_status.config(
+                        text=f"平均 {result.metrics['throughput_mb_s']:.1f} MB/s（{self.order_var.get()}）"
+                    )
+                if mode == TransferMode.MOVE:
+                    # 移动完成后刷新文件列表（因为原位置的文件已被移除），只处理变化的目录
+                    self.refresh_changes()
+            else:
+                self.ui_service.show_message("错误", result.message, "error")
+        
+        self.lbl_status.config(text="正在传输...")
+        self._set_busy(True)
+        self.job_runner.start(transfer_job, self._on_job_event, on_done)
+    
+    def _on_closing(self):
+        """
+        处理窗口关闭事件
+        确保程序能够完全退出；正在运行的任务先取消，等待其清理不完整的文件
+        """
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+            self.job_runner.join(self.CLOSE_TIMEOUT)
+        self.master.destroy()
+        sys.exit(0)
@@ -4,33 +4,183 @@
 负责组装所有组件，实现依赖注入，启动应用程序。
 """
 
-import tkinter as tk
+import threading
+from typing import Dict, Optional
+from src.core.ports import DurationCache
 from src.use_cases.video_file_processor import VideoFileProcessor
+from src.use_cases.transfer_scheduler import TransferScheduler
 from src.interfaces.file_system_adapter import PythonFileSystemAdapter
-from src.interfaces.video_repository_adapter import OpenCVVideoRepositoryAdapter
-from src.interfaces.gui_adapter import TkinterGUIAdapter
-from src.frameworks.gui_app import MP4CopyToolApp
+from src.interfaces.video_repository_adapter import Mp4BoxVideoRepositoryAdapter
+from src.interfaces.directory_walker import ScandirDirectoryWalker
 
 
-def main():
+def _create_duration_cache():
     """
-    程序主入口函数
+    创建持久化时长缓存
     
-    实现依赖注入，创建并组装所有组件，启动GUI应用。
+    缓存不可用（如缓存目录不可写）时返回None，程序仍可正常运行。
+    """
+    try:
+        from src.interfaces.sqlite_duration_cache_adapter import SQLiteDurationCacheAdapter
+        return SQLiteDurationCacheAdapter()
+    except Exception:
+        return None
+
+
+def _create_transfer_journal():
+    """
+    创建传输日志
+    
+    日志目录不可写时返回None，传输仍可进行，只是中断后无法恢复。
+    """
+    try:
+        from src.interfaces.json_transfer_journal_adapter import JsonLinesTransferJournalAdapter
+        return JsonLinesTransferJournalAdapter()
+    except Exception:
+        return None
+
+
+class _LazyDurationCache(DurationCache):
+    """
+    首次查询或写入时才创建的时长缓存
+    
+    打开 SQLite 数据库（导入 sqlite3、建表并提交一次写事务）推迟到第一次扫描，
+    不占用启动时间；创建失败时与没有缓存一样工作。
+    """
+    
+    def __init__(self, factory=_create_duration_cache):
+        """
+        初始化延迟创建的缓存
+        
+        Args:
+            factory: 创建实际缓存的函数，失败时返回None
+        """
+        self._factory = factory
+        self._cache: Optional[DurationCache] = None
+        self._created = False
+        self._lock = threading.Lock()
+    
+    def _get_cache(self) -> Optional[DurationCache]:
+        """
+        获取实际的缓存，第一次调用时创建（多个探测线程可能同时调用）
+        
+        Returns:
+            Optional[DurationCache]: 缓存，不可用时返回None
+        """
+        if not self._created:
+            with self._lock:
+                if not self._created:
+                    self._cache = self._factory()
+                    self._created = True
+        return self._cache
+    
+    def get(self, path: str, size: int, mtime_ns: int, inode: int) -> Optional[float]:
+        """查询缓存的视频时长（见 DurationCache.get）"""
+        cache = self._get_cache()
+        return cache.get(path, size, mtime_ns, inode) if cache is not None else None
+    
+    def put(self, path: str, size: int, mtime_ns: int, inode: int, duration: float) -> None:
+        """写入视频时长（见 DurationCache.put）"""
+        cache = self._get_cache()
+        if cache is not None:
+            cache.put(path, size, mtime_ns, inode, duration)
+    
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """使缓存失效（见 DurationCache.invalidate）"""
+        cache = self._get_cache()
+        if cache is not None:
+            cache.invalidate(path)
+    
+    def flush(self) -> None:
+        """持久化待写入的数据（见 DurationCache.flush）"""
+        # 尚未创建时没有需要写入的数据
+        if self._created and self._cache is not None:
+            self._cache.flush()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计信息（见 DurationCache.get_stats）"""
+        cache = self._get_cache()
+        return cache.get_stats() if cache is not None else {'hits': 0, 'misses': 0, 'entries': 0}
+
+
+def create_video_processor(transfer_workers: int = 4,
+                           per_device: int = 1,
+                           scan_workers: int = 8,
+                           buffer_size: int = PythonFileSystemAdapter.BUFFER_SIZE,
+                           drop_behind: bool = False,
+                           direct_io: bool = False,
+                           prefetch_bytes: int = PythonFileSystemAdapter.PREFETCH_BYTES,
+                           skip_hidden: bool = False) -> VideoFileProcessor:
+    """
+    创建并组装视频文件处理器（图形界面和命令行共用，不依赖 Tkinter）
+    
+    Args:
+        transfer_workers: 同时进行的传输总数上限
+        per_device: 每个源/目标设备同时进行的传输数上限
+        scan_workers: 扫描时并行探测时长的线程数
+        buffer_size: 用户态复制循环的缓冲区大小（字节）
+        drop_behind: 复制过程中释放已处理部分的页缓存
+        direct_io: 用户态复制时使用 O_DIRECT 绕过页缓存
+        prefetch_bytes: 传输当前文件时预读下一个文件开头的字节数，0 表示不预读
+        skip_hidden: 扫描时是否跳过隐藏目录和系统目录
+    
+    Returns:
+        VideoFileProcessor: 视频文件处理器
     """
     # 创建适配器实例（外部框架实现）
-    file_system_service = PythonFileSystemAdapter()
-    video_repository = OpenCVVideoRepositoryAdapter()
-    ui_service = TkinterGUIAdapter()
+    file_system_service = PythonFileSystemAdapter(
+        buffer_size=buffer_size,
+        drop_behind=drop_behind,
+        direct_io=direct_io,
+        prefetch_bytes=prefetch_bytes
+    )
+    video_repository = Mp4BoxVideoRepositoryAdapter(
+        duration_cache=_LazyDurationCache(),
+        max_workers=scan_workers,
+        walker=ScandirDirectoryWalker(skip_hidden=skip_hidden)
+    )
     
     # 创建用例实例，注入依赖（依赖抽象接口）
-    video_processor = VideoFileProcessor(
+    return VideoFileProcessor(
         video_repository=video_repository,
-        file_system_service=file_system_service
+        file_system_service=file_system_service,
+        transfer_scheduler=TransferScheduler(
+            file_system_service,
+            max_workers=transfer_workers,
+            per_source_device=per_device,
+            per_destination_device=per_device
+        ),
+        transfer_journal=_create_transfer_journal()
     )
+
+
+def main(startup_timer=None):
+    """
+    程序主入口函数
+    
+    实现依赖注入，创建并组装所有组件，启动GUI应用。
+    
+    Args:
+        startup_timer: 启动计时器（可选，见 startup_profile.StartupTimer）；
+                       提供时记录各阶段耗时，窗口显示出第一帧后关闭而不进入事件循环
+    """
+    def mark(phase: str):
+        if startup_timer is not None:
+            startup_timer.mark(phase)
+    
+    # 图形界面相关模块只在启动界面时导入，命令行模式不需要 Tkinter
+    import tkinter as tk
+    from src.interfaces.gui_adapter import TkinterGUIAdapter
+    from src.frameworks.gui_app import MP4CopyToolApp
+    mark('import_gui')
+    
+    video_processor = create_video_processor()
+    ui_service = TkinterGUIAdapter()
+    mark('compose')
     
     # 创建Tkinter主窗口
     root = tk.Tk()
+    mark('tk_root')
     
     # 创建GUI应用，注入用例和UI服务
     app = MP4CopyToolApp(
@@ -38,6 +188,14 @@ def main():
         video_processor=video_processor,
         ui_service=ui_service
     )
+    mark('build_window')
+    
+    if startup_timer is not None:
+        # 处理完挂起的布局和绘制事件，即窗口第一次完整显示
+        root.update()
+        mark('first_frame')
+        root.destroy()
+        return
     
     # 启动主事件循环
     root.mainloop()
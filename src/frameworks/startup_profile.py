@@ -0,0 +1,190 @@
+"""
+启动耗时测量
+
+清洁架构的框架层，测量图形界面从入口到显示出第一帧的耗时，
+按阶段（导入、组装、创建窗口、首帧）以及按模块（类似 python -X importtime）给出明细，
+用于跟踪启动时间是否在预算之内。
+本模块自身导入的少量标准库模块（如 typing、threading）在开始计时之前加载，不计入明细。
+"""
+
+import builtins
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+# 启动时间预算（秒）：从入口到窗口显示出第一帧
+STARTUP_BUDGET = 1.0
+
+# 报告中列出的最慢模块数
+TOP_IMPORTS = 25
+
+
+class StartupTimer:
+    """
+    启动计时器
+    
+    记录各阶段的结束时间，并通过替换 builtins.__import__ 统计主线程中每个新导入模块的
+    累计耗时（含其导入的子模块）和自身耗时。已导入的模块不重复计时；
+    从 fromlist 间接导入的子模块计入父模块。
+    """
+    
+    def __init__(self, clock=time.perf_counter):
+        """
+        初始化启动计时器（以创建时刻为起点）
+        
+        Args:
+            clock: 时钟函数
+        """
+        self.clock = clock
+        self.started = clock()
+        self._last = self.started
+        self.phases: List[Dict[str, object]] = []
+        self.imports: Dict[str, List[float]] = {}  # 模块名 -> [自身耗时, 累计耗时]
+        self._original_import = None
+        self._thread_id = threading.get_ident()
+        self._children: List[float] = []  # 正在导入的各层模块中子模块的累计耗时
+    
+    def mark(self, phase: str) -> None:
+        """
+        记录一个阶段结束
+        
+        Args:
+            phase: 阶段名称
+        """
+        now = self.clock()
+        self.phases.append({'phase': phase, 'seconds': now - self._last})
+        self._last = now
+    
+    @property
+    def elapsed(self) -> float:
+        """从起点到最后一个阶段结束的总耗时（秒）"""
+        return self._last - self.started
+    
+    def install(self) -> None:
+        """开始统计模块导入耗时"""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+    
+    def uninstall(self) -> None:
+        """停止统计模块导入耗时"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+    
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """
+        计时的 __import__：只统计主线程中首次导入的模块
+        """
+        original = self._original_import
+        if threading.get_ident() != self._thread_id:
+            return original(name, globals, locals, fromlist, level)
+        module_name = self._absolute_name(name, globals, level)
+        if module_name is None or module_name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+        
+        self._children.append(0.0)
+        started = self.clock()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = self.clock() - started
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += cumulative
+            record = self.imports.setdefault(module_name, [0.0, 0.0])
+            record[0] += cumulative - children
+            record[1] += cumulative
+    
+    @staticmethod
+    def _absolute_name(name: str, globals, level: int) -> Optional[str]:
+        """
+        把相对导入解析为绝对模块名
+        
+        Args:
+            name: __import__ 的模块名
+            globals: 发起导入的模块的全局变量
+            level: 相对导入的层级
+        
+        Returns:
+            Optional[str]: 绝对模块名，无法解析时返回None
+        """
+        if not level:
+            return name
+        package = (globals or {}).get('__package__')
+        if not package:
+            return None
+        parts = package.rsplit('.', level - 1)
+        if len(parts) < level:
+            return None
+        base = parts[0]
+        return f"{base}.{name}" if name else base
+    
+    def report(self, budget: float = STARTUP_BUDGET, top: int = TOP_IMPORTS) -> Dict[str, object]:
+        """
+        生成启动耗时报告
+        
+        Args:
+            budget: 时间预算（秒）
+            top: 列出的最慢模块数
+        
+        Returns:
+            Dict[str, object]: total、budget、within_budget、phases、imports（按累计耗时降序，毫秒）
+        """
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        return {
+            'total': self.elapsed,
+            'budget': budget,
+            'within_budget': self.elapsed <= budget,
+            'phases': self.phases,
+            'import_count': len(self.imports),
+            'imports': [
+                {'module': name, 'self_ms': own * 1000, 'cumulative_ms': cumulative * 1000}
+                for name, (own, cumulative) in slowest
+            ],
+        }
+
+
+def profile_startup(argv: Optional[List[str]] = None) -> int:
+    """
+    测量图形界面的启动耗时并输出 JSON 报告
+    
+    启动与正常运行相同的界面，显示出第一帧后立即关闭窗口。
+    解释器本身的启动和 PyInstaller 引导程序的耗时不在测量范围内。
+    
+    Args:
+        argv: 参数，可选的第一个参数为报告文件路径；未提供时输出到标准输出
+              （无控制台的打包程序中写入当前目录的 startup-time.json）
+    
+    Returns:
+        int: 退出码，在预算之内为0，超出预算为1，界面无法启动为3
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    timer = StartupTimer()
+    timer.install()
+    error = None
+    try:
+        from src.frameworks.main import main
+        timer.mark('import_core')
+        main(timer)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        timer.uninstall()
+    
+    import json
+    report = timer.report()
+    if error is not None:
+        report['error'] = error
+    text = json.dumps(report, indent=2)
+    if argv or sys.stdout is None:
+        with open(argv[0] if argv else 'startup-time.json', 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    
+    if error is not None:
+        return 3
+    return 0 if report['within_budget'] else 1
\ No newline at end of file
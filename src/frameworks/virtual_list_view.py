@@ -0,0 +1,264 @@
+"""
+虚拟化文件列表视图
+
+清洁架构的框架层，基于 ttk.Treeview 实现的虚拟列表：
+只为可见的若干行创建界面条目，滚动时复用这些条目显示目录中的不同文件，
+因此内存占用和刷新耗时与文件总数无关。
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Iterable, List, Optional, Set
+from src.core.catalog import VideoCatalog
+from src.core.entities import FilterCriteria
+
+
+def format_size(size: Optional[int]) -> str:
+    """
+    格式化文件大小显示
+    
+    Args:
+        size: 字节数，未知为None
+    
+    Returns:
+        str: 格式化后的大小字符串
+    """
+    if size is None:
+        return ""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+class VirtualFileListView(tk.Frame):
+    """
+    虚拟化文件列表视图
+    
+    数据来自外部的视频目录（VideoCatalog），视图只维护显示顺序（行号列表）；
+    点击列标题按该列排序，再次点击切换升降序。
+    """
+    
+    # 列定义：(列标识, 标题, 宽度)
+    COLUMNS = (
+        ("path", "路径", 480),
+        ("duration", "时长", 80),
+        ("size", "大小", 90),
+    )
+    
+    # 行标签的背景色
+    DONE_COLOR = "#e0ffe0"  # 已处理
+    MATCH_COLOR = "#fff5cc"  # 符合当前过滤条件
+    
+    def __init__(self,
+                 master: tk.Misc,
+                 format_duration: Callable[[float], str],
+                 height: int = 15):
+        """
+        初始化虚拟列表视图
+        
+        Args:
+            master: 父组件
+            format_duration: 时长格式化函数
+            height: 可见行数
+        """
+        super().__init__(master)
+        self.format_duration = format_duration
+        self.height = height
+        
+        self._catalog = VideoCatalog()  # 数据来源
+        self._order: List[int] = []  # 显示顺序：第 n 个显示位置对应的行号
+        self._done: Set[int] = set()  # 已处理的行号
+        self._match_criteria: Optional[FilterCriteria] = None  # 预览的过滤条件
+        self._top = 0  # 第一个可见位置
+        self._sort_column: Optional[str] = None
+        self._sort_reverse = False
+        
+        self.tree = ttk.Treeview(
+            self,
+            columns=[column for column, _, _ in self.COLUMNS],
+            show="headings",
+            height=height,
+            selectmode="none"
+        )
+        for column, title, width in self.COLUMNS:
+            self.tree.heading(column, text=title, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width, stretch=(column == "path"))
+        self.tree.tag_configure("done", background=self.DONE_COLOR)
+        self.tree.tag_configure("match", background=self.MATCH_COLOR)
+        
+        # 预先创建固定数量的行条目，滚动时只更新它们的内容
+        self._row_ids = [self.tree.insert("", tk.END, values=("", "", "")) for _ in range(height)]
+        
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        
+        for widget in (self.tree, self):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda e: self.scroll(-3))
+            widget.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self.scroll(-1))
+        self.tree.bind("<Down>", lambda e: self.scroll(1))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-self.height))
+        self.tree.bind("<Next>", lambda e: self.scroll(self.height))
+        
+        self._render()
+    
+    def set_catalog(self, catalog: VideoCatalog):
+        """
+        切换数据来源并重置显示状态
+        
+        Args:
+            catalog: 视频目录
+        """
+        self._catalog = catalog
+        self._order = list(range(len(catalog)))
+        self._done = set()
+        self._top = 0
+        self._set_sort(None, False)
+        self._render()
+    
+    def refresh_appended(self):
+        """
+        显示目录中新追加的文件
+        
+        追加后原有的排序不再成立，列表标题的排序标记会被清除。
+        """
+        self._order.extend(range(len(self._order), len(self._catalog)))
+        if self._sort_column is not None:
+            self._set_sort(None, False)
+        self._render()
+    
+    def refresh_all(self):
+        """
+        目录内容被整体更新（删除或修改了文件）后重新显示
+        
+        行号已经改变，已处理标记被清除；当前的排序方式和滚动位置保持不变。
+        """
+        self._done = set()
+        if self._sort_column is not None:
+            self._order = self._catalog.rows_sorted_by(self._sort_column, self._sort_reverse)
+        else:
+            self._order = list(range(len(self._catalog)))
+        self._top = max(0, min(self._top, len(self._order) - self.height))
+        self._render()
+    
+    def set_match_criteria(self, criteria: Optional[FilterCriteria]):
+        """
+        设置预览的过滤条件，符合条件的可见行会被高亮
+        
+        Args:
+            criteria: 过滤条件，None表示不高亮
+        """
+        self._match_criteria = criteria
+        self._render()
+    
+    def mark_done(self, rows: Iterable[int]):
+        """
+        将指定行标记为已处理（高亮显示）
+        
+        Args:
+            rows: 行号（追加时的顺序下标）
+        """
+        self._done.update(rows)
+        self._render()
+    
+    def sort_by(self, column: str):
+        """
+        按指定列排序，重复点击同一列时切换升降序
+        
+        Args:
+            column: 列标识（path / duration / size）
+        """
+        reverse = (not self._sort_reverse) if self._sort_column == column else False
+        # 排序由目录的列式数据完成（时长列直接复用时长索引）
+        self._order = self._catalog.rows_sorted_by(column, reverse)
+        self._set_sort(column, reverse)
+        self._top = 0
+        self._render()
+    
+    def scroll(self, delta: int):
+        """
+        按行滚动
+        
+        Args:
+            delta: 滚动的行数，负数向上
+        """
+        self._scroll_to(self._top + delta)
+        return "break"
+    
+    def _set_sort(self, column: Optional[str], reverse: bool):
+        """
+        记录排序状态并更新列标题上的排序标记
+        
+        Args:
+            column: 排序列，None表示未排序
+            reverse: 是否降序
+        """
+        self._sort_column = column
+        self._sort_reverse = reverse
+        for name, title, _ in self.COLUMNS:
+            if name == column:
+                title += " ▼" if reverse else " ▲"
+            self.tree.heading(name, text=title)
+    
+    def _scroll_to(self, top: int):
+        """
+        滚动到指定的第一个可见位置
+        
+        Args:
+            top: 第一个可见位置
+        """
+        top = max(0, min(top, len(self._order) - self.height))
+        if top != self._top:
+            self._top = top
+            self._render()
+    
+    def _on_scrollbar(self, *args):
+        """
+        处理滚动条命令（moveto / scroll）
+        """
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._order)))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.height
+            self._scroll_to(self._top + amount)
+    
+    def _on_mousewheel(self, event):
+        """
+        处理鼠标滚轮（Windows / macOS）
+        """
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+    
+    def _render(self):
+        """
+        刷新可见行的内容和滚动条位置
+        """
+        total = len(self._order)
+        for offset, row_id in enumerate(self._row_ids):
+            position = self._top + offset
+            if position < total:
+                row = self._order[position]
+                video = self._catalog[row]
+                values = (video.path, self.format_duration(video.duration), format_size(video.size))
+                if row in self._done:
+                    tags = ("done",)
+                elif self._match_criteria is not None and self._match_criteria.matches(video):
+                    tags = ("match",)
+                else:
+                    tags = ()
+            else:
+                values, tags = ("", "", ""), ()
+            self.tree.item(row_id, values=values, tags=tags)
+        
+        if total > self.height:
+            self.scrollbar.set(self._top / total, (self._top + self.height) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
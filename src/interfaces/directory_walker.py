@@ -0,0 +1,245 @@
+"""
+目录遍历器
+
+基于 os.scandir 的并行目录遍历：多个子目录同时列举，复用 DirEntry 中的 stat 信息，
+在 SMB/NFS 等目录列举延迟较高的网络共享上明显快于 os.walk。
+"""
+
+import fnmatch
+import os
+import stat as stat_module
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+from src.core.cancellation import CancellationToken
+
+
+# Windows 上隐藏 / 系统属性（其他平台 stat 结果中没有 st_file_attributes）
+_HIDDEN_ATTRIBUTES = (
+    getattr(stat_module, 'FILE_ATTRIBUTE_HIDDEN', 0x2)
+    | getattr(stat_module, 'FILE_ATTRIBUTE_SYSTEM', 0x4)
+)
+
+# 总是跳过的系统目录
+_SYSTEM_DIRECTORIES = {'$recycle.bin', 'system volume information', '@eadir', '#recycle'}
+
+
+class DirectoryListing:
+    """单个目录的列举结果"""
+    
+    __slots__ = ('mtime_ns', 'identity', 'files', 'subdirs')
+    
+    def __init__(self):
+        # 列举前读取的目录修改时间和身份 (st_dev, st_ino)，目录无法访问时为None
+        self.mtime_ns: Optional[int] = None
+        self.identity: Optional[Tuple[int, int]] = None
+        # (路径, 文件名, stat 结果)
+        self.files: List[Tuple[str, str, os.stat_result]] = []
+        # (路径, 相对路径, 目录身份 (st_dev, st_ino))
+        self.subdirs: List[Tuple[str, str, Optional[Tuple[int, int]]]] = []
+
+
+class ScandirDirectoryWalker:
+    """
+    并行目录遍历器
+    
+    子目录按发现顺序提交到线程池列举，结果按提交顺序（广度优先）产出，
+    因此同一棵目录树的遍历顺序是确定的。
+    """
+    
+    def __init__(self,
+                 include_patterns: Iterable[str] = ('*.mp4',),
+                 exclude_patterns: Iterable[str] = (),
+                 skip_hidden: bool = False,
+                 max_depth: Optional[int] = None,
+                 follow_symlinks: bool = False,
+                 max_workers: int = 4):
+        """
+        初始化目录遍历器
+        
+        Args:
+            include_patterns: 要产出的文件名通配符（不区分大小写）
+            exclude_patterns: 要排除的文件或目录通配符；包含 "/" 时匹配相对路径
+            skip_hidden: 是否跳过隐藏目录和系统目录（以 "." 开头或带隐藏/系统属性），
+                         默认与 os.walk 一样进入；文件不受影响，隐藏文件总是列出
+            max_depth: 最大遍历深度，根目录为0，None表示不限制
+            follow_symlinks: 是否进入符号链接指向的目录（会检测循环）；
+                             指向文件的符号链接总是与 os.walk 一样作为文件列出
+            max_workers: 同时列举目录的线程数
+        """
+        self.include_patterns = [p.lower() for p in include_patterns]
+        self.exclude_patterns = [p.lower() for p in exclude_patterns]
+        self.skip_hidden = skip_hidden
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+        self.max_workers = max(1, max_workers)
+    
+    def walk(self, root: str,
+             on_directory: Optional[Callable[[str, str, int, DirectoryListing, List[str]], None]] = None,
+             relative: str = '',
+             depth: int = 0,
+             cancel_token: Optional[CancellationToken] = None) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """
+        遍历目录树，产出匹配的文件
+        
+        Args:
+            root: 根目录
+            on_directory: 每列举完一个目录时的回调（可选），参数为
+                          (目录路径, 相对路径, 深度, 列举结果, 实际进入的子目录路径)，在调用线程中触发
+            relative: root 相对于最初遍历根目录的路径，用于从子目录继续遍历
+            depth: root 的深度，用于从子目录继续遍历时遵守 max_depth
+            cancel_token: 取消令牌（可选），每处理一个目录前检查一次
+        
+        Yields:
+            Tuple[str, str, os.stat_result]: (文件路径, 文件名, stat 结果)
+        
+        Raises:
+            OperationCancelledError: 遍历被取消
+        """
+        visited: Set[Tuple[int, int]] = set()
+        try:
+            st = os.stat(root)
+            visited.add((st.st_dev, st.st_ino))
+        except OSError:
+            return
+        
+        # 待处理的目录：(Future 或 None, 路径, 相对路径, 深度)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+        
+        def submit(path: str, relative: str, depth: int):
+            if executor is None:
+                pending.append((None, path, relative, depth))
+            else:
+                pending.append((executor.submit(self.list_directory, path, relative),
+                                path, relative, depth))
+        
+        try:
+            submit(root, relative, depth)
+            while pending:
+                if cancel_token is not None:
+                    cancel_token.checkpoint()
+                future, path, relative, depth = pending.popleft()
+                listing = future.result() if future is not None else self.list_directory(path, relative)
+                
+                children = []
+                if self.max_depth is None or depth < self.max_depth:
+                    for sub_path, sub_relative, identity in listing.subdirs:
+                        if identity is not None:
+                            # 通过 (st_dev, st_ino) 检测符号链接造成的循环
+                            if identity in visited:
+                                continue
+                            visited.add(identity)
+                        submit(sub_path, sub_relative, depth + 1)
+                        children.append(sub_path)
+                
+                if on_directory is not None:
+                    on_directory(path, relative, depth, listing, children)
+                yield from listing.files
+        finally:
+            if executor is not None:
+                for future, _, _, _ in pending:
+                    if future is not None:
+                        future.cancel()
+                executor.shutdown(wait=True)
+    
+    def list_directory(self, path: str, relative: str = '') -> DirectoryListing:
+        """
+        列举单个目录（不递归，遍历时在工作线程中执行）
+        
+        Args:
+            path: 目录路径
+            relative: 相对根目录的路径（使用 "/" 分隔）
+        
+        Returns:
+            DirectoryListing: 目录修改时间、匹配的文件和需要继续遍历的子目录
+        """
+        listing = DirectoryListing()
+        try:
+            # 先读取修改时间再列举：列举期间发生的变化会在下次比较时被发现
+            st = os.stat(path)
+            listing.mtime_ns = st.st_mtime_ns
+            listing.identity = (st.st_dev, st.st_ino)
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    entry_relative = f"{relative}/{name}" if relative else name
+                    if self._is_excluded(entry, entry_relative):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                            if self.skip_hidden and self._is_hidden(entry):
+                                continue
+                            identity = None
+                            if self.follow_symlinks:
+                                # Windows 上 DirEntry.stat() 的 st_dev / st_ino 为0，检测循环需要 os.stat
+                                st = os.stat(entry.path)
+                                identity = (st.st_dev, st.st_ino)
+                            listing.subdirs.append((entry.path, entry_relative, identity))
+                        elif entry.is_file() and self._is_included(name):
+                            # 与 os.walk 一样跟随指向文件的符号链接，stat 结果为目标文件的信息；
+                            # Windows 上 DirEntry.stat() 直接使用列举时取得的信息，无需额外系统调用，
+                            # 但其中 st_ino 为0，使用方此时只能按路径识别文件
+                            listing.files.append((entry.path, name, entry.stat()))
+                    except OSError:
+                        # 条目在列举期间被删除或无权访问
+                        continue
+        except OSError:
+            # 目录无权访问或已被删除，与 os.walk 一样忽略
+            pass
+        return listing
+    
+    def _is_included(self, name: str) -> bool:
+        """
+        判断文件名是否匹配包含规则
+        
+        Args:
+            name: 文件名
+        
+        Returns:
+            bool: 匹配返回True
+        """
+        lowered = name.lower()
+        return any(fnmatch.fnmatchcase(lowered, pattern) for pattern in self.include_patterns)
+    
+    def _is_excluded(self, entry: os.DirEntry, relative: str) -> bool:
+        """
+        判断目录条目是否匹配排除规则
+        
+        Args:
+            entry: 目录条目
+            relative: 相对根目录的路径
+        
+        Returns:
+            bool: 应排除返回True
+        """
+        lowered = entry.name.lower()
+        if self.exclude_patterns:
+            lowered_relative = relative.lower()
+            for pattern in self.exclude_patterns:
+                target = lowered_relative if '/' in pattern else lowered
+                if fnmatch.fnmatchcase(target, pattern):
+                    return True
+        return False
+    
+    @staticmethod
+    def _is_hidden(entry: os.DirEntry) -> bool:
+        """
+        判断目录是否为隐藏目录或系统目录
+        
+        Args:
+            entry: 目录条目
+        
+        Returns:
+            bool: 隐藏或系统目录返回True
+        """
+        lowered = entry.name.lower()
+        if lowered.startswith('.') or lowered in _SYSTEM_DIRECTORIES:
+            return True
+        if os.name == 'nt':
+            try:
+                if entry.stat(follow_symlinks=False).st_file_attributes & _HIDDEN_ATTRIBUTES:
+                    return True
+            except (OSError, AttributeError):
+                pass
+        return False
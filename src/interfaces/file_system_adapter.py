@@ -4,52 +4,984 @@
 实现 FileSystemService 接口，提供实际的文件系统操作。
 """
 
+import errno
+import hashlib
+import mmap
 import os
+import queue
 import shutil
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from src.core.cancellation import CancellationToken, OperationCancelledError
 from src.core.ports import FileSystemService
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import xxhash
+except ImportError:  # 可选依赖，未安装时使用 SHA-256
+    xxhash = None
+
+
+_libc_module = None
+_libc_checked = False
+
+
+def _libc():
+    """
+    首次使用时加载 C 运行库（用于 mincore）
+    
+    find_library 在 Linux 上可能启动 ldconfig 子进程，因此不在导入模块时执行。
+    
+    Returns:
+        C 运行库，不可用时返回None
+    """
+    global _libc_module, _libc_checked
+    if not _libc_checked:
+        _libc_module = None
+        if not sys.platform.startswith('win'):
+            try:
+                import ctypes.util
+                libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+                libc.mincore  # 确认符号存在
+                _libc_module = libc
+            except (ImportError, OSError, AttributeError):
+                pass
+        _libc_checked = True
+    return _libc_module
+
+
+# Linux FICLONE ioctl 编号（btrfs / XFS / bcachefs 等支持 reflink 的文件系统）
+_FICLONE = 0x40049409
+
+# Linux FS_IOC_FIEMAP ioctl 编号及 struct fiemap / struct fiemap_extent 的布局
+_FS_IOC_FIEMAP = 0xC020660B
+_FIEMAP_HEADER = struct.Struct('=QQIIII')  # fm_start, fm_length, fm_flags, fm_mapped_extents, fm_extent_count, fm_reserved
+_FIEMAP_EXTENT_SIZE = 56
+
+# 内核零拷贝不可用时可以安全回退的错误码
+_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.EPERM,
+    getattr(errno, 'EOPNOTSUPP', errno.EINVAL), getattr(errno, 'ENOTSUP', errno.EINVAL),
+    getattr(errno, 'ENOTTY', errno.EINVAL),
+}
+
+# 复制过程中的临时文件后缀，完成后原子重命名为目标文件
+PARTIAL_SUFFIX = '.partial'
+
+# 校验值清单文件名前缀，后接算法名（如 checksums.sha256）
+MANIFEST_PREFIX = 'checksums.'
+
+# O_DIRECT 要求的缓冲区地址、文件偏移和长度对齐
+_DIRECT_IO_ALIGNMENT = 4096
+
+# posix_fadvise 提示（macOS、Windows 不支持时为None）
+_FADV_SEQUENTIAL = getattr(os, 'POSIX_FADV_SEQUENTIAL', None)
+_FADV_WILLNEED = getattr(os, 'POSIX_FADV_WILLNEED', None)
+_FADV_DONTNEED = getattr(os, 'POSIX_FADV_DONTNEED', None)
+
+
+def _new_digest():
+    """
+    创建校验用的哈希对象，安装了 xxhash 时使用更快的 XXH3-128
+    
+    Returns:
+        Tuple[str, object]: (算法名, 哈希对象)
+    """
+    if xxhash is not None:
+        return 'xxh128', xxhash.xxh3_128()
+    return 'sha256', hashlib.sha256()
+
+
+class ChecksumMismatchError(OSError):
+    """
+    写入的目标文件与复制时计算的校验值不一致
+    """
+
+
+class CopyStrategy:
+    """
+    文件复制策略名称
+    """
+    
+    REFLINK = "reflink"  # 写时复制克隆，不复制数据块
+    COPY_FILE_RANGE = "copy_file_range"  # 内核内复制
+    SENDFILE = "sendfile"  # 内核内复制（旧内核）
+    BUFFERED = "buffered"  # 用户态大缓冲区读写
+    RENAME = "rename"  # 同一文件系统内移动，仅重命名
+    HARDLINK = "hardlink"  # 硬链接，与源文件共享数据
+
 
 class PythonFileSystemAdapter(FileSystemService):
     """
     Python 文件系统适配器
     
-    使用 Python 标准库实现文件系统操作。
+    使用 Python 标准库实现文件系统操作。复制时依次尝试 reflink、
+    copy_file_range、sendfile，最后回退到大缓冲区读写循环，尽量避免数据经过 Python 内存。
     """
     
-    def copy_file(self, source_path: str, destination_path: str) -> bool:
+    # 用户态复制循环的缓冲区大小
+    BUFFER_SIZE = 8 * 1024 * 1024
+    
+    # 传输当前文件时提示内核预读下一个文件开头的字节数
+    PREFETCH_BYTES = 8 * 1024 * 1024
+    
+    # 可恢复复制时两次检查点之间的字节数（每个检查点前同步写入磁盘）
+    CHECKPOINT_INTERVAL = 256 * 1024 * 1024
+    
+    # 抽样指纹读取的数据块大小（开头、中间、结尾各一块）
+    FINGERPRINT_BLOCK_SIZE = 4096
+    
+    # 丢弃页缓存（drop_behind）的窗口大小：每复制这么多字节释放一次已处理部分的缓存
+    DROP_BEHIND_WINDOW = 32 * 1024 * 1024
+    
+    # 需要报告进度时内核复制单次调用的最大字节数（用户态循环每个缓冲区报告一次）
+    PROGRESS_WINDOW = 16 * 1024 * 1024
+    
+    def __init__(self,
+                 buffer_size: int = BUFFER_SIZE,
+                 double_buffer: bool = True,
+                 drop_behind: bool = False,
+                 direct_io: bool = False,
+                 prefetch_bytes: int = PREFETCH_BYTES):
+        """
+        初始化文件系统适配器
+        
+        后几个参数调节用户态复制循环和页缓存的使用，除预读下一个文件外默认值与普通复制行为一致。
+        
+        Args:
+            buffer_size: 用户态复制循环的缓冲区大小（每个线程复用，按页对齐）
+            double_buffer: 用户态复制时由读线程预读下一块，读写重叠进行
+            drop_behind: 复制过程中释放已处理部分的页缓存（源和目标），
+                         大批量复制时不挤占其他程序的缓存；完成时目标文件会被同步到磁盘
+            direct_io: 用户态复制时使用 O_DIRECT 绕过页缓存（仅 Linux，文件系统不支持时自动回退），
+                       此时不使用 copy_file_range / sendfile
+            prefetch_bytes: prefetch 时提示内核预读的文件开头字节数，0 表示不预读
         """
-        复制文件
+        self.buffer_size = max(_DIRECT_IO_ALIGNMENT,
+                               buffer_size // _DIRECT_IO_ALIGNMENT * _DIRECT_IO_ALIGNMENT)
+        self.double_buffer = double_buffer
+        self.drop_behind = drop_behind
+        self.direct_io = direct_io
+        self.prefetch_bytes = prefetch_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.strategy_counts: Dict[str, int] = {}
+        self._copied_bytes = 0
+        self._copy_seconds = 0.0
+    
+    def copy_file(self, source_path: str, destination_path: str,
+                  resume_offset: int = 0,
+                  checkpoint: Optional[Callable[[int], None]] = None,
+                  verify: bool = False,
+                  progress: Optional[Callable[[int], None]] = None,
+                  cancel_token: Optional[CancellationToken] = None) -> bool:
+        """
+        复制文件，保留修改时间、权限等元数据（与 shutil.copy2 一致）
+        
+        数据写入 "目标路径.partial"，完成后原子重命名为目标文件。
         
         Args:
             source_path: 源文件路径
             destination_path: 目标文件路径
+            resume_offset: 从已有临时文件的该字节偏移处继续复制
+            checkpoint: 检查点回调（可选），参数为已同步到磁盘的字节数
+            verify: 复制时计算校验值并回读目标文件核对，结果可用 get_last_checksum 获取
+            progress: 进度回调（可选），参数为该文件已复制的字节数，在复制过程中定期调用
+            cancel_token: 取消令牌（可选），每复制至多 PROGRESS_WINDOW 字节检查一次
             
         Returns:
             bool: 复制成功返回True
+        
+        Raises:
+            OperationCancelledError: 复制被取消（临时文件已删除）
         """
+        self._local.last_checksum = None
         try:
-            shutil.copy2(source_path, destination_path)
+            self._copy_with_metadata(source_path, destination_path, resume_offset, checkpoint,
+                                     verify, progress, cancel_token)
             return True
+        except OperationCancelledError:
+            raise
         except Exception:
             return False
     
-    def move_file(self, source_path: str, destination_path: str) -> bool:
+    def move_file(self, source_path: str, destination_path: str,
+                  resume_offset: int = 0,
+                  checkpoint: Optional[Callable[[int], None]] = None,
+                  verify: bool = False,
+                  progress: Optional[Callable[[int], None]] = None,
+                  cancel_token: Optional[CancellationToken] = None) -> bool:
         """
         移动文件
         
+        跨设备移动并要求校验时，目标文件核对通过后才删除源文件；
+        同一文件系统内仅重命名，不会复制数据，校验值直接从目标文件计算。
+        
         Args:
             source_path: 源文件路径
             destination_path: 目标文件路径
+            resume_offset: 跨设备复制时从已有临时文件的该字节偏移处继续
+            checkpoint: 检查点回调（可选），参数为已同步到磁盘的字节数
+            verify: 是否校验，规则同 copy_file
+            progress: 进度回调（可选），跨设备复制时调用，规则同 copy_file
+            cancel_token: 取消令牌（可选），规则同 copy_file；复制完成前取消不会删除源文件
             
         Returns:
             bool: 移动成功返回True
+        
+        Raises:
+            OperationCancelledError: 移动被取消
         """
+        copied = False
+        
+        def copy_function(src: str, dst: str) -> str:
+            nonlocal copied
+            copied = True
+            return self._copy_with_metadata(src, dst, resume_offset, checkpoint, verify, progress,
+                                            cancel_token)
+        
+        self._local.last_checksum = None
+        if cancel_token is not None:
+            cancel_token.checkpoint()
         try:
-            shutil.move(source_path, destination_path)
+            # 同一文件系统内 shutil.move 直接重命名；跨设备时使用零拷贝复制后删除源文件
+            shutil.move(source_path, destination_path, copy_function=copy_function)
+            if not copied:
+                # 跨设备复制时已记录实际使用的复制策略
+                self._record_strategy(CopyStrategy.RENAME)
+            if verify and self._local.last_checksum is None:
+                self._local.last_checksum = self._hash_file(destination_path)
             return True
+        except OperationCancelledError:
+            raise
         except Exception:
             return False
     
+    def link_file(self, source_path: str, destination_path: str, prefer_reflink: bool = False) -> bool:
+        """
+        以“虚拟复制”方式在目标位置创建文件
+        
+        源和目标位于同一文件系统时创建硬链接（或 reflink 克隆），不占用额外空间；
+        跨设备或文件系统不支持链接时回退为普通复制。
+        
+        Args:
+            source_path: 源文件路径
+            destination_path: 目标文件路径
+            prefer_reflink: 为True时优先创建写时复制克隆而不是硬链接
+            
+        Returns:
+            bool: 成功返回True
+        """
+        source_device = self.get_device_id(source_path)
+        destination_device = self.get_device_id(os.path.dirname(destination_path) or '.')
+        if source_device is None or source_device != destination_device:
+            return self.copy_file(source_path, destination_path)
+        
+        if prefer_reflink and self._reflink_file(source_path, destination_path):
+            self._record_strategy(CopyStrategy.REFLINK)
+            return True
+        
+        try:
+            if os.path.lexists(destination_path):
+                if os.path.samefile(source_path, destination_path):
+                    # 目标已经是同一文件的链接
+                    self._record_strategy(CopyStrategy.HARDLINK)
+                    return True
+                # 与复制一样覆盖已存在的目标：先链接到临时名再原子替换
+                temp_path = destination_path + '.link.tmp'
+                os.link(source_path, temp_path)
+                os.replace(temp_path, destination_path)
+            else:
+                os.link(source_path, destination_path)
+            self._record_strategy(CopyStrategy.HARDLINK)
+            return True
+        except OSError:
+            # 文件系统不支持硬链接（如 FAT/exFAT）
+            return self.copy_file(source_path, destination_path)
+    
+    def _reflink_file(self, source_path: str, destination_path: str) -> bool:
+        """
+        创建 reflink 克隆并复制元数据，失败时不留下临时文件
+        
+        与硬链接一样先克隆到临时名再原子替换，已存在的目标会被覆盖。
+        
+        Args:
+            source_path: 源文件路径
+            destination_path: 目标文件路径
+            
+        Returns:
+            bool: 克隆成功返回True，文件系统不支持 FICLONE 时返回False
+        """
+        if fcntl is None:
+            return False
+        temp_path = destination_path + '.link.tmp'
+        created = False
+        try:
+            with open(source_path, 'rb') as fsrc, open(temp_path, 'wb') as fdst:
+                created = True
+                cloned = self._try_reflink(fsrc.fileno(), fdst.fileno())
+            if cloned:
+                shutil.copystat(source_path, temp_path)
+                os.replace(temp_path, destination_path)
+                return True
+        except OSError:
+            pass
+        if created:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return False
+    
+    def get_last_copy_strategy(self) -> Optional[str]:
+        """
+        获取当前线程最近一次复制/移动使用的策略
+        
+        Returns:
+            Optional[str]: 策略名称，见 CopyStrategy
+        """
+        return getattr(self._local, 'last_strategy', None)
+    
+    def get_last_checksum(self) -> Optional[str]:
+        """
+        获取当前线程最近一次校验复制/移动得到的校验值
+        
+        Returns:
+            Optional[str]: "算法:十六进制摘要"，未校验或失败返回None
+        """
+        return getattr(self._local, 'last_checksum', None)
+    
+    def write_checksum_manifest(self, directory: str, checksums: Dict[str, str]) -> Optional[str]:
+        """
+        把校验值合并写入目录中的清单文件（格式与 sha256sum / xxhsum 兼容）
+        
+        同名文件的旧记录被替换；清单先写入临时文件再原子替换。
+        
+        Args:
+            directory: 清单所在目录（即输出目录）
+            checksums: 文件名 -> "算法:十六进制摘要"
+            
+        Returns:
+            Optional[str]: 清单文件路径（多种算法时为最后写入的一个），没有可写入的内容或失败返回None
+        """
+        by_algorithm: Dict[str, Dict[str, str]] = {}
+        for name, checksum in checksums.items():
+            algorithm, _, digest = checksum.partition(':')
+            by_algorithm.setdefault(algorithm, {})[name] = digest
+        
+        manifest_path = None
+        for algorithm, entries in by_algorithm.items():
+            path = os.path.join(directory, MANIFEST_PREFIX + algorithm)
+            merged: Dict[str, str] = {}
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        digest, sep, name = line.rstrip('\n').partition('  ')
+                        if sep:
+                            merged[name] = digest
+            except OSError:
+                pass
+            merged.update(entries)
+            temp_path = path + '.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+                    f.writelines(f"{digest}  {name}\n" for name, digest in sorted(merged.items()))
+                os.replace(temp_path, path)
+            except OSError:
+                return None
+            manifest_path = path
+        return manifest_path
+    
+    def _copy_with_metadata(self, source_path: str, destination_path: str,
+                            resume_offset: int = 0,
+                            checkpoint: Optional[Callable[[int], None]] = None,
+                            verify: bool = False,
+                            progress: Optional[Callable[[int], None]] = None,
+                            cancel_token: Optional[CancellationToken] = None) -> str:
+        """
+        复制文件数据和元数据到临时文件，完成后原子重命名为目标文件
+        
+        也作为 shutil.move 跨设备时的复制函数。没有检查点回调时失败会删除临时文件；
+        有检查点回调时保留临时文件，供之后从检查点继续。被取消时总是删除临时文件。
+        校验时在重命名之前回读临时文件核对，未通过则删除临时文件并抛出异常，
+        因此跨设备移动不会删除源文件。
+        
+        Args:
+            source_path: 源文件路径
+            destination_path: 目标文件路径
+            resume_offset: 从已有临时文件的该字节偏移处继续复制
+            checkpoint: 检查点回调（可选）
+            verify: 是否在复制时计算校验值并核对目标文件
+            progress: 进度回调（可选）
+            cancel_token: 取消令牌（可选）
+            
+        Returns:
+            str: 目标文件路径
+        """
+        if cancel_token is not None:
+            cancel_token.checkpoint()
+        partial_path = destination_path + PARTIAL_SUFFIX
+        algorithm, digest = _new_digest() if verify else (None, None)
+        try:
+            start = self._valid_resume_offset(partial_path, resume_offset)
+            strategy = self._copy_data(source_path, partial_path, start, checkpoint, digest, progress,
+                                       cancel_token)
+            if digest is not None:
+                checksum = f"{algorithm}:{digest.hexdigest()}"
+                if self._hash_file(partial_path) != checksum:
+                    raise ChecksumMismatchError(errno.EIO, "校验值不一致", destination_path)
+            shutil.copystat(source_path, partial_path)
+            os.replace(partial_path, destination_path)
+        except Exception as e:
+            # 校验未通过的临时文件不能用于继续复制；取消时不留下不完整的输出
+            if checkpoint is None or isinstance(e, (ChecksumMismatchError, OperationCancelledError)):
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+            raise
+        self._record_strategy(strategy)
+        if digest is not None:
+            self._local.last_checksum = checksum
+        return destination_path
+    
+    def _hash_file(self, path: str) -> str:
+        """
+        读取文件计算校验值（算法同 _new_digest）
+        
+        读取前丢弃该文件的页缓存（支持时），使核对读到的是实际写入存储的数据。
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            str: "算法:十六进制摘要"
+        """
+        algorithm, digest = _new_digest()
+        view = self._get_buffers(1)[0]
+        with open(path, 'rb') as f:
+            self._fadvise(f.fileno(), 0, 0, _FADV_DONTNEED)
+            while True:
+                n = f.readinto(view)
+                if not n:
+                    break
+                digest.update(view[:n])
+            if self.drop_behind:
+                self._fadvise(f.fileno(), 0, 0, _FADV_DONTNEED)
+        return f"{algorithm}:{digest.hexdigest()}"
+    
+    @staticmethod
+    def _valid_resume_offset(partial_path: str, resume_offset: int) -> int:
+        """
+        校验继续复制的偏移：临时文件存在且不短于检查点时才从检查点继续
+        
+        Args:
+            partial_path: 临时文件路径
+            resume_offset: 检查点记录的字节偏移
+            
+        Returns:
+            int: 实际开始复制的偏移
+        """
+        if resume_offset <= 0:
+            return 0
+        try:
+            size = os.path.getsize(partial_path)
+        except OSError:
+            return 0
+        return resume_offset if size >= resume_offset else 0
+    
+    def _record_strategy(self, strategy: str) -> None:
+        """
+        记录复制策略（线程内最近一次及累计次数）
+        
+        Args:
+            strategy: 策略名称
+        """
+        self._local.last_strategy = strategy
+        with self._stats_lock:
+            self.strategy_counts[strategy] = self.strategy_counts.get(strategy, 0) + 1
+    
+    def _copy_data(self, source_path: str, destination_path: str,
+                   start: int = 0,
+                   checkpoint: Optional[Callable[[int], None]] = None,
+                   digest=None,
+                   progress: Optional[Callable[[int], None]] = None,
+                   cancel_token: Optional[CancellationToken] = None) -> str:
+        """
+        复制文件内容，按 reflink → copy_file_range → sendfile → 用户态复制循环的顺序尝试
+        
+        Args:
+            source_path: 源文件路径
+            destination_path: 目标文件路径
+            start: 开始复制的字节偏移，大于0时保留目标文件中此前已写入的部分
+            checkpoint: 检查点回调（可选），每复制 CHECKPOINT_INTERVAL 字节同步磁盘后调用
+            digest: 哈希对象（可选），以源文件完整内容更新
+            progress: 进度回调（可选），每复制至多 PROGRESS_WINDOW 字节调用一次
+            cancel_token: 取消令牌（可选），与进度回调在同一时机检查
+            
+        Returns:
+            str: 实际使用的策略名称
+        """
+        started = time.monotonic()
+        with open(source_path, 'rb') as fsrc, open(destination_path, 'r+b' if start else 'wb') as fdst:
+            if start:
+                # 丢弃检查点之后未确认的数据
+                fdst.truncate(start)
+            size = os.fstat(fsrc.fileno()).st_size
+            strategy = self._copy_contents(fsrc, fdst, size, start, checkpoint, digest, progress,
+                                           cancel_token)
+            if checkpoint is not None or digest is not None or self.drop_behind:
+                # 记录完成、回读核对和释放目标文件的页缓存之前，数据都必须已落盘
+                fdst.flush()
+                os.fsync(fdst.fileno())
+            if self.drop_behind:
+                self._fadvise(fsrc.fileno(), 0, 0, _FADV_DONTNEED)
+                self._fadvise(fdst.fileno(), 0, 0, _FADV_DONTNEED)
+        self._record_throughput(size - start, time.monotonic() - started)
+        return strategy
+    
+    def _copy_contents(self, fsrc, fdst, size: int, start: int,
+                       checkpoint: Optional[Callable[[int], None]],
+                       digest,
+                       progress: Optional[Callable[[int], None]] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> str:
+        """
+        选择复制方式并复制数据
+        
+        提供哈希对象或启用 direct_io 时数据必须经过用户态，直接使用复制循环。
+        
+        Args:
+            fsrc: 源文件对象
+            fdst: 目标文件对象
+            size: 源文件大小
+            start: 开始复制的字节偏移
+            checkpoint: 检查点回调（可选）
+            digest: 哈希对象（可选）
+            progress: 进度回调（可选）
+            cancel_token: 取消令牌（可选）
+            
+        Returns:
+            str: 实际使用的策略名称
+        """
+        in_fd = fsrc.fileno()
+        out_fd = fdst.fileno()
+        self._fadvise(in_fd, start, 0, _FADV_SEQUENTIAL)
+        on_progress = self._progress_handler(in_fd, fdst, start, checkpoint, progress, cancel_token)
+        chunk = 1 << 30  # 单次调用不超过 1GB，兼容 32 位系统上的 ssize_t 限制
+        if checkpoint is not None:
+            chunk = self.CHECKPOINT_INTERVAL
+        if self.drop_behind:
+            chunk = min(chunk, self.DROP_BEHIND_WINDOW)
+        if progress is not None or cancel_token is not None:
+            chunk = min(chunk, self.PROGRESS_WINDOW)
+        
+        zero_copy = digest is None and not self.direct_io
+        if zero_copy and not start and self._try_reflink(in_fd, out_fd):
+            return CopyStrategy.REFLINK
+        if zero_copy and hasattr(os, 'copy_file_range') and self._try_kernel_copy(
+                lambda offset, count: os.copy_file_range(
+                    in_fd, out_fd, count, offset, offset),
+                size, start, chunk, on_progress):
+            return CopyStrategy.COPY_FILE_RANGE
+        if zero_copy and sys.platform.startswith('linux'):
+            # sendfile 从目标文件的当前位置写入
+            os.lseek(out_fd, start, os.SEEK_SET)
+            if self._try_kernel_copy(
+                    lambda offset, count: os.sendfile(out_fd, in_fd, offset, count),
+                    size, start, chunk, on_progress):
+                return CopyStrategy.SENDFILE
+        
+        self._stream_copy(fsrc, fdst, size, start, digest, on_progress)
+        return CopyStrategy.BUFFERED
+    
+    def _progress_handler(self, in_fd: int, fdst, start: int,
+                          checkpoint: Optional[Callable[[int], None]],
+                          progress: Optional[Callable[[int], None]] = None,
+                          cancel_token: Optional[CancellationToken] = None
+                          ) -> Optional[Callable[[int], None]]:
+        """
+        创建复制进度回调：按窗口释放已复制部分的页缓存，按间隔同步磁盘并记录检查点，
+        转发给调用方的进度回调，最后检查暂停和取消
+        
+        Args:
+            in_fd: 源文件描述符
+            fdst: 目标文件对象
+            start: 开始复制的字节偏移
+            checkpoint: 检查点回调（可选）
+            progress: 调用方的进度回调（可选）
+            cancel_token: 取消令牌（可选）
+            
+        Returns:
+            Optional[Callable[[int], None]]: 以当前偏移调用的回调，无需处理时返回None
+        """
+        if checkpoint is None and progress is None and cancel_token is None and not self.drop_behind:
+            return None
+        out_fd = fdst.fileno()
+        next_checkpoint = start + self.CHECKPOINT_INTERVAL
+        source_dropped = destination_window = start
+        
+        def on_progress(offset: int) -> None:
+            nonlocal next_checkpoint, source_dropped, destination_window
+            if self.drop_behind and offset - source_dropped >= self.DROP_BEHIND_WINDOW:
+                self._fadvise(in_fd, source_dropped, offset - source_dropped, _FADV_DONTNEED)
+                # 目标的脏页要写回后才能释放：第一次提示启动写回，下一个窗口时再提示一次即可释放
+                self._fadvise(out_fd, destination_window, offset - destination_window, _FADV_DONTNEED)
+                destination_window, source_dropped = source_dropped, offset
+            if checkpoint is not None and offset >= next_checkpoint:
+                fdst.flush()
+                os.fsync(out_fd)
+                checkpoint(offset)
+                next_checkpoint = offset + self.CHECKPOINT_INTERVAL
+            if progress is not None:
+                progress(offset)
+            if cancel_token is not None:
+                # 暂停时在此阻塞，已写入的数据和检查点都已处理
+                cancel_token.checkpoint()
+        
+        return on_progress
+    
+    def _stream_copy(self, fsrc, fdst, size: int, start: int, digest,
+                     on_progress: Optional[Callable[[int], None]]) -> None:
+        """
+        用户态复制循环：复用页对齐的缓冲区，按偏移读写（不依赖文件位置）
+        
+        启用 double_buffer 时由读线程填充一块缓冲区的同时写入另一块；
+        启用 direct_io 时对源和目标设置 O_DIRECT，最后不对齐的尾部关闭 O_DIRECT 后写入。
+        
+        Args:
+            fsrc: 源文件对象
+            fdst: 目标文件对象
+            size: 源文件大小
+            start: 开始复制的字节偏移
+            digest: 哈希对象（可选）
+            on_progress: 进度回调（可选）
+        """
+        in_fd = fsrc.fileno()
+        out_fd = fdst.fileno()
+        views = self._get_buffers(2 if self.double_buffer and size - start > self.buffer_size else 1)
+        if digest is not None and start:
+            # 从检查点继续时补算已复制部分的校验值
+            offset = 0
+            while offset < start:
+                n = self._read_at(fsrc, views[0][:min(start - offset, self.buffer_size)], offset)
+                if not n:
+                    break
+                digest.update(views[0][:n])
+                offset += n
+        
+        direct_out = False
+        if self.direct_io and start % _DIRECT_IO_ALIGNMENT == 0:
+            self._set_direct_io(in_fd, True)
+            direct_out = self._set_direct_io(out_fd, True)
+        
+        def write(view: memoryview, n: int, offset: int) -> None:
+            nonlocal direct_out
+            if digest is not None:
+                digest.update(view[:n])
+            if direct_out and n % _DIRECT_IO_ALIGNMENT:
+                # O_DIRECT 只能写入整块，文件末尾的零头按普通方式写入
+                direct_out = not self._set_direct_io(out_fd, False)
+            self._write_at(fdst, view[:n], offset)
+            if on_progress is not None:
+                on_progress(offset + n)
+        
+        def at_end(view: memoryview, n: int, end: int) -> bool:
+            # 读到0字节，或读不满缓冲区且已到扫描时的文件末尾
+            return not n or (n < len(view) and end >= size)
+        
+        offset = start
+        if len(views) == 1:
+            while True:
+                n = self._read_at(fsrc, views[0], offset)
+                if n:
+                    write(views[0], n, offset)
+                    offset += n
+                if at_end(views[0], n, offset):
+                    return
+        
+        free: queue.Queue = queue.Queue()
+        filled: queue.Queue = queue.Queue()
+        for index in range(len(views)):
+            free.put(index)
+        
+        def read_ahead(read_offset: int) -> None:
+            try:
+                while True:
+                    index = free.get()
+                    if index is None:
+                        return
+                    n = self._read_at(fsrc, views[index], read_offset)
+                    filled.put((index, n))
+                    read_offset += n
+                    if at_end(views[index], n, read_offset):
+                        return
+            except BaseException as e:
+                filled.put((None, e))
+        
+        reader = threading.Thread(target=read_ahead, args=(start,), name='copy-read-ahead', daemon=True)
+        reader.start()
+        try:
+            while True:
+                index, n = filled.get()
+                if index is None:
+                    raise n
+                if n:
+                    write(views[index], n, offset)
+                    offset += n
+                if at_end(views[index], n, offset):
+                    return
+                free.put(index)
+        finally:
+            free.put(None)
+            reader.join()
+    
+    @staticmethod
+    def _read_at(fsrc, view: memoryview, offset: int) -> int:
+        """
+        从指定偏移读取数据到缓冲区
+        
+        Args:
+            fsrc: 源文件对象
+            view: 目标缓冲区
+            offset: 文件偏移
+            
+        Returns:
+            int: 读取的字节数，少于缓冲区长度表示已到文件末尾
+        """
+        if hasattr(os, 'preadv'):
+            return os.preadv(fsrc.fileno(), [view], offset)
+        # Windows 等平台没有 preadv，按文件位置读取，并补满缓冲区
+        fsrc.seek(offset)
+        total = 0
+        while total < len(view):
+            n = fsrc.readinto(view[total:])
+            if not n:
+                break
+            total += n
+        return total
+    
+    @staticmethod
+    def _write_at(fdst, view: memoryview, offset: int) -> None:
+        """
+        把缓冲区数据完整写入指定偏移
+        
+        Args:
+            fdst: 目标文件对象
+            view: 要写入的数据
+            offset: 文件偏移
+        """
+        if hasattr(os, 'pwrite'):
+            written = 0
+            while written < len(view):
+                written += os.pwrite(fdst.fileno(), view[written:], offset + written)
+            return
+        fdst.seek(offset)
+        fdst.write(view)
+        fdst.flush()
+    
+    def _get_buffers(self, count: int) -> List[memoryview]:
+        """
+        获取当前线程复用的复制缓冲区（匿名 mmap，按页对齐，满足 O_DIRECT 的要求）
+        
+        Args:
+            count: 需要的缓冲区数量
+            
+        Returns:
+            List[memoryview]: 缓冲区
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = []
+        while len(buffers) < count:
+            buffers.append(memoryview(mmap.mmap(-1, self.buffer_size)))
+        return buffers[:count]
+    
+    @staticmethod
+    def _fadvise(fd: int, offset: int, length: int, advice: Optional[int]) -> None:
+        """
+        向内核提示文件的访问方式，平台不支持时忽略
+        
+        Args:
+            fd: 文件描述符
+            offset: 起始偏移
+            length: 长度，0 表示到文件末尾
+            advice: POSIX_FADV_* 常量，None 表示平台不支持
+        """
+        if advice is None:
+            return
+        try:
+            os.posix_fadvise(fd, offset, length, advice)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _set_direct_io(fd: int, enabled: bool) -> bool:
+        """
+        打开或关闭文件描述符的 O_DIRECT 标志
+        
+        Args:
+            fd: 文件描述符
+            enabled: 是否启用
+            
+        Returns:
+            bool: 设置成功返回True；平台或文件系统不支持时返回False
+        """
+        if fcntl is None or not hasattr(os, 'O_DIRECT'):
+            return False
+        try:
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            flags = flags | os.O_DIRECT if enabled else flags & ~os.O_DIRECT
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags)
+            return True
+        except OSError:
+            return False
+    
+    def _record_throughput(self, copied: int, seconds: float) -> None:
+        """
+        累计复制的字节数和耗时
+        
+        Args:
+            copied: 复制的字节数
+            seconds: 耗时（秒）
+        """
+        with self._stats_lock:
+            self._copied_bytes += copied
+            self._copy_seconds += seconds
+    
+    def get_copy_stats(self) -> Dict[str, float]:
+        """
+        获取累计的复制统计，用于比较不同缓冲区和页缓存设置的效果
+        
+        Returns:
+            Dict[str, float]: bytes（复制的字节数）、seconds（各次复制耗时之和）、
+            throughput_mb_s（单个复制流的平均吞吐量）
+        """
+        with self._stats_lock:
+            copied, seconds = self._copied_bytes, self._copy_seconds
+        return {
+            'bytes': copied,
+            'seconds': seconds,
+            'throughput_mb_s': copied / seconds / (1024 * 1024) if seconds > 0 else 0.0,
+        }
+    
+    def prefetch(self, path: str) -> None:
+        """
+        提示内核预读文件开头（prefetch_bytes 字节），使下一个文件的读取与当前传输重叠
+        
+        Args:
+            path: 文件路径
+        """
+        if not self.prefetch_bytes or _FADV_WILLNEED is None:
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            self._fadvise(fd, 0, self.prefetch_bytes, _FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    
+    def get_cache_residency(self, path: str) -> Optional[float]:
+        """
+        用 mincore 统计文件在页缓存中的比例
+        
+        只读映射文件而不访问其内容，不会改变缓存状态。
+        Linux 5.0 起只能统计调用者拥有或可写的文件，否则结果可能偏低。
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            Optional[float]: 0~1 之间的比例，平台不支持或文件无法映射时返回None
+        """
+        libc = _libc()
+        if libc is None:
+            return None
+        import ctypes
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    return 0.0
+                pages = (size + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+                vector = (ctypes.c_ubyte * pages)()
+                # 私有映射（ACCESS_COPY）才能通过 ctypes 取得地址；不写入就不会复制页面
+                with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_COPY) as mapped:
+                    anchor = ctypes.c_char.from_buffer(mapped)
+                    try:
+                        result = libc.mincore(ctypes.c_void_p(ctypes.addressof(anchor)),
+                                               ctypes.c_size_t(size), vector)
+                    finally:
+                        del anchor
+        except (OSError, ValueError):
+            return None
+        if result != 0:
+            return None
+        return (pages - bytes(vector).count(0)) / pages
+    
+    @staticmethod
+    def _try_reflink(in_fd: int, out_fd: int) -> bool:
+        """
+        尝试用 FICLONE 创建写时复制克隆
+        
+        Args:
+            in_fd: 源文件描述符
+            out_fd: 目标文件描述符
+            
+        Returns:
+            bool: 克隆成功返回True
+        """
+        if fcntl is None or not sys.platform.startswith('linux'):
+            return False
+        try:
+            fcntl.ioctl(out_fd, _FICLONE, in_fd)
+            return True
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _try_kernel_copy(copy_chunk, size: int, start: int = 0, chunk: int = 1 << 30,
+                         on_progress: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        使用内核内复制系统调用复制文件（从 start 偏移到末尾）
+        
+        Args:
+            copy_chunk: 复制函数 (offset, count) -> 已复制字节数
+            size: 文件大小
+            start: 开始复制的字节偏移
+            chunk: 单次调用复制的最大字节数
+            on_progress: 进度回调（可选），每次调用后以当前偏移调用
+            
+        Returns:
+            bool: 复制完成返回True；系统调用不可用时返回False，可安全回退
+            
+        Raises:
+            OSError: 已复制部分数据后出错
+        """
+        offset = start
+        try:
+            while True:
+                copied = copy_chunk(offset, chunk)
+                if copied == 0:
+                    break
+                offset += copied
+                if on_progress is not None and offset < size:
+                    on_progress(offset)
+        except OSError as e:
+            if offset == start and e.errno in _FALLBACK_ERRNOS:
+                return False
+            raise
+        # 系统调用提前结束（如某些文件系统始终返回0）时由调用方回退重新复制
+        return offset >= size
+    
     def ensure_directory_exists(self, directory: str) -> bool:
         """
         确保目录存在，如果不存在则创建
@@ -66,6 +998,118 @@ class PythonFileSystemAdapter(FileSystemService):
         except Exception:
             return False
     
+    def get_file_signature(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        获取文件的大小和修改时间，用于廉价地判断文件是否变化
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            Optional[Tuple[int, int]]: (大小, 修改时间纳秒)，文件不存在返回None
+        """
+        try:
+            st = os.stat(path)
+            return st.st_size, st.st_mtime_ns
+        except OSError:
+            return None
+    
+    def get_file_fingerprint(self, path: str, full: bool = False) -> Optional[str]:
+        """
+        计算文件内容指纹（BLAKE2b）
+        
+        抽样模式对文件大小和开头、中间、结尾各 FINGERPRINT_BLOCK_SIZE 字节做哈希，
+        小文件直接对全部内容做哈希。
+        
+        Args:
+            path: 文件路径
+            full: 是否对完整内容做哈希
+            
+        Returns:
+            Optional[str]: 指纹字符串，文件无法读取返回None
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                digest.update(size.to_bytes(8, 'little'))
+                block = self.FINGERPRINT_BLOCK_SIZE
+                if full or size <= 3 * block:
+                    view = self._get_buffers(1)[0]
+                    while True:
+                        n = f.readinto(view)
+                        if not n:
+                            break
+                        digest.update(view[:n])
+                else:
+                    for offset in (0, (size - block) // 2, size - block):
+                        f.seek(offset)
+                        digest.update(f.read(block))
+        except OSError:
+            return None
+        return ('full:' if full else 'sample:') + digest.hexdigest()
+    
+    def get_device_id(self, path: str) -> Optional[int]:
+        """
+        获取路径所在存储设备的标识（st_dev），用于按设备限制并发
+        
+        Args:
+            path: 文件或目录路径
+            
+        Returns:
+            Optional[int]: 设备标识，无法获取返回None
+        """
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            return None
+    
+    def get_physical_location(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        获取文件数据在存储设备上的大致位置
+        
+        Linux 上用 FIEMAP 查询第一个数据区段的物理偏移；其他平台或文件系统
+        不支持时使用 inode 编号（多数文件系统按分配顺序编号，与数据位置大致相关）。
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            Optional[Tuple[int, int]]: (设备标识, 位置)，文件不存在返回None
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        physical = self._first_extent_offset(path)
+        return st.st_dev, (physical if physical is not None else st.st_ino)
+    
+    @staticmethod
+    def _first_extent_offset(path: str) -> Optional[int]:
+        """
+        用 FIEMAP 查询文件第一个数据区段的物理字节偏移
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            Optional[int]: 物理偏移，不支持或文件没有已分配的数据时返回None
+        """
+        if fcntl is None or not sys.platform.startswith('linux'):
+            return None
+        request = bytearray(_FIEMAP_HEADER.size + _FIEMAP_EXTENT_SIZE)
+        _FIEMAP_HEADER.pack_into(request, 0, 0, 0xFFFFFFFFFFFFFFFF, 0, 0, 1, 0)
+        try:
+            with open(path, 'rb') as f:
+                fcntl.ioctl(f.fileno(), _FS_IOC_FIEMAP, request, True)
+        except OSError:
+            return None
+        mapped_extents = _FIEMAP_HEADER.unpack_from(request, 0)[3]
+        if not mapped_extents:
+            return None
+        # struct fiemap_extent: fe_logical, fe_physical, ...
+        return struct.unpack_from('=Q', request, _FIEMAP_HEADER.size + 8)[0]
+    
     def paths_are_equal(self, path1: str, path2: str) -> bool:
         """
         比较两个路径是否相同
@@ -0,0 +1,266 @@
+"""
+JSON Lines 传输日志适配器
+
+实现 TransferJournal 接口，每个传输任务对应用户状态目录下的一个 .jsonl 文件。
+计划在传输开始前整体写入并同步到磁盘，之后每个文件的状态变化追加一行。
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, IO, List, Optional
+from src.core.entities import TransferJob, TransferOrder, TransferPlan, TransferState, VideoFile
+from src.core.ports import TransferJournal
+
+
+def default_journal_directory() -> str:
+    """
+    获取当前用户保存传输日志的目录
+    
+    Returns:
+        str: 日志目录路径
+    """
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'MP4CopyTool', 'journal')
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Application Support/MP4CopyTool/journal')
+    base = os.environ.get('XDG_STATE_HOME') or os.path.expanduser('~/.local/state')
+    return os.path.join(base, 'mp4-copy-tool', 'journal')
+
+
+class JsonLinesTransferJournalAdapter(TransferJournal):
+    """
+    JSON Lines 传输日志适配器
+    
+    日志只追加写入：崩溃时最多丢失最后一行，读取时忽略不完整的行。
+    同一文件的多条状态记录以最后一条为准。任务完成后删除其日志文件。
+    """
+    
+    SUFFIX = '.jsonl'
+    
+    def __init__(self, directory: Optional[str] = None):
+        """
+        初始化传输日志
+        
+        Args:
+            directory: 日志目录，为None时使用用户状态目录
+        """
+        self.directory = directory or default_journal_directory()
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # 当前进程中正在记录的任务：任务标识 -> 日志文件
+        self._files: Dict[str, IO] = {}
+    
+    def begin(self, plan: TransferPlan, destinations: List[str]) -> str:
+        """
+        在开始传输前持久化记录传输计划
+        
+        Args:
+            plan: 传输计划
+            destinations: 每个文件的目标路径，顺序与 plan.videos 一致
+        
+        Returns:
+            str: 任务标识
+        """
+        job_id = time.strftime('%Y%m%d-%H%M%S') + '-' + uuid.uuid4().hex[:8]
+        lines = [{
+            'type': 'plan',
+            'mode': plan.mode,
+            'output_dir': plan.output_dir,
+            'source_dir': plan.source_dir,
+            'check_stale': plan.check_stale,
+            'prefer_reflink': plan.prefer_reflink,
+            'skip_identical': plan.skip_identical,
+            'full_hash': plan.full_hash,
+            'verify': plan.verify,
+            'order': plan.order,
+            'created': time.time(),
+        }]
+        for index, (video, destination) in enumerate(zip(plan.videos, destinations)):
+            lines.append({
+                'type': 'file',
+                'index': index,
+                'source': video.path,
+                'destination': destination,
+                'duration': video.duration,
+                'size': video.size,
+                'mtime_ns': video.mtime_ns,
+            })
+        
+        with self._lock:
+            f = open(self._path(job_id), 'a', encoding='utf-8')
+            self._files[job_id] = f
+            f.write(''.join(json.dumps(line, ensure_ascii=False) + '\n' for line in lines))
+            f.flush()
+            os.fsync(f.fileno())
+        return job_id
+    
+    def record(self, job_id: str, index: int, state: str, offset: int = 0, message: str = "") -> None:
+        """
+        追加单个文件的状态记录
+        
+        开始传输的记录只写入缓冲；检查点和最终状态会同步到磁盘。
+        
+        Args:
+            job_id: 任务标识
+            index: 文件在计划中的下标
+            state: 新状态，见 TransferState
+            offset: 已确认写入的字节数（检查点）
+            message: 失败或跳过的原因
+        """
+        line = {'type': 'state', 'index': index, 'state': state}
+        if offset:
+            line['offset'] = offset
+        if message:
+            line['message'] = message
+        durable = not (state == TransferState.STARTED and not offset)
+        
+        with self._lock:
+            f = self._files.get(job_id)
+            if f is None:
+                # 恢复的任务：继续追加到原有日志
+                f = open(self._path(job_id), 'a', encoding='utf-8')
+                self._files[job_id] = f
+            f.write(json.dumps(line, ensure_ascii=False) + '\n')
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+    
+    def finish(self, job_id: str, completed: bool = True) -> None:
+        """
+        结束任务的记录
+        
+        Args:
+            job_id: 任务标识
+            completed: 为True时删除日志；否则保留以便之后恢复
+        """
+        with self._lock:
+            f = self._files.pop(job_id, None)
+            if f is not None:
+                f.close()
+            if completed:
+                try:
+                    os.remove(self._path(job_id))
+                except OSError:
+                    pass
+    
+    def load_unfinished(self) -> List[TransferJob]:
+        """
+        读取所有未完成的传输任务（不包括当前进程中正在记录的任务）
+        
+        全部文件都已完成或跳过的日志会被直接删除。
+        
+        Returns:
+            List[TransferJob]: 未完成的任务，按创建时间排序
+        """
+        jobs = []
+        for job_id in self._list_job_ids():
+            try:
+                job = self._load(job_id)
+            except OSError:
+                continue
+            if job is None or not job.pending_indices():
+                self.finish(job_id)
+                continue
+            jobs.append(job)
+        return jobs
+    
+    def has_unfinished(self) -> bool:
+        """
+        是否存在未完成的传输任务（只检查日志文件是否存在）
+        
+        Returns:
+            bool: 存在返回True
+        """
+        return bool(self._list_job_ids())
+    
+    def _list_job_ids(self) -> List[str]:
+        """
+        列出日志目录中不属于当前进程正在记录的任务
+        
+        Returns:
+            List[str]: 任务标识（按名称排序，即按创建时间排序）
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        with self._lock:
+            active = set(self._files)
+        return sorted(
+            name[:-len(self.SUFFIX)] for name in names
+            if name.endswith(self.SUFFIX) and name[:-len(self.SUFFIX)] not in active
+        )
+    
+    def _load(self, job_id: str) -> Optional[TransferJob]:
+        """
+        解析一个任务的日志
+        
+        Args:
+            job_id: 任务标识
+        
+        Returns:
+            Optional[TransferJob]: 传输任务，日志中没有完整的计划时返回None
+        """
+        header = None
+        videos: List[VideoFile] = []
+        destinations: List[str] = []
+        states: List[str] = []
+        offsets: List[int] = []
+        with open(self._path(job_id), 'r', encoding='utf-8') as f:
+            for raw in f:
+                try:
+                    line = json.loads(raw)
+                except ValueError:
+                    # 崩溃时写了一半的行
+                    continue
+                kind = line.get('type')
+                if kind == 'plan':
+                    header = line
+                elif kind == 'file':
+                    videos.append(VideoFile(
+                        path=line['source'],
+                        duration=line.get('duration') or 0.0,
+                        size=line.get('size'),
+                        mtime_ns=line.get('mtime_ns')
+                    ))
+                    destinations.append(line['destination'])
+                    states.append(TransferState.PENDING)
+                    offsets.append(0)
+                elif kind == 'state' and 0 <= line.get('index', -1) < len(states):
+                    index = line['index']
+                    states[index] = line['state']
+                    if 'offset' in line:
+                        offsets[index] = line['offset']
+        
+        if header is None:
+            return None
+        plan = TransferPlan(
+            videos=videos,
+            output_dir=header['output_dir'],
+            mode=header['mode'],
+            source_dir=header.get('source_dir'),
+            check_stale=header.get('check_stale', False),
+            prefer_reflink=header.get('prefer_reflink', False),
+            skip_identical=header.get('skip_identical', False),
+            full_hash=header.get('full_hash', False),
+            verify=header.get('verify', False),
+            order=header.get('order', TransferOrder.WALK)
+        )
+        return TransferJob(job_id, plan, destinations, states, offsets)
+    
+    def _path(self, job_id: str) -> str:
+        """
+        获取任务日志文件路径
+        
+        Args:
+            job_id: 任务标识
+        
+        Returns:
+            str: 日志文件路径
+        """
+        return os.path.join(self.directory, job_id + self.SUFFIX)
@@ -0,0 +1,396 @@
+"""
+MP4 box 解析器
+
+直接解析 ISO BMFF (MP4) 容器的 box 结构读取视频时长，无需启动解码器。
+只读取定位和解析所需的 box 头部与少量字段，不会读取媒体数据。
+"""
+
+import os
+import struct
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+
+# 容器类 box，需要进入内部继续查找子 box
+_MOOV = b'moov'
+_MOOF = b'moof'
+_TRAK = b'trak'
+_MDIA = b'mdia'
+_MVEX = b'mvex'
+_TRAF = b'traf'
+
+# 32 位 / 64 位时长字段的“未知”取值
+_UNKNOWN_DURATION_32 = 0xFFFFFFFF
+_UNKNOWN_DURATION_64 = 0xFFFFFFFFFFFFFFFF
+
+# 单个叶子 box 的读取上限，防止损坏文件导致读取超大数据
+_MAX_LEAF_BOX_SIZE = 1 << 20
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    遍历 [start, end) 范围内的同级 box
+    
+    只读取每个 box 的头部（8 或 16 字节），通过 seek 跳过 box 内容。
+    
+    Args:
+        f: 以二进制模式打开的文件对象
+        start: 起始偏移
+        end: 结束偏移
+    
+    Yields:
+        Tuple[bytes, int, int]: (box 类型, 内容起始偏移, box 结束偏移)
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            # 64 位 largesize
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            size = struct.unpack('>Q', large)[0]
+            header_size = 16
+        elif size == 0:
+            # box 延伸到父容器（或文件）末尾
+            size = end - offset
+        if size < header_size or offset + size > end:
+            raise ValueError(f"无效的 box 大小: {box_type!r} @ {offset}")
+        yield box_type, offset + header_size, offset + size
+        offset += size
+
+
+def _read_payload(f: BinaryIO, start: int, end: int, limit: int = _MAX_LEAF_BOX_SIZE) -> bytes:
+    """
+    读取 box 内容（最多 limit 字节）
+    
+    Args:
+        f: 文件对象
+        start: 内容起始偏移
+        end: box 结束偏移
+        limit: 最多读取的字节数
+    
+    Returns:
+        bytes: box 内容
+    """
+    f.seek(start)
+    return f.read(min(end - start, limit))
+
+
+def _parse_full_box_duration(payload: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """
+    解析 mvhd / mdhd 形式的 full box，返回时间刻度和时长
+    
+    Args:
+        payload: box 内容
+    
+    Returns:
+        Tuple[Optional[int], Optional[int]]: (timescale, duration)，未知时为 None
+    """
+    version = payload[0]
+    if version == 1:
+        timescale, duration = struct.unpack_from('>IQ', payload, 4 + 16)
+        unknown = _UNKNOWN_DURATION_64
+    else:
+        timescale, duration = struct.unpack_from('>II', payload, 4 + 8)
+        unknown = _UNKNOWN_DURATION_32
+    if duration == unknown:
+        duration = None
+    return timescale, duration
+
+
+def _parse_tkhd_duration(payload: bytes) -> Optional[int]:
+    """
+    解析 tkhd 中的轨道时长（以影片时间刻度计）
+    
+    Args:
+        payload: tkhd 内容
+    
+    Returns:
+        Optional[int]: 轨道时长，未知时为 None
+    """
+    version = payload[0]
+    if version == 1:
+        duration = struct.unpack_from('>Q', payload, 4 + 8 + 8 + 4 + 4)[0]
+        return None if duration == _UNKNOWN_DURATION_64 else duration
+    duration = struct.unpack_from('>I', payload, 4 + 4 + 4 + 4 + 4)[0]
+    return None if duration == _UNKNOWN_DURATION_32 else duration
+
+
+def _parse_track_id(payload: bytes) -> int:
+    """
+    解析 tkhd 中的轨道 ID
+    
+    Args:
+        payload: tkhd 内容
+    
+    Returns:
+        int: 轨道 ID
+    """
+    version = payload[0]
+    offset = 4 + (16 if version == 1 else 8)
+    return struct.unpack_from('>I', payload, offset)[0]
+
+
+class _MovieInfo:
+    """moov 中解析出的时长相关信息"""
+    
+    def __init__(self):
+        self.timescale: Optional[int] = None
+        self.duration: Optional[int] = None
+        self.fragment_duration: Optional[int] = None
+        self.track_seconds: Dict[int, float] = {}
+        self.track_timescales: Dict[int, int] = {}
+        self.trex_default_durations: Dict[int, int] = {}
+        self.fragmented = False
+
+
+def _parse_trak(f: BinaryIO, start: int, end: int, info: _MovieInfo) -> None:
+    """
+    解析 trak，记录轨道时长和媒体时间刻度
+    
+    Args:
+        f: 文件对象
+        start: trak 内容起始偏移
+        end: trak 结束偏移
+        info: 要填充的影片信息
+    """
+    track_id = 0
+    tkhd_duration = None
+    media_timescale = None
+    media_duration = None
+    for box_type, b_start, b_end in _iter_boxes(f, start, end):
+        if box_type == b'tkhd':
+            payload = _read_payload(f, b_start, b_end, 64)
+            track_id = _parse_track_id(payload)
+            tkhd_duration = _parse_tkhd_duration(payload)
+        elif box_type == _MDIA:
+            for m_type, m_start, m_end in _iter_boxes(f, b_start, b_end):
+                if m_type == b'mdhd':
+                    payload = _read_payload(f, m_start, m_end, 64)
+                    media_timescale, media_duration = _parse_full_box_duration(payload)
+                    break
+    
+    if media_timescale:
+        info.track_timescales[track_id] = media_timescale
+    if media_timescale and media_duration:
+        info.track_seconds[track_id] = media_duration / media_timescale
+    elif tkhd_duration and info.timescale:
+        info.track_seconds[track_id] = tkhd_duration / info.timescale
+
+
+def _parse_mvex(f: BinaryIO, start: int, end: int, info: _MovieInfo) -> None:
+    """
+    解析 mvex，读取 mehd 片段总时长和 trex 默认样本时长
+    
+    Args:
+        f: 文件对象
+        start: mvex 内容起始偏移
+        end: mvex 结束偏移
+        info: 要填充的影片信息
+    """
+    info.fragmented = True
+    for box_type, b_start, b_end in _iter_boxes(f, start, end):
+        if box_type == b'mehd':
+            payload = _read_payload(f, b_start, b_end, 16)
+            if payload[0] == 1:
+                duration = struct.unpack_from('>Q', payload, 4)[0]
+            else:
+                duration = struct.unpack_from('>I', payload, 4)[0]
+            if duration:
+                info.fragment_duration = duration
+        elif box_type == b'trex':
+            payload = _read_payload(f, b_start, b_end, 32)
+            track_id, _, default_duration = struct.unpack_from('>III', payload, 4)
+            info.trex_default_durations[track_id] = default_duration
+
+
+def _parse_moov(f: BinaryIO, start: int, end: int) -> _MovieInfo:
+    """
+    解析 moov，只访问 mvhd、mvex 和 trak 中与时长相关的 box
+    
+    Args:
+        f: 文件对象
+        start: moov 内容起始偏移
+        end: moov 结束偏移
+    
+    Returns:
+        _MovieInfo: 解析出的影片信息
+    """
+    info = _MovieInfo()
+    traks = []
+    for box_type, b_start, b_end in _iter_boxes(f, start, end):
+        if box_type == b'mvhd':
+            payload = _read_payload(f, b_start, b_end, 64)
+            info.timescale, info.duration = _parse_full_box_duration(payload)
+        elif box_type == _MVEX:
+            _parse_mvex(f, b_start, b_end, info)
+        elif box_type == _TRAK:
+            traks.append((b_start, b_end))
+    
+    # mvhd 已给出有效时长且不是分片文件时无需再解析轨道
+    if info.timescale and info.duration and not info.fragmented:
+        return info
+    
+    for t_start, t_end in traks:
+        _parse_trak(f, t_start, t_end, info)
+    return info
+
+
+def _sum_traf_duration(f: BinaryIO, start: int, end: int, info: _MovieInfo) -> Tuple[int, int]:
+    """
+    统计一个 traf 中所有样本的时长
+    
+    Args:
+        f: 文件对象
+        start: traf 内容起始偏移
+        end: traf 结束偏移
+        info: 影片信息（提供 trex 默认样本时长）
+    
+    Returns:
+        Tuple[int, int]: (轨道 ID, 以媒体时间刻度计的时长)
+    """
+    track_id = 0
+    default_duration = 0
+    total = 0
+    for box_type, b_start, b_end in _iter_boxes(f, start, end):
+        if box_type == b'tfhd':
+            payload = _read_payload(f, b_start, b_end, 64)
+            flags = struct.unpack_from('>I', payload, 0)[0] & 0xFFFFFF
+            track_id = struct.unpack_from('>I', payload, 4)[0]
+            default_duration = info.trex_default_durations.get(track_id, 0)
+            offset = 8
+            if flags & 0x01:  # base-data-offset
+                offset += 8
+            if flags & 0x02:  # sample-description-index
+                offset += 4
+            if flags & 0x08:  # default-sample-duration
+                default_duration = struct.unpack_from('>I', payload, offset)[0]
+        elif box_type == b'trun':
+            f.seek(b_start)
+            head = f.read(8)
+            flags = struct.unpack_from('>I', head, 0)[0] & 0xFFFFFF
+            sample_count = struct.unpack_from('>I', head, 4)[0]
+            if not flags & 0x100:
+                total += sample_count * default_duration
+                continue
+            offset = 8
+            if flags & 0x01:  # data-offset
+                offset += 4
+            if flags & 0x04:  # first-sample-flags
+                offset += 4
+            # 每个样本记录的字段数：duration/size/flags/composition-offset
+            fields = sum(1 for bit in (0x100, 0x200, 0x400, 0x800) if flags & bit)
+            f.seek(b_start + offset)
+            data = f.read(sample_count * fields * 4)
+            if len(data) < sample_count * fields * 4:
+                raise ValueError("trun 数据不完整")
+            # duration 总是每个样本记录中的第一个字段
+            for i in range(sample_count):
+                total += struct.unpack_from('>I', data, i * fields * 4)[0]
+    return track_id, total
+
+
+def _track_seconds(info: _MovieInfo, track_id: int, total: int) -> Optional[float]:
+    """
+    计算分片 MP4 中一个轨道的时长（moov 中的初始样本加上 moof 中累加的样本）
+    
+    Args:
+        info: 影片信息
+        track_id: 轨道 ID
+        total: moof 中累加的样本时长（以媒体时间刻度计）
+    
+    Returns:
+        Optional[float]: 轨道时长（秒），缺少媒体时间刻度时为 None
+    """
+    timescale = info.track_timescales.get(track_id)
+    if not timescale:
+        return None
+    return info.track_seconds.get(track_id, 0.0) + total / timescale
+
+
+def parse_mp4_duration(file_path: str, stop_above: Optional[float] = None) -> Optional[float]:
+    """
+    解析 MP4 文件的时长
+    
+    依次尝试 mvhd 时长、mvex/mehd 片段时长、各轨道 mdhd/tkhd 时长，
+    最后对分片 MP4 累加所有 moof 中的样本时长。支持位于文件末尾的 moov
+    以及 64 位 largesize box。
+    
+    Args:
+        file_path: 视频文件路径
+        stop_above: 提前结束的时长阈值（可选）。累加分片时长时一旦超过该值立即返回，
+                    此时返回值只是大于阈值的下界，不是完整时长
+    
+    Returns:
+        Optional[float]: 视频时长（秒），无法解析时返回 None
+    
+    Raises:
+        OSError: 文件无法读取
+        ValueError: box 结构损坏
+        struct.error: box 内容不完整
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        info = None
+        moof_ranges = []
+        track_totals: Dict[int, int] = {}
+        
+        def add_moof(m_start: int, m_end: int) -> Optional[float]:
+            # 累加一个 moof 的样本时长，超过阈值时返回当前轨道时长
+            for box_type, t_start, t_end in _iter_boxes(f, m_start, m_end):
+                if box_type == _TRAF:
+                    track_id, duration = _sum_traf_duration(f, t_start, t_end, info)
+                    track_totals[track_id] = track_totals.get(track_id, 0) + duration
+                    if stop_above is not None:
+                        seconds = _track_seconds(info, track_id, track_totals[track_id])
+                        if seconds is not None and seconds > stop_above:
+                            return seconds
+            return None
+        
+        for box_type, start, end in _iter_boxes(f, 0, file_size):
+            if box_type == _MOOV:
+                info = _parse_moov(f, start, end)
+                if info.timescale and info.duration and not info.fragmented:
+                    return info.duration / info.timescale
+                if info.timescale and info.fragment_duration:
+                    return info.fragment_duration / info.timescale
+            elif box_type == _MOOF:
+                if info is not None and info.fragmented and stop_above is not None:
+                    # moov 已解析：边遍历边累加，超过阈值后无需继续读取
+                    exceeded = add_moof(start, end)
+                    if exceeded is not None:
+                        return exceeded
+                else:
+                    moof_ranges.append((start, end))
+        
+        if info is None:
+            return None
+        
+        if not info.fragmented:
+            if info.timescale and info.duration:
+                return info.duration / info.timescale
+            return max(info.track_seconds.values()) if info.track_seconds else None
+        
+        # 分片 MP4：按轨道累加 moof 中的样本时长，取最长轨道
+        for m_start, m_end in moof_ranges:
+            exceeded = add_moof(m_start, m_end)
+            if exceeded is not None:
+                return exceeded
+        
+        # moov 中的初始样本（如果有）同样计入对应轨道
+        seconds = [
+            track_seconds
+            for track_seconds in (_track_seconds(info, track_id, total)
+                                  for track_id, total in track_totals.items())
+            if track_seconds is not None
+        ]
+        if seconds:
+            return max(seconds)
+        if info.timescale and info.duration:
+            return info.duration / info.timescale
+        return max(info.track_seconds.values()) if info.track_seconds else None
@@ -0,0 +1,202 @@
+"""
+SQLite 时长缓存适配器
+
+实现 DurationCache 接口，将视频时长持久化到用户缓存目录下的 SQLite 数据库。
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from src.core.ports import DurationCache
+
+
+def default_cache_directory() -> str:
+    """
+    获取当前用户的缓存目录
+    
+    Returns:
+        str: 缓存目录路径
+    """
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'MP4CopyTool', 'cache')
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Caches/MP4CopyTool')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'mp4-copy-tool')
+
+
+class SQLiteDurationCacheAdapter(DurationCache):
+    """
+    SQLite 时长缓存适配器
+    
+    以 (路径, 大小, mtime_ns, inode) 判断文件是否变化，按最近访问时间做 LRU 淘汰。
+    命中时的访问时间更新会批量写入，避免每次查询都产生一次写事务。
+    """
+    
+    # 累积多少条待写入记录后自动提交
+    FLUSH_THRESHOLD = 500
+    
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 200000):
+        """
+        初始化缓存
+        
+        Args:
+            db_path: 数据库文件路径，为None时使用用户缓存目录
+            max_entries: 最多保留的条目数，超出时淘汰最久未访问的条目
+        """
+        if db_path is None:
+            directory = default_cache_directory()
+            os.makedirs(directory, exist_ok=True)
+            db_path = os.path.join(directory, 'durations.sqlite3')
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        
+        self._lock = threading.Lock()
+        self._pending_puts: List[Tuple[str, int, int, int, float, float]] = []
+        self._pending_touches: List[Tuple[float, str]] = []
+        
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS durations ('
+            ' path TEXT PRIMARY KEY,'
+            ' size INTEGER NOT NULL,'
+            ' mtime_ns INTEGER NOT NULL,'
+            ' inode INTEGER NOT NULL,'
+            ' duration REAL NOT NULL,'
+            ' last_access REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_durations_last_access ON durations(last_access)'
+        )
+        self._conn.commit()
+    
+    def get(self, path: str, size: int, mtime_ns: int, inode: int) -> Optional[float]:
+        """
+        查询缓存的视频时长
+        
+        Args:
+            path: 文件路径
+            size: 文件大小（字节）
+            mtime_ns: 修改时间（纳秒）
+            inode: 文件 inode 编号，0 表示未知（如 Windows 上 os.scandir 的 stat 结果），
+                   此时只按路径、大小和修改时间判断
+        
+        Returns:
+            Optional[float]: 缓存的时长（秒），未命中或文件已变化返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT size, mtime_ns, inode, duration FROM durations WHERE path = ?',
+                (path,)
+            ).fetchone()
+            if (row is None or row[:2] != (size, mtime_ns)
+                    or (inode and row[2] and row[2] != inode)):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._pending_touches.append((time.time(), path))
+            if len(self._pending_touches) >= self.FLUSH_THRESHOLD:
+                self._flush_locked()
+            return row[3]
+    
+    def put(self, path: str, size: int, mtime_ns: int, inode: int, duration: float) -> None:
+        """
+        写入视频时长
+        
+        Args:
+            path: 文件路径
+            size: 文件大小（字节）
+            mtime_ns: 修改时间（纳秒）
+            inode: 文件 inode 编号
+            duration: 视频时长（秒）
+        """
+        with self._lock:
+            self._pending_puts.append((path, size, mtime_ns, inode, duration, time.time()))
+            if len(self._pending_puts) >= self.FLUSH_THRESHOLD:
+                self._flush_locked()
+    
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        使缓存失效
+        
+        Args:
+            path: 要失效的文件路径，为None时清空全部缓存
+        """
+        with self._lock:
+            self._flush_locked()
+            if path is None:
+                self._conn.execute('DELETE FROM durations')
+            else:
+                self._conn.execute('DELETE FROM durations WHERE path = ?', (path,))
+            self._conn.commit()
+    
+    def flush(self) -> None:
+        """
+        将待写入的数据持久化，并执行 LRU 淘汰
+        """
+        with self._lock:
+            self._flush_locked()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取缓存统计信息
+        
+        Returns:
+            Dict[str, int]: 包含 hits、misses、entries 计数
+        """
+        with self._lock:
+            self._flush_locked()
+            entries = self._conn.execute('SELECT COUNT(*) FROM durations').fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+    
+    def close(self) -> None:
+        """
+        持久化待写入数据并关闭数据库连接
+        """
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+    
+    def _flush_locked(self) -> None:
+        """
+        在持有锁的情况下提交待写入数据，并淘汰超出容量的条目
+        """
+        if not self._pending_puts and not self._pending_touches:
+            return
+        if self._pending_touches:
+            self._conn.executemany(
+                'UPDATE durations SET last_access = ? WHERE path = ?',
+                self._pending_touches
+            )
+            self._pending_touches = []
+        if self._pending_puts:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO durations'
+                ' (path, size, mtime_ns, inode, duration, last_access)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                self._pending_puts
+            )
+            self._pending_puts = []
+            self._evict_locked()
+        self._conn.commit()
+    
+    def _evict_locked(self) -> None:
+        """
+        淘汰最久未访问的条目，使总数不超过 max_entries
+        """
+        count = self._conn.execute('SELECT COUNT(*) FROM durations').fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                'DELETE FROM durations WHERE path IN ('
+                ' SELECT path FROM durations ORDER BY last_access LIMIT ?)',
+                (excess,)
+            )
@@ -5,10 +5,58 @@
 """
 
 import os
-import cv2
-from typing import List
-from src.core.entities import VideoFile
-from src.core.ports import VideoFileRepository
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.core.cancellation import CancellationToken, OperationCancelledError
+from src.core.entities import VideoFile, FilterCriteria, ScanDelta
+from src.core.ports import VideoFileRepository, DurationCache
+from src.interfaces.directory_walker import ScandirDirectoryWalker, DirectoryListing
+from src.interfaces.mp4_box_parser import parse_mp4_duration
+
+
+_cv2_module = None
+_cv2_checked = False
+
+
+def _cv2():
+    """
+    首次使用时导入 OpenCV
+    
+    导入 OpenCV 需要加载较大的本地库，只有 MP4 头部解析失败需要回退时才导入，
+    使扫描和命令行模式在不需要时不承担这部分开销。
+    
+    Returns:
+        cv2 模块，未安装时返回None
+    """
+    global _cv2_module, _cv2_checked
+    if not _cv2_checked:
+        try:
+            import cv2
+            _cv2_module = cv2
+        except ImportError:
+            _cv2_module = None
+        _cv2_checked = True
+    return _cv2_module
+
+
+class _DirectoryState:
+    """上次扫描时一个目录的状态"""
+    
+    __slots__ = ('mtime_ns', 'identity', 'relative', 'depth', 'files', 'children')
+    
+    def __init__(self, relative: str, depth: int, listing: DirectoryListing, children: List[str]):
+        self.mtime_ns = listing.mtime_ns
+        self.identity = listing.identity
+        self.relative = relative
+        self.depth = depth
+        # 文件路径 -> (大小, 修改时间, inode)
+        self.files: Dict[str, Tuple[int, int, int]] = {
+            path: (st.st_size, st.st_mtime_ns, st.st_ino) for path, _, st in listing.files
+        }
+        # 已进入的子目录路径
+        self.children = children
 
 
 class OpenCVVideoRepositoryAdapter(VideoFileRepository):
@@ -18,6 +66,24 @@ class OpenCVVideoRepositoryAdapter(VideoFileRepository):
     使用 OpenCV 库实现视频文件的查找和时长获取。
     """
     
+    def __init__(self,
+                 duration_cache: Optional[DurationCache] = None,
+                 max_workers: int = 8,
+                 walker: Optional[ScandirDirectoryWalker] = None):
+        """
+        初始化视频仓库适配器
+        
+        Args:
+            duration_cache: 时长缓存（可选），文件未变化时复用缓存结果
+            max_workers: 并行探测时长的线程数，为1时在当前线程顺序探测
+            walker: 目录遍历器（可选），默认并行遍历全部子目录（与 os.walk 一致）
+        """
+        self.duration_cache = duration_cache
+        self.max_workers = max(1, max_workers)
+        self.walker = walker or ScandirDirectoryWalker()
+        # 每个根目录上次完整扫描的目录状态，用于增量重新扫描
+        self._snapshots: Dict[str, Dict[str, _DirectoryState]] = {}
+    
     def get_video_duration(self, file_path: str) -> float:
         """
         获取视频文件的时长
@@ -26,8 +92,11 @@ class OpenCVVideoRepositoryAdapter(VideoFileRepository):
             file_path: 视频文件路径
             
         Returns:
-            float: 视频时长（秒），失败返回0
+            float: 视频时长（秒），失败或未安装 OpenCV 时返回0
         """
+        cv2 = _cv2()
+        if cv2 is None:
+            return 0.0
         try:
             # 创建视频捕获对象
             cap = cv2.VideoCapture(file_path)
@@ -49,36 +118,359 @@ class OpenCVVideoRepositoryAdapter(VideoFileRepository):
         except Exception:
             return 0.0
     
-    def find_mp4_files(self, directory: str) -> List[VideoFile]:
+    def find_mp4_files(self, directory: str,
+                       criteria: Optional[FilterCriteria] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> List[VideoFile]:
         """
         查找目录中的所有MP4文件
         
         Args:
             directory: 要搜索的目录
+            criteria: 过滤条件（可选）
+            cancel_token: 取消令牌（可选）
             
         Returns:
             List[VideoFile]: 找到的视频文件列表
+        
+        Raises:
+            OperationCancelledError: 扫描被取消
+        """
+        return list(self.iter_mp4_files(directory, criteria, cancel_token))
+    
+    def iter_mp4_files(self, directory: str,
+                       criteria: Optional[FilterCriteria] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> Iterator[VideoFile]:
+        """
+        逐个产出目录中的MP4文件
+        
+        边遍历边探测，同时在途的探测任务数有上限，内存占用不随目录树规模增长；
+        产出顺序与遍历顺序一致。提供过滤条件时，大小、修改时间和文件名不符合的
+        文件直接根据目录项排除，不会被打开；时长超过上限的文件在解析到足以判断时停止。
+        
+        Args:
+            directory: 要搜索的目录
+            criteria: 过滤条件（可选），只产出满足条件的文件
+            cancel_token: 取消令牌（可选），在目录和文件之间检查暂停和取消；
+                          取消时放弃在途的探测任务，本次扫描不作为增量基准
+            
+        Yields:
+            VideoFile: 找到的视频文件
+        
+        Raises:
+            OperationCancelledError: 扫描被取消
+        """
+        stop_above = None
+        if criteria is not None and criteria.max_duration != float('inf'):
+            stop_above = criteria.max_duration
+        check_entry = criteria is not None and criteria.has_entry_bounds
+        
+        # 无过滤条件时记录各目录状态，完整遍历结束后作为增量扫描的基准
+        states: Optional[Dict[str, _DirectoryState]] = None
+        if criteria is None:
+            # 调用方将以本次结果替换文件列表，旧的基准不再对应；扫描未完成时不留下基准
+            self._snapshots.pop(self._snapshot_key(directory), None)
+            states = {}
+            
+            def on_directory(path, relative, depth, listing, children):
+                states[path] = _DirectoryState(relative, depth, listing, children)
+        else:
+            on_directory = None
+        
+        executor = None
+        if self.max_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # 在途任务窗口：(文件路径, 文件名, Future[VideoFile])
+        pending = deque()
+        window = self.max_workers * 4
+        
+        try:
+            try:
+                # 并行遍历目录，文件的 stat 结果由遍历器提供，探测时不再重复获取
+                for file_path, file, st in self.walker.walk(directory, on_directory,
+                                                            cancel_token=cancel_token):
+                    if cancel_token is not None:
+                        cancel_token.checkpoint()
+                    # 先按目录项信息过滤，不符合的文件不探测时长
+                    if check_entry and not criteria.matches_entry(file, st.st_size, st.st_mtime_ns):
+                        continue
+                    if executor is None:
+                        # 获取视频时长（优先使用缓存）
+                        video = self._probe_file(file_path, file, st, stop_above)
+                        if criteria is None or criteria.matches(video):
+                            yield video
+                        continue
+                    
+                    pending.append((file_path, file,
+                                    executor.submit(self._probe_file, file_path, file, st, stop_above)))
+                    # 窗口已满时按提交顺序产出最早的结果
+                    if len(pending) >= window:
+                        video = self._take_result(pending)
+                        if criteria is None or criteria.matches(video):
+                            yield video
+            except OperationCancelledError:
+                raise
+            except Exception:
+                # 如果遍历发生错误，仍然产出已提交的文件；此次遍历不完整，不作为增量基准
+                states = None
+            
+            while pending:
+                if cancel_token is not None:
+                    cancel_token.checkpoint()
+                video = self._take_result(pending)
+                if criteria is None or criteria.matches(video):
+                    yield video
+            
+            if states:
+                self._snapshots[self._snapshot_key(directory)] = states
+        finally:
+            if executor is not None:
+                for _, _, future in pending:
+                    future.cancel()
+                executor.shutdown(wait=True)
+            if self.duration_cache is not None:
+                self.duration_cache.flush()
+    
+    def rescan_mp4_files(self, directory: str) -> ScanDelta:
+        """
+        增量重新扫描目录
+        
+        只重新列举修改时间发生变化的目录（目录中有文件新增、删除或重命名时其修改时间会更新），
+        只探测新增和大小/修改时间变化的文件，耗时与变化量成正比而不是与文件总数成正比。
+        原地改写、未引起目录修改时间变化的文件不会被发现。
+        没有该目录的完整扫描记录时执行完整扫描。
+        
+        Args:
+            directory: 要扫描的目录
+            
+        Returns:
+            ScanDelta: 扫描增量
+        """
+        key = self._snapshot_key(directory)
+        previous = self._snapshots.get(key)
+        if previous is None:
+            return ScanDelta(added=list(self.iter_mp4_files(directory)), full=True)
+        
+        # 在副本上更新，出错时保留原有基准
+        states = dict(previous)
+        known_identities = {state.identity for state in states.values()}
+        removed: List[str] = []
+        to_probe = []  # (文件路径, 文件名, stat 结果, 是否为修改)
+        
+        def record(path, relative, depth, listing, children):
+            states[path] = _DirectoryState(relative, depth, listing, children)
+        
+        for path in list(states):
+            state = states.get(path)
+            if state is None:
+                # 已随父目录一起移除
+                continue
+            try:
+                if os.stat(path).st_mtime_ns == state.mtime_ns:
+                    continue
+            except OSError:
+                self._forget_tree(states, path, removed)
+                continue
+            
+            listing = self.walker.list_directory(path, state.relative)
+            if listing.mtime_ns is None:
+                self._forget_tree(states, path, removed)
+                continue
+            
+            # 比较文件：消失的为删除，新出现的为新增，身份变化的为修改
+            current = {file_path: (file, st) for file_path, file, st in listing.files}
+            removed.extend(file_path for file_path in state.files if file_path not in current)
+            for file_path, (file, st) in current.items():
+                old = state.files.get(file_path)
+                if old is None:
+                    to_probe.append((file_path, file, st, False))
+                elif old != (st.st_size, st.st_mtime_ns, st.st_ino):
+                    to_probe.append((file_path, file, st, True))
+            
+            # 比较子目录：新出现的完整遍历，消失的连同其下所有文件一起删除
+            children = []
+            if self.walker.max_depth is None or state.depth < self.walker.max_depth:
+                for sub_path, sub_relative, identity in listing.subdirs:
+                    if sub_path not in states:
+                        if identity is not None and identity in known_identities:
+                            # 指向已遍历目录的符号链接
+                            continue
+                        for file_path, file, st in self.walker.walk(sub_path, record, sub_relative,
+                                                                    state.depth + 1):
+                            to_probe.append((file_path, file, st, False))
+                    children.append(sub_path)
+            for child in state.children:
+                if child not in children:
+                    self._forget_tree(states, child, removed)
+            
+            states[path] = _DirectoryState(state.relative, state.depth, listing, children)
+        
+        delta = ScanDelta(removed=removed)
+        try:
+            for (_, _, _, modified), video in zip(to_probe, self._probe_all(to_probe)):
+                (delta.modified if modified else delta.added).append(video)
+        finally:
+            if self.duration_cache is not None:
+                self.duration_cache.flush()
+        
+        self._snapshots[key] = states
+        return delta
+    
+    def _probe_all(self, items: List[Tuple[str, str, os.stat_result, bool]]) -> List[VideoFile]:
+        """
+        并行探测一批文件，结果顺序与输入一致
+        
+        Args:
+            items: (文件路径, 文件名, stat 结果, 是否为修改) 列表
+            
+        Returns:
+            List[VideoFile]: 视频文件实体
+        """
+        if self.max_workers == 1 or len(items) < 2:
+            return [self._probe_file(path, file, st) for path, file, st, _ in items]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda item: self._probe_file(*item[:3]), items))
+    
+    @staticmethod
+    def _forget_tree(states: Dict[str, _DirectoryState], path: str, removed: List[str]) -> None:
+        """
+        从目录状态中移除一个目录及其所有子目录，并记录其中的文件为已删除
+        
+        Args:
+            states: 目录状态
+            path: 目录路径
+            removed: 已删除文件路径列表，结果追加到其中
+        """
+        stack = [path]
+        while stack:
+            state = states.pop(stack.pop(), None)
+            if state is not None:
+                removed.extend(state.files)
+                stack.extend(state.children)
+    
+    @staticmethod
+    def _snapshot_key(directory: str) -> str:
+        """
+        计算根目录在扫描记录中的键
+        
+        Args:
+            directory: 根目录
+            
+        Returns:
+            str: 规范化后的绝对路径
+        """
+        return os.path.normcase(os.path.abspath(directory))
+    
+    def _probe_duration(self, file_path: str, stop_above: Optional[float]) -> float:
+        """
+        探测视频时长，子类可利用时长上限提前结束解析
+        
+        Args:
+            file_path: 视频文件路径
+            stop_above: 时长上限（可选）
+            
+        Returns:
+            float: 视频时长（秒），超过上限时可能只是大于上限的下界
+        """
+        return self.get_video_duration(file_path)
+    
+    @staticmethod
+    def _take_result(pending: deque) -> VideoFile:
         """
-        video_files = []
+        取出在途窗口中最早提交的探测结果
         
+        Args:
+            pending: 在途任务窗口
+            
+        Returns:
+            VideoFile: 视频文件实体
+        """
+        file_path, file, future = pending.popleft()
         try:
-            # 递归遍历目录
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    # 检查是否为MP4文件
-                    if file.lower().endswith('.mp4'):
-                        file_path = os.path.join(root, file)
-                        # 获取视频时长
-                        duration = self.get_video_duration(file_path)
-                        # 创建视频文件实体
-                        video_file = VideoFile(
-                            path=file_path,
-                            duration=duration,
-                            filename=file
-                        )
-                        video_files.append(video_file)
+            return future.result()
         except Exception:
-            # 如果发生错误，返回已收集的文件列表
-            pass
+            return VideoFile(path=file_path, duration=0.0, filename=file)
+    
+    def _probe_file(self, file_path: str, file: str,
+                    st: Optional[os.stat_result] = None,
+                    stop_above: Optional[float] = None) -> VideoFile:
+        """
+        探测单个文件并创建视频文件实体
+        
+        记录文件大小和修改时间；文件身份未变化时直接使用缓存的时长。
+        
+        Args:
+            file_path: 视频文件路径
+            file: 文件名
+            st: 遍历时已获取的 stat 结果（可选），未提供时重新获取
+            stop_above: 时长上限（可选），超过后可提前结束解析
+            
+        Returns:
+            VideoFile: 视频文件实体
+        """
+        try:
+            if st is None:
+                st = os.stat(file_path)
+        except OSError:
+            return VideoFile(path=file_path, duration=self.get_video_duration(file_path), filename=file)
+        
+        duration = None
+        if self.duration_cache is not None:
+            duration = self.duration_cache.get(file_path, st.st_size, st.st_mtime_ns, st.st_ino)
+        if duration is None:
+            duration = self._probe_duration(file_path, stop_above)
+            # 探测失败（0.0，可能只是暂时读取失败或 OpenCV 未安装）和超过上限的结果
+            # （可能是提前结束解析得到的下界）不写入缓存，下次扫描时重新探测
+            if (self.duration_cache is not None and duration > 0
+                    and (stop_above is None or duration <= stop_above)):
+                self.duration_cache.put(file_path, st.st_size, st.st_mtime_ns, st.st_ino, duration)
+        
+        return VideoFile(
+            path=file_path,
+            duration=duration,
+            filename=file,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns
+        )
+
+
+class Mp4BoxVideoRepositoryAdapter(OpenCVVideoRepositoryAdapter):
+    """
+    MP4 box 视频仓库适配器
+    
+    直接解析 MP4 容器头部（mvhd / mehd / mdhd / tkhd）获取精确时长，
+    只读取所需的少量字节；解析失败时回退到 OpenCV。
+    """
+    
+    def get_video_duration(self, file_path: str) -> float:
+        """
+        获取视频文件的时长
+        
+        Args:
+            file_path: 视频文件路径
+            
+        Returns:
+            float: 视频时长（秒），失败返回0
+        """
+        return self._probe_duration(file_path, None)
+    
+    def _probe_duration(self, file_path: str, stop_above: Optional[float]) -> float:
+        """
+        解析 MP4 头部获取时长，分片文件累加到超过上限时停止
+        
+        Args:
+            file_path: 视频文件路径
+            stop_above: 时长上限（可选）
+            
+        Returns:
+            float: 视频时长（秒），超过上限时可能只是大于上限的下界
+        """
+        try:
+            duration = parse_mp4_duration(file_path, stop_above)
+        except (OSError, ValueError, struct.error):
+            duration = None
+        
+        if duration and duration > 0:
+            return duration
         
-        return video_files
\ No newline at end of file
+        # 头部解析失败，回退到 OpenCV 解码器
+        return super().get_video_duration(file_path)
@@ -0,0 +1,142 @@
+"""
+传输顺序规划
+
+清洁架构的用例层，在执行传输前按选定策略排列文件顺序。
+机械硬盘上按扫描顺序读取的文件在盘面上分散，按物理位置排序可明显减少寻道。
+"""
+
+import os
+from collections import deque
+from typing import Dict, List, Optional
+from src.core.entities import VideoFile, TransferOrder
+from src.core.ports import FileSystemService
+
+
+class TransferPlanner:
+    """
+    传输顺序规划器
+    
+    排序是稳定的：无法确定位置或大小的文件保持原有的相对顺序，排在可排序的文件之后。
+    """
+    
+    POLICIES = (
+        TransferOrder.WALK,
+        TransferOrder.PHYSICAL,
+        TransferOrder.DIRECTORY,
+        TransferOrder.LARGEST_FIRST,
+        TransferOrder.SMALLEST_FIRST,
+        TransferOrder.INTERLEAVE,
+    )
+    
+    def __init__(self, file_system_service: FileSystemService):
+        """
+        初始化传输顺序规划器
+        
+        Args:
+            file_system_service: 文件系统服务接口（用于查询文件的设备和物理位置）
+        """
+        self.file_system_service = file_system_service
+    
+    def order(self, videos: List[VideoFile], policy: str = TransferOrder.WALK) -> List[VideoFile]:
+        """
+        按策略排列视频文件
+        
+        Args:
+            videos: 视频文件（扫描顺序）
+            policy: 排序策略，见 TransferOrder
+        
+        Returns:
+            List[VideoFile]: 排列后的新列表
+        
+        Raises:
+            ValueError: 不支持的策略
+        """
+        videos = list(videos)
+        if policy == TransferOrder.WALK:
+            return videos
+        if policy == TransferOrder.PHYSICAL:
+            return self._by_physical_location(videos)
+        if policy == TransferOrder.DIRECTORY:
+            return sorted(videos, key=lambda video: (os.path.dirname(video.path), video.filename))
+        if policy == TransferOrder.LARGEST_FIRST:
+            return self._by_size(videos, largest_first=True)
+        if policy == TransferOrder.SMALLEST_FIRST:
+            return self._by_size(videos, largest_first=False)
+        if policy == TransferOrder.INTERLEAVE:
+            return self._interleave_devices(self._by_physical_location(videos))
+        raise ValueError(f"不支持的传输顺序: {policy}")
+    
+    def _by_physical_location(self, videos: List[VideoFile]) -> List[VideoFile]:
+        """
+        按 (设备, 物理位置) 排序
+        
+        Args:
+            videos: 视频文件
+        
+        Returns:
+            List[VideoFile]: 排序后的列表，无法查询位置的文件排在最后
+        """
+        locations = [self.file_system_service.get_physical_location(video.path) for video in videos]
+        located = [(location, index) for index, location in enumerate(locations) if location is not None]
+        located.sort()
+        ordered = [videos[index] for _, index in located]
+        ordered.extend(video for video, location in zip(videos, locations) if location is None)
+        return ordered
+    
+    def _by_size(self, videos: List[VideoFile], largest_first: bool) -> List[VideoFile]:
+        """
+        按文件大小排序
+        
+        Args:
+            videos: 视频文件
+            largest_first: 是否大文件优先
+        
+        Returns:
+            List[VideoFile]: 排序后的列表，无法获取大小的文件排在最后
+        """
+        sizes = [self._size_of(video) for video in videos]
+        sized = [(-size if largest_first else size, index)
+                 for index, size in enumerate(sizes) if size is not None]
+        sized.sort()
+        ordered = [videos[index] for _, index in sized]
+        ordered.extend(video for video, size in zip(videos, sizes) if size is None)
+        return ordered
+    
+    def _interleave_devices(self, videos: List[VideoFile]) -> List[VideoFile]:
+        """
+        在源设备间轮流取文件，使多个设备同时保持忙碌；设备内保持原有顺序
+        
+        Args:
+            videos: 视频文件
+        
+        Returns:
+            List[VideoFile]: 交错后的列表
+        """
+        queues: Dict[Optional[int], deque] = {}
+        for video in videos:
+            device = self.file_system_service.get_device_id(video.path)
+            queues.setdefault(device, deque()).append(video)
+        
+        ordered = []
+        while queues:
+            for device in list(queues):
+                queue = queues[device]
+                ordered.append(queue.popleft())
+                if not queue:
+                    del queues[device]
+        return ordered
+    
+    def _size_of(self, video: VideoFile) -> Optional[int]:
+        """
+        获取文件大小，扫描时未记录则查询文件系统
+        
+        Args:
+            video: 视频文件
+        
+        Returns:
+            Optional[int]: 文件大小，无法获取时为None
+        """
+        if video.size is not None:
+            return video.size
+        signature = self.file_system_service.get_file_signature(video.path)
+        return signature[0] if signature is not None else None
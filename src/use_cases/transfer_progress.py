@@ -0,0 +1,170 @@
+"""
+传输进度跟踪
+
+清洁架构的用例层，汇总各工作线程上报的字节进度，计算速度和剩余时间，
+并限制进度事件的频率。
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional
+from src.core.entities import VideoFile, TransferProgress
+
+
+class _FileProgress:
+    """
+    单个正在传输的文件的进度
+    """
+    
+    __slots__ = ('video', 'size', 'done', 'initial', 'started')
+    
+    def __init__(self, video: VideoFile, size: int, done: int, started: float):
+        self.video = video
+        self.size = size
+        self.done = done
+        self.initial = done  # 从检查点继续时已存在的字节，不计入速度
+        self.started = started
+
+
+class TransferProgressTracker:
+    """
+    传输进度跟踪器（线程安全）
+    
+    整体速度使用时间加权的指数移动平均：每次采样的权重为 1 - exp(-Δt / τ)，
+    与采样频率无关；剩余时间 = 剩余字节数 / 平滑速度。
+    不经过复制循环的传输（重命名、硬链接、reflink）完成时计入进度，但不计入速度。
+    """
+    
+    def __init__(self,
+                 files_total: int,
+                 bytes_total: int,
+                 callback: Callable[[TransferProgress], None],
+                 min_interval: float = 0.2,
+                 time_constant: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        初始化进度跟踪器
+        
+        Args:
+            files_total: 文件总数
+            bytes_total: 需要传输的总字节数
+            callback: 进度回调，在上报进度的线程中调用
+            min_interval: 两次进度事件之间的最小间隔（秒），文件完成时的事件不受限制
+            time_constant: 速度平滑的时间常数 τ（秒）
+            clock: 时钟函数
+        """
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.callback = callback
+        self.min_interval = min_interval
+        self.time_constant = time_constant
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._active: Dict[int, _FileProgress] = {}
+        self._completed_bytes = 0
+        self._files_done = 0
+        self._rate = 0.0
+        self._rate_known = False
+        now = clock()
+        self._last_sample = now
+        self._sampled_bytes = 0
+        self._last_emit = now - min_interval
+    
+    def file_started(self, key: int, video: VideoFile, size: int, offset: int = 0) -> None:
+        """
+        开始传输一个文件
+        
+        Args:
+            key: 文件标识（如在计划中的下标）
+            video: 视频文件
+            size: 文件大小
+            offset: 从检查点继续时已传输的字节数
+        """
+        with self._lock:
+            self._active[key] = _FileProgress(video, size, offset, self.clock())
+    
+    def file_progress(self, key: int, done: int) -> None:
+        """
+        上报文件已传输的字节数（由复制循环调用）
+        
+        Args:
+            key: 文件标识
+            done: 该文件已传输的总字节数
+        """
+        with self._lock:
+            state = self._active.get(key)
+            if state is None or done <= state.done:
+                return
+            self._sampled_bytes += done - state.done
+            state.done = done
+            event = self._snapshot(state, force=False)
+        if event is not None:
+            self.callback(event)
+    
+    def file_finished(self, key: int, video: VideoFile, size: int, transferred: bool = True) -> None:
+        """
+        文件处理完毕（成功、失败或跳过）
+        
+        Args:
+            key: 文件标识
+            video: 视频文件
+            size: 文件大小
+            transferred: 是否传输了数据；为False（失败或跳过）时从总字节数中扣除
+        """
+        with self._lock:
+            state = self._active.pop(key, None) or _FileProgress(video, size, 0, self.clock())
+            if transferred:
+                if state.done > state.initial:
+                    # 复制循环最后一段之后不再上报进度，剩余部分也计入速度
+                    self._sampled_bytes += max(0, size - state.done)
+                self._completed_bytes += max(size, state.done)
+                state.done = max(size, state.done)
+            else:
+                self.bytes_total -= size
+            self._files_done += 1
+            event = self._snapshot(state, force=True)
+        self.callback(event)
+    
+    def _snapshot(self, state: _FileProgress, force: bool) -> Optional[TransferProgress]:
+        """
+        更新速度并生成进度事件（调用方持有锁）
+        
+        Args:
+            state: 触发事件的文件进度
+            force: 是否忽略频率限制
+        
+        Returns:
+            Optional[TransferProgress]: 进度事件，受频率限制时返回None
+        """
+        now = self.clock()
+        elapsed = now - self._last_sample
+        if elapsed > 0 and (self._sampled_bytes or elapsed >= self.min_interval):
+            instant = self._sampled_bytes / elapsed
+            if self._rate_known:
+                weight = 1.0 - math.exp(-elapsed / self.time_constant)
+                self._rate += weight * (instant - self._rate)
+            elif self._sampled_bytes:
+                self._rate, self._rate_known = instant, True
+            self._last_sample = now
+            self._sampled_bytes = 0
+        
+        if not force and now - self._last_emit < self.min_interval:
+            return None
+        self._last_emit = now
+        
+        bytes_done = self._completed_bytes + sum(active.done for active in self._active.values())
+        remaining = max(0, self.bytes_total - bytes_done)
+        file_elapsed = now - state.started
+        return TransferProgress(
+            video=state.video,
+            file_bytes=state.done,
+            file_size=state.size,
+            file_rate=(state.done - state.initial) / file_elapsed if file_elapsed > 0 else 0.0,
+            bytes_done=bytes_done,
+            bytes_total=self.bytes_total,
+            rate=self._rate,
+            eta=remaining / self._rate if self._rate > 0 else (0.0 if not remaining else None),
+            files_done=self._files_done,
+            files_total=self.files_total
+        )
@@ -0,0 +1,173 @@
+"""
+文件传输调度器
+
+清洁架构的用例层，在线程池上并发执行复制/移动任务，并按存储设备限制并发数。
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+from src.core.cancellation import CancellationToken
+from src.core.entities import VideoFile, TransferItemResult
+from src.core.ports import FileSystemService
+
+
+class TransferScheduler:
+    """
+    文件传输调度器
+    
+    按源设备和目标设备（st_dev）分别限制同时进行的传输数量，
+    避免多个并发流在同一块机械硬盘上相互争抢磁头。
+    结果回调始终在调用线程中按计划顺序触发。
+    """
+    
+    def __init__(self,
+                 file_system_service: FileSystemService,
+                 max_workers: int = 4,
+                 per_source_device: int = 1,
+                 per_destination_device: int = 1):
+        """
+        初始化传输调度器
+        
+        默认每个设备同时只进行一个传输，对机械硬盘是安全的；
+        SSD 阵列或 NAS 等可并行的设备可调大对应限制。
+        
+        Args:
+            file_system_service: 文件系统服务接口
+            max_workers: 线程池大小（同时进行的传输总数上限）
+            per_source_device: 每个源设备同时进行的传输数上限
+            per_destination_device: 每个目标设备同时进行的传输数上限
+        """
+        self.file_system_service = file_system_service
+        self.max_workers = max(1, max_workers)
+        self.per_source_device = max(1, per_source_device)
+        self.per_destination_device = max(1, per_destination_device)
+    
+    def run(self,
+            tasks: List[Tuple[VideoFile, str]],
+            transfer: Callable[[int, VideoFile, str], TransferItemResult],
+            result_callback: Optional[Callable[[TransferItemResult], None]] = None,
+            cancel_token: Optional[CancellationToken] = None
+            ) -> List[TransferItemResult]:
+        """
+        执行一批传输任务
+        
+        取消后不再派发新任务，尚未开始的任务直接得到 cancelled 结果；
+        正在进行的任务由 transfer 自行响应取消。
+        
+        Args:
+            tasks: (视频文件, 目标路径) 列表
+            transfer: 执行单个传输的函数 (任务下标, 视频文件, 目标路径)，在工作线程中调用
+            result_callback: 结果回调（可选），在调用线程中按任务顺序触发
+            cancel_token: 取消令牌（可选）
+        
+        Returns:
+            List[TransferItemResult]: 每个任务的结果，顺序与 tasks 一致
+        """
+        results: List[Optional[TransferItemResult]] = [None] * len(tasks)
+        if not tasks:
+            return []
+        
+        # 按 (源设备, 目标设备) 分组的待执行任务队列，组内保持计划顺序
+        queues: Dict[Tuple[Optional[int], Optional[int]], deque] = {}
+        dest_devices: Dict[str, Optional[int]] = {}
+        for index, (video, destination) in enumerate(tasks):
+            dest_dir = os.path.dirname(destination)
+            if dest_dir not in dest_devices:
+                dest_devices[dest_dir] = self.file_system_service.get_device_id(dest_dir)
+            key = (self.file_system_service.get_device_id(video.path), dest_devices[dest_dir])
+            queues.setdefault(key, deque()).append(index)
+        
+        source_in_flight: Dict[Optional[int], int] = {}
+        dest_in_flight: Dict[Optional[int], int] = {}
+        running = {}
+        next_to_report = 0
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while queues or running:
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    for queue in queues.values():
+                        for index in queue:
+                            video, destination = tasks[index]
+                            results[index] = TransferItemResult(video, destination, False, "已取消",
+                                                                cancelled=True)
+                    queues.clear()
+                
+                # 在设备并发限制内尽可能多地派发任务，优先派发计划中靠前的任务
+                while len(running) < self.max_workers:
+                    key = self._next_eligible_key(queues, source_in_flight, dest_in_flight)
+                    if key is None:
+                        break
+                    index = queues[key].popleft()
+                    if not queues[key]:
+                        del queues[key]
+                    source_in_flight[key[0]] = source_in_flight.get(key[0], 0) + 1
+                    dest_in_flight[key[1]] = dest_in_flight.get(key[1], 0) + 1
+                    video, destination = tasks[index]
+                    future = executor.submit(self._run_one, transfer, index, video, destination)
+                    running[future] = (index, key)
+                
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, key = running.pop(future)
+                    source_in_flight[key[0]] -= 1
+                    dest_in_flight[key[1]] -= 1
+                    results[index] = future.result()
+                
+                # 按计划顺序触发已完成任务的回调
+                while next_to_report < len(tasks) and results[next_to_report] is not None:
+                    if result_callback:
+                        result_callback(results[next_to_report])
+                    next_to_report += 1
+        
+        return results
+    
+    def _next_eligible_key(self,
+                           queues: Dict[Tuple[Optional[int], Optional[int]], deque],
+                           source_in_flight: Dict[Optional[int], int],
+                           dest_in_flight: Dict[Optional[int], int]
+                           ) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        """
+        选出设备仍有空闲并发名额、且队首任务在计划中最靠前的分组
+        
+        Args:
+            queues: 按设备分组的待执行任务
+            source_in_flight: 各源设备正在进行的传输数
+            dest_in_flight: 各目标设备正在进行的传输数
+        
+        Returns:
+            Optional[Tuple]: 分组键，没有可派发的任务时返回None
+        """
+        best_key = None
+        best_index = None
+        for key, queue in queues.items():
+            if source_in_flight.get(key[0], 0) >= self.per_source_device:
+                continue
+            if dest_in_flight.get(key[1], 0) >= self.per_destination_device:
+                continue
+            if best_index is None or queue[0] < best_index:
+                best_key, best_index = key, queue[0]
+        return best_key
+    
+    @staticmethod
+    def _run_one(transfer: Callable[[int, VideoFile, str], TransferItemResult],
+                 index: int,
+                 video: VideoFile,
+                 destination: str) -> TransferItemResult:
+        """
+        执行单个传输任务，异常转换为失败结果
+        
+        Args:
+            transfer: 执行传输的函数
+            index: 任务在 tasks 中的下标
+            video: 视频文件
+            destination: 目标路径
+        
+        Returns:
+            TransferItemResult: 传输结果
+        """
+        try:
+            return transfer(index, video, destination)
+        except Exception as e:
+            return TransferItemResult(video, destination, False, str(e))
@@ -4,9 +4,19 @@
 清洁架构的用例层，实现具体的业务逻辑，依赖于核心层的端口接口。
 """
 
-from typing import List, Optional
-from src.core.entities import VideoFile, FilterCriteria, FileOperationResult
-from src.core.ports import VideoFileRepository, FileSystemService
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from src.core.cancellation import CancellationToken, OperationCancelledError
+from src.core.entities import (
+    VideoFile, FilterCriteria, FileOperationResult, TransferMode, TransferPlan,
+    TransferItemResult, ScanDelta, TransferJob, TransferState, TransferOrder
+)
+from src.core.catalog import VideoCatalog
+from src.core.ports import VideoFileRepository, FileSystemService, TransferJournal
+from src.use_cases.transfer_planner import TransferPlanner
+from src.use_cases.transfer_progress import TransferProgressTracker
+from src.use_cases.transfer_scheduler import TransferScheduler
 
 
 class VideoFileProcessor:
@@ -16,105 +26,656 @@ class VideoFileProcessor:
     实现视频文件的查找、过滤、复制和移动等核心业务逻辑。
     """
     
+    # 传输结束后统计页缓存占用比例时最多抽取的文件数
+    RESIDENCY_SAMPLE_SIZE = 16
+    
+    # 同步模式比较修改时间的容差（纳秒）：FAT/exFAT 以 2 秒为单位保存修改时间，
+    # SMB 等以 100 纳秒为单位，复制后无法保留源文件的纳秒精度
+    SYNC_MTIME_TOLERANCE_NS = 2 * 1000 * 1000 * 1000
+    
     def __init__(self, 
                  video_repository: VideoFileRepository,
-                 file_system_service: FileSystemService):
+                 file_system_service: FileSystemService,
+                 transfer_scheduler: Optional[TransferScheduler] = None,
+                 transfer_journal: Optional[TransferJournal] = None):
         """
         初始化视频文件处理器
         
         Args:
             video_repository: 视频文件仓库接口
             file_system_service: 文件系统服务接口
+            transfer_scheduler: 传输调度器（可选），默认每个设备同时只进行一个传输
+            transfer_journal: 传输日志（可选），提供时传输可在中断后恢复
         """
         self.video_repository = video_repository
         self.file_system_service = file_system_service
+        self.transfer_scheduler = transfer_scheduler or TransferScheduler(file_system_service)
+        self.transfer_journal = transfer_journal
+        self.transfer_planner = TransferPlanner(file_system_service)
     
-    def get_videos_from_directory(self, directory: str) -> List[VideoFile]:
+    def get_videos_from_directory(self, directory: str,
+                                  criteria: Optional[FilterCriteria] = None,
+                                  cancel_token: Optional[CancellationToken] = None) -> List[VideoFile]:
         """
         从目录获取视频文件列表
         
         Args:
             directory: 要搜索的目录
+            criteria: 过滤条件（可选），在扫描时提前排除不符合的文件
+            cancel_token: 取消令牌（可选）
             
         Returns:
             List[VideoFile]: 视频文件列表
+        
+        Raises:
+            OperationCancelledError: 扫描被取消
+        """
+        return self.video_repository.find_mp4_files(directory, criteria, cancel_token)
+    
+    def get_catalog_from_directory(self, directory: str,
+                                   criteria: Optional[FilterCriteria] = None) -> VideoCatalog:
+        """
+        扫描目录并构建紧凑的视频目录
+        
+        扫描结果边产出边写入列式数组，不会保留逐个文件的 VideoFile 对象。
+        
+        Args:
+            directory: 要搜索的目录
+            criteria: 过滤条件（可选），在扫描时提前排除不符合的文件
+            
+        Returns:
+            VideoCatalog: 视频目录
+        """
+        catalog = VideoCatalog()
+        catalog.extend(self.iter_videos_from_directory(directory, criteria))
+        return catalog
+    
+    def iter_videos_from_directory(self, directory: str,
+                                   criteria: Optional[FilterCriteria] = None,
+                                   cancel_token: Optional[CancellationToken] = None) -> Iterator[VideoFile]:
+        """
+        从目录逐个获取视频文件
+        
+        Args:
+            directory: 要搜索的目录
+            criteria: 过滤条件（可选），在扫描时提前排除不符合的文件
+            cancel_token: 取消令牌（可选），暂停时扫描在下一个目录或文件前等待
+            
+        Yields:
+            VideoFile: 探测完成的视频文件
+        
+        Raises:
+            OperationCancelledError: 扫描被取消
+        """
+        return self.video_repository.iter_mp4_files(directory, criteria, cancel_token)
+    
+    def rescan_directory(self, directory: str) -> ScanDelta:
+        """
+        增量重新扫描目录
+        
+        只处理自上次扫描以来发生变化的部分；尚未扫描过的目录返回完整结果。
+        
+        Args:
+            directory: 要扫描的目录
+            
+        Returns:
+            ScanDelta: 扫描增量，可通过 VideoCatalog.apply_delta 合并到已有目录
         """
-        return self.video_repository.find_mp4_files(directory)
+        return self.video_repository.rescan_mp4_files(directory)
     
     def filter_videos_by_duration(self, 
-                                 videos: List[VideoFile],
+                                 videos: Union[List[VideoFile], VideoCatalog],
                                  min_duration: float = 0.0,
                                  max_duration: float = float('inf')) -> List[VideoFile]:
         """
         按时长过滤视频文件
         
+        传入 VideoCatalog 时使用其排序的时长索引，只需两次二分查找。
+        
         Args:
-            videos: 要过滤的视频文件列表
+            videos: 要过滤的视频文件列表或视频目录
             min_duration: 最小时长（左开区间）
             max_duration: 最大时长（右闭区间）
             
         Returns:
             List[VideoFile]: 符合条件的视频文件列表
         """
+        if isinstance(videos, VideoCatalog):
+            return videos.filter_by_duration(min_duration, max_duration)
+        
         criteria = FilterCriteria(min_duration, max_duration)
         return [video for video in videos if criteria.matches(video)]
     
-    def copy_filtered_videos(self, 
-                           input_dir: str,
-                           output_dir: str,
-                           min_duration: float = 0.0,
-                           max_duration: float = float('inf'),
-                           progress_callback=None) -> FileOperationResult:
+    def create_transfer_plan(self,
+                             videos: List[VideoFile],
+                             output_dir: str,
+                             mode: str = TransferMode.COPY,
+                             source_dir: Optional[str] = None,
+                             check_stale: bool = False,
+                             skip_identical: bool = False,
+                             full_hash: bool = False,
+                             verify: bool = False,
+                             order: str = TransferOrder.WALK) -> TransferPlan:
         """
-        复制符合条件的视频文件
+        根据已选定的视频文件创建传输计划
+        
+        文件按 order 指定的策略排列，之后按该顺序记录日志和执行。
+        输出目录是平铺的：与前面的文件目标文件名相同的文件不放入计划，记录在 conflicts 中，
+        否则后传输的文件会覆盖先传输的文件，并发传输时还会同时写入同一个临时文件。
         
         Args:
-            input_dir: 输入目录
+            videos: 要传输的视频文件（通常是已扫描并过滤后的列表）
             output_dir: 输出目录
-            min_duration: 最小时长
-            max_duration: 最大时长
+            mode: 传输方式，见 TransferMode
+            source_dir: 输入目录（可选，用于校验与输出目录不同）
+            check_stale: 传输前是否检查文件自扫描以来是否发生变化
+            skip_identical: 同步模式，目标已是相同文件时跳过（移动方式不适用）
+            full_hash: 同步模式下是否再比较完整文件哈希
+            verify: 是否校验传输结果并在输出目录写入校验清单（链接方式不适用）
+            order: 传输顺序策略，见 TransferOrder
+            
+        Returns:
+            TransferPlan: 传输计划
+            
+        Raises:
+            ValueError: 不支持的传输顺序策略
+        """
+        videos, conflicts = self.split_destination_conflicts(videos)
+        return TransferPlan(
+            videos=self.transfer_planner.order(videos, order),
+            output_dir=output_dir,
+            mode=mode,
+            source_dir=source_dir,
+            check_stale=check_stale,
+            skip_identical=skip_identical,
+            full_hash=full_hash,
+            verify=verify,
+            order=order,
+            conflicts=conflicts
+        )
+    
+    @staticmethod
+    def split_destination_conflicts(videos: List[VideoFile]) -> Tuple[List[VideoFile], List[VideoFile]]:
+        """
+        找出与前面的文件重名（会写入输出目录中同一个目标路径）的文件
+        
+        Args:
+            videos: 视频文件（扫描顺序，重名时保留第一个）
+            
+        Returns:
+            Tuple[List[VideoFile], List[VideoFile]]: (要传输的文件, 重名而不传输的文件)
+        """
+        seen = set()
+        unique: List[VideoFile] = []
+        conflicts: List[VideoFile] = []
+        for video in videos:
+            key = os.path.normcase(video.filename)
+            if key in seen:
+                conflicts.append(video)
+            else:
+                seen.add(key)
+                unique.append(video)
+        return unique, conflicts
+    
+    def execute_transfer_plan(self,
+                              plan: TransferPlan,
+                              progress_callback=None,
+                              byte_progress_callback=None,
+                              cancel_token: Optional[CancellationToken] = None) -> FileOperationResult:
+        """
+        按传输计划复制或移动视频文件
+        
+        直接使用计划中的文件列表，不会重新扫描输入目录。
+        配置了传输日志时，计划和每个文件的进度都会被记录，中断后可用
+        resume_interrupted_transfers 继续。
+        
+        暂停时正在复制的文件在下一个数据块前等待，尚未开始的文件不会开始；
+        取消时正在复制的文件的临时文件被删除，已完成的文件保留，
+        结果的 cancelled 为True。取消的任务保留在传输日志中，之后可以继续。
+        
+        Args:
+            plan: 传输计划
+            progress_callback: 进度回调函数 (可选)，每个文件完成后按计划顺序调用
+            byte_progress_callback: 字节进度回调函数 (可选)，参数为 TransferProgress，
+                                    在复制过程中从工作线程定期调用
+            cancel_token: 取消令牌（可选）
+            
+        Returns:
+            FileOperationResult: 操作结果
+        """
+        return self._run_transfer_plan(plan, None, progress_callback, byte_progress_callback,
+                                       cancel_token)
+    
+    def has_interrupted_transfers(self) -> bool:
+        """
+        是否存在上次运行中断、尚未完成的传输任务
+        
+        Returns:
+            bool: 存在返回True
+        """
+        return self.transfer_journal is not None and self.transfer_journal.has_unfinished()
+    
+    def resume_interrupted_transfers(self, progress_callback=None,
+                                     byte_progress_callback=None,
+                                     cancel_token: Optional[CancellationToken] = None
+                                     ) -> FileOperationResult:
+        """
+        继续所有中断的传输任务，只处理尚未完成的文件
+        
+        已部分写入的文件从最后一个检查点继续复制；
+        目标已完整存在（如中断发生在完成记录之前）的文件直接记为完成。
+        
+        Args:
             progress_callback: 进度回调函数 (可选)
+            byte_progress_callback: 字节进度回调函数 (可选)，每个任务单独统计
+            cancel_token: 取消令牌（可选），取消后不再继续后面的任务
+            
+        Returns:
+            FileOperationResult: 所有任务合并后的操作结果
+        """
+        if self.transfer_journal is None:
+            return FileOperationResult(False, "未启用传输日志，无法恢复")
+        
+        try:
+            jobs = self.transfer_journal.load_unfinished()
+        except Exception as e:
+            return FileOperationResult(False, f"读取传输日志失败: {str(e)}")
+        if not jobs:
+            return FileOperationResult(True, "没有未完成的传输任务", 0)
+        
+        success = True
+        count = 0
+        items: List[TransferItemResult] = []
+        messages = []
+        metrics: Dict[str, object] = {'order': [], 'files': 0, 'bytes': 0, 'elapsed': 0.0}
+        resumed = 0
+        for job in jobs:
+            if cancel_token is not None and cancel_token.is_cancelled:
+                break
+            
+            def job_progress(video, job_count, base=count):
+                if progress_callback:
+                    progress_callback(video, base + job_count)
+            
+            result = self._run_transfer_plan(job.plan, job, job_progress, byte_progress_callback,
+                                             cancel_token)
+            resumed += 1
+            success = success and result.success
+            count += result.count
+            items.extend(result.items)
+            messages.append(result.message)
+            if result.metrics:
+                metrics['order'].append(result.metrics['order'])
+                for key in ('files', 'bytes', 'elapsed'):
+                    metrics[key] += result.metrics[key]
+        
+        elapsed = metrics['elapsed']
+        metrics['throughput_mb_s'] = metrics['bytes'] / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+        cancelled = cancel_token is not None and cancel_token.is_cancelled
+        message = f"已继续 {resumed} 个中断的任务：" + "；".join(messages)
+        if cancelled and resumed < len(jobs):
+            message += f"；{len(jobs) - resumed} 个任务未开始"
+        return FileOperationResult(success, message, count, items, metrics, cancelled)
+    
+    def _run_transfer_plan(self,
+                           plan: TransferPlan,
+                           job: Optional[TransferJob],
+                           progress_callback=None,
+                           byte_progress_callback=None,
+                           cancel_token: Optional[CancellationToken] = None) -> FileOperationResult:
+        """
+        执行传输计划（新任务或从日志恢复的任务）
+        
+        Args:
+            plan: 传输计划
+            job: 从日志恢复的任务，新任务为None
+            progress_callback: 进度回调函数 (可选)
+            byte_progress_callback: 字节进度回调函数 (可选)
+            cancel_token: 取消令牌（可选）
             
         Returns:
             FileOperationResult: 操作结果
         """
+        if plan.mode == TransferMode.MOVE:
+            transfer, action = self.file_system_service.move_file, "移动"
+        elif plan.mode == TransferMode.COPY:
+            transfer, action = self.file_system_service.copy_file, "复制"
+        elif plan.mode == TransferMode.LINK:
+            def transfer(source_path: str, destination_path: str,
+                         resume_offset: int = 0, checkpoint=None, verify: bool = False,
+                         progress=None, cancel_token=None) -> bool:
+                return self.file_system_service.link_file(
+                    source_path, destination_path, plan.prefer_reflink
+                )
+            action = "链接"
+        else:
+            return FileOperationResult(False, f"不支持的传输方式: {plan.mode}")
+        
         try:
             # 确保输出目录存在
-            if not self.file_system_service.ensure_directory_exists(output_dir):
+            if not self.file_system_service.ensure_directory_exists(plan.output_dir):
                 return FileOperationResult(False, "无法创建输出目录")
             
             # 检查目录是否相同
-            if self.file_system_service.paths_are_equal(input_dir, output_dir):
+            if plan.source_dir and self.file_system_service.paths_are_equal(
+                    plan.source_dir, plan.output_dir):
                 return FileOperationResult(False, "输入目录和输出目录不能相同")
             
-            # 获取并过滤视频文件
-            videos = self.get_videos_from_directory(input_dir)
-            filtered_videos = self.filter_videos_by_duration(
-                videos, min_duration, max_duration
-            )
-            
             # 如果没有符合条件的文件
-            if not filtered_videos:
+            if not plan.videos:
                 return FileOperationResult(True, "没有符合要求的文件", 0)
             
-            # 执行复制操作
+            journal = self.transfer_journal
+            if job is None:
+                destinations = [os.path.join(plan.output_dir, video.filename) for video in plan.videos]
+                indices = list(range(len(plan.videos)))
+                offsets = [0] * len(plan.videos)
+                # 预写日志：开始传输前先持久化完整计划
+                job_id = journal.begin(plan, destinations) if journal is not None else None
+            else:
+                destinations = job.destinations
+                indices = job.pending_indices()
+                offsets = job.offsets
+                job_id = job.job_id
+            
+            verify = plan.verify and plan.mode != TransferMode.LINK
+            
+            tracker = None
+            if byte_progress_callback is not None:
+                sizes = {index: self._planned_size(plan.videos[index]) for index in indices}
+                tracker = TransferProgressTracker(len(indices), sum(sizes.values()), byte_progress_callback)
+            
+            def record(index: int, state: str, offset: int = 0, message: str = ""):
+                if job_id is not None:
+                    journal.record(job_id, index, state, offset, message)
+            
+            # 执行传输操作，回调按计划顺序触发
             success_count = 0
-            for video in filtered_videos:
-                destination = f"{output_dir}\{video.filename}"
-                if self.file_system_service.copy_file(video.path, destination):
+            
+            def transfer_one(position: int, video: VideoFile, destination: str) -> TransferItemResult:
+                try:
+                    if cancel_token is not None:
+                        # 暂停时在开始下一个文件之前等待
+                        cancel_token.checkpoint()
+                    item = transfer_item(position, video, destination)
+                except OperationCancelledError:
+                    # 不完整的输出已由文件系统服务删除，日志中该文件仍未完成
+                    item = TransferItemResult(video, destination, False, "已取消", cancelled=True)
+                if tracker is not None:
+                    index = indices[position]
+                    tracker.file_finished(index, video, sizes[index], item.success and not item.skipped)
+                return item
+            
+            def transfer_item(position: int, video: VideoFile, destination: str) -> TransferItemResult:
+                index = indices[position]
+                if job is not None and self._already_transferred(plan.mode, video, destination):
+                    record(index, TransferState.DONE)
+                    return TransferItemResult(video, destination, True, "上次运行中已完成")
+                if plan.check_stale and self._is_stale(video):
+                    record(index, TransferState.SKIPPED, message="文件自扫描后已变化")
+                    return TransferItemResult(video, destination, False, "文件自扫描后已变化", True)
+                if (plan.skip_identical and plan.mode != TransferMode.MOVE
+                        and self._is_up_to_date(video, destination, plan.full_hash)):
+                    record(index, TransferState.DONE)
+                    return TransferItemResult(video, destination, True, "已是最新", True, up_to_date=True)
+                
+                if job_id is not None:
+                    record(index, TransferState.STARTED)
+                    
+                    def checkpoint(offset: int):
+                        record(index, TransferState.STARTED, offset)
+                else:
+                    checkpoint = None
+                
+                # 提示文件系统预读下一个文件，与当前文件的传输重叠
+                if position + 1 < len(tasks):
+                    self.file_system_service.prefetch(tasks[position + 1][0].path)
+                
+                # 源文件自记录检查点后发生变化时，已写入的数据不再有效
+                resume_offset = offsets[index]
+                if resume_offset and not plan.check_stale and self._is_stale(video):
+                    resume_offset = 0
+                
+                if tracker is not None:
+                    tracker.file_started(index, video, sizes[index], resume_offset)
+                    
+                    def progress(done: int):
+                        tracker.file_progress(index, done)
+                else:
+                    progress = None
+                
+                if transfer(video.path, destination, resume_offset, checkpoint, verify, progress,
+                            cancel_token):
+                    record(index, TransferState.DONE)
+                    strategy = self.file_system_service.get_last_copy_strategy()
+                    checksum = self.file_system_service.get_last_checksum() if verify else None
+                    return TransferItemResult(video, destination, True, strategy=strategy,
+                                              checksum=checksum)
+                record(index, TransferState.FAILED, message=f"{action}失败")
+                return TransferItemResult(video, destination, False, f"{action}失败")
+            
+            def on_result(item: TransferItemResult):
+                nonlocal success_count
+                if item.success:
                     success_count += 1
                     if progress_callback:
-                        progress_callback(video, success_count)
+                        progress_callback(item.video, success_count)
             
-            return FileOperationResult(
-                True, 
-                f"成功复制 {success_count} 个文件",
-                success_count
-            )
+            tasks = [(plan.videos[index], destinations[index]) for index in indices]
+            started = time.monotonic()
+            items = self.transfer_scheduler.run(tasks, transfer_one, on_result, cancel_token)
+            metrics = self._transfer_metrics(plan, items, time.monotonic() - started)
+            
+            up_to_date_count = sum(1 for item in items if item.up_to_date)
+            transferred_count = success_count - up_to_date_count
+            message = f"成功{action} {transferred_count} 个文件"
+            stale_count = sum(1 for item in items if item.skipped and not item.success)
+            cancelled_count = sum(1 for item in items if item.cancelled)
+            failed_count = len(items) - success_count - stale_count - cancelled_count
+            if cancelled_count:
+                message = "已取消：" + message
+            if up_to_date_count:
+                message += f"，{up_to_date_count} 个文件已是最新，已跳过"
+            if stale_count:
+                message += f"，{stale_count} 个文件自扫描后已变化，已跳过"
+            if failed_count:
+                message += f"，{failed_count} 个文件{action}失败"
+            if cancelled_count:
+                message += f"，{cancelled_count} 个文件未处理"
+            if plan.conflicts:
+                message += f"，{len(plan.conflicts)} 个文件与其他文件重名，未传输"
+            if verify:
+                message += self._write_manifest(plan.output_dir, items)
+            if job_id is not None:
+                # 有失败或未处理的文件时保留日志，之后恢复时继续
+                journal.finish(job_id, completed=not failed_count and not cancelled_count)
+            return FileOperationResult(True, message, transferred_count, items, metrics,
+                                       cancelled=bool(cancelled_count))
             
         except Exception as e:
             return FileOperationResult(False, f"发生错误: {str(e)}")
     
+    def _transfer_metrics(self, plan: TransferPlan, items: List[TransferItemResult],
+                          elapsed: float) -> Dict[str, object]:
+        """
+        汇总一次传输的指标：使用的顺序策略、实际传输的文件数和字节数、耗时和吞吐量，
+        以及传输后源文件和目标文件留在页缓存中的平均比例（抽样统计，不支持时为None）
+        
+        Args:
+            plan: 传输计划
+            items: 传输结果
+            elapsed: 耗时（秒）
+            
+        Returns:
+            Dict[str, object]: 传输指标
+        """
+        transferred = [item for item in items if item.success and not item.skipped]
+        total_bytes = sum(item.video.size or 0 for item in transferred)
+        # 每个文件都要打开并映射一次，只均匀抽取少量文件统计
+        step = max(1, -(-len(transferred) // self.RESIDENCY_SAMPLE_SIZE))
+        sample = transferred[::step]
+        return {
+            'order': plan.order,
+            'files': len(transferred),
+            'bytes': total_bytes,
+            'elapsed': elapsed,
+            'throughput_mb_s': total_bytes / elapsed / (1024 * 1024) if elapsed > 0 else 0.0,
+            'source_cache_residency': self._average_residency(item.video.path for item in sample),
+            'destination_cache_residency': self._average_residency(item.destination for item in sample),
+        }
+    
+    def _average_residency(self, paths: Iterator[str]) -> Optional[float]:
+        """
+        计算一组文件留在页缓存中的平均比例
+        
+        Args:
+            paths: 文件路径
+            
+        Returns:
+            Optional[float]: 平均比例，没有可统计的文件时返回None
+        """
+        values = [
+            residency for residency in map(self.file_system_service.get_cache_residency, paths)
+            if residency is not None
+        ]
+        return sum(values) / len(values) if values else None
+    
+    def _write_manifest(self, output_dir: str, items: List[TransferItemResult]) -> str:
+        """
+        把本次校验通过的文件的校验值写入输出目录的清单
+        
+        Args:
+            output_dir: 输出目录
+            items: 传输结果
+            
+        Returns:
+            str: 追加到结果消息中的说明
+        """
+        checksums = {
+            os.path.basename(item.destination): item.checksum
+            for item in items if item.checksum
+        }
+        if not checksums:
+            return ""
+        manifest_path = self.file_system_service.write_checksum_manifest(output_dir, checksums)
+        if manifest_path is None:
+            return f"，{len(checksums)} 个文件校验通过，但校验清单写入失败"
+        return f"，{len(checksums)} 个文件校验通过，校验值已写入 {os.path.basename(manifest_path)}"
+    
+    def _planned_size(self, video: VideoFile) -> int:
+        """
+        获取计划传输的文件大小（扫描时记录的大小，未记录时查询文件系统）
+        
+        Args:
+            video: 视频文件
+            
+        Returns:
+            int: 文件大小，无法获取时为0
+        """
+        if video.size is not None:
+            return video.size
+        signature = self.file_system_service.get_file_signature(video.path)
+        return signature[0] if signature is not None else 0
+    
+    def _already_transferred(self, mode: str, video: VideoFile, destination: str) -> bool:
+        """
+        判断恢复的任务中某个文件是否已在上次运行中完成（完成记录未来得及写入）
+        
+        复制/链接的目标会保留源文件的大小和修改时间；移动时源文件已不存在且目标存在即为完成。
+        源文件仍存在的移动会重新执行（同盘重命名开销很小，跨盘复制则覆盖目标后删除源文件）。
+        
+        Args:
+            mode: 传输方式
+            video: 视频文件
+            destination: 目标路径
+            
+        Returns:
+            bool: 已完成返回True
+        """
+        destination_signature = self.file_system_service.get_file_signature(destination)
+        if destination_signature is None:
+            return False
+        source_signature = self.file_system_service.get_file_signature(video.path)
+        if source_signature is None:
+            return mode == TransferMode.MOVE
+        return mode != TransferMode.MOVE and source_signature == destination_signature
+    
+    def _is_up_to_date(self, video: VideoFile, destination: str, full_hash: bool) -> bool:
+        """
+        判断目标位置是否已有与源文件相同的文件（同步模式）
+        
+        依次比较大小和修改时间（允许 SYNC_MTIME_TOLERANCE_NS 的误差）、开头/中间/结尾的抽样指纹，
+        full_hash 为True时再比较完整哈希；前一步不一致即认为不同，
+        因此大多数文件只需两次 stat 和几 KB 的读取。
+        
+        Args:
+            video: 视频文件
+            destination: 目标路径
+            full_hash: 是否比较完整文件哈希
+            
+        Returns:
+            bool: 目标已是相同文件返回True
+        """
+        fs = self.file_system_service
+        destination_signature = fs.get_file_signature(destination)
+        if destination_signature is None:
+            return False
+        source_signature = fs.get_file_signature(video.path)
+        if source_signature is None or source_signature[0] != destination_signature[0]:
+            return False
+        if abs(source_signature[1] - destination_signature[1]) > self.SYNC_MTIME_TOLERANCE_NS:
+            return False
+        for full in ((False, True) if full_hash else (False,)):
+            fingerprint = fs.get_file_fingerprint(video.path, full)
+            if fingerprint is None or fingerprint != fs.get_file_fingerprint(destination, full):
+                return False
+        return True
+    
+    def _is_stale(self, video: VideoFile) -> bool:
+        """
+        判断视频文件自扫描以来是否已变化（被删除、大小或修改时间改变）
+        
+        Args:
+            video: 视频文件
+            
+        Returns:
+            bool: 已变化返回True
+        """
+        signature = self.file_system_service.get_file_signature(video.path)
+        if signature is None:
+            return True
+        if video.size is None or video.mtime_ns is None:
+            return False
+        return signature != (video.size, video.mtime_ns)
+    
+    def copy_filtered_videos(self, 
+                           input_dir: str,
+                           output_dir: str,
+                           min_duration: float = 0.0,
+                           max_duration: float = float('inf'),
+                           progress_callback=None,
+                           skip_identical: bool = False) -> FileOperationResult:
+        """
+        复制符合条件的视频文件
+        
+        会重新扫描输入目录；已持有扫描结果时应使用 execute_transfer_plan。
+        
+        Args:
+            input_dir: 输入目录
+            output_dir: 输出目录
+            min_duration: 最小时长
+            max_duration: 最大时长
+            progress_callback: 进度回调函数 (可选)
+            skip_identical: 目标已是相同文件时跳过（增量同步）
+            
+        Returns:
+            FileOperationResult: 操作结果
+        """
+        return self._transfer_filtered_videos(
+            TransferMode.COPY, input_dir, output_dir,
+            min_duration, max_duration, progress_callback, skip_identical
+        )
+    
     def move_filtered_videos(self, 
                            input_dir: str,
                            output_dir: str,
@@ -124,6 +685,8 @@ class VideoFileProcessor:
         """
         移动符合条件的视频文件
         
+        会重新扫描输入目录；已持有扫描结果时应使用 execute_transfer_plan。
+        
         Args:
             input_dir: 输入目录
             output_dir: 输出目录
@@ -134,39 +697,74 @@ class VideoFileProcessor:
         Returns:
             FileOperationResult: 操作结果
         """
-        try:
-            # 确保输出目录存在
-            if not self.file_system_service.ensure_directory_exists(output_dir):
-                return FileOperationResult(False, "无法创建输出目录")
-            
-            # 检查目录是否相同
-            if self.file_system_service.paths_are_equal(input_dir, output_dir):
-                return FileOperationResult(False, "输入目录和输出目录不能相同")
-            
-            # 获取并过滤视频文件
-            videos = self.get_videos_from_directory(input_dir)
-            filtered_videos = self.filter_videos_by_duration(
-                videos, min_duration, max_duration
-            )
-            
-            # 如果没有符合条件的文件
-            if not filtered_videos:
-                return FileOperationResult(True, "没有符合要求的文件", 0)
-            
-            # 执行移动操作
-            success_count = 0
-            for video in filtered_videos:
-                destination = f"{output_dir}\{video.filename}"
-                if self.file_system_service.move_file(video.path, destination):
-                    success_count += 1
-                    if progress_callback:
-                        progress_callback(video, success_count)
+        return self._transfer_filtered_videos(
+            TransferMode.MOVE, input_dir, output_dir,
+            min_duration, max_duration, progress_callback
+        )
+    
+    def link_filtered_videos(self,
+                             input_dir: str,
+                             output_dir: str,
+                             min_duration: float = 0.0,
+                             max_duration: float = float('inf'),
+                             progress_callback=None,
+                             skip_identical: bool = False) -> FileOperationResult:
+        """
+        以硬链接方式“虚拟复制”符合条件的视频文件
+        
+        同一文件系统内不复制数据、不占用额外空间；跨设备时回退为普通复制。
+        
+        Args:
+            input_dir: 输入目录
+            output_dir: 输出目录
+            min_duration: 最小时长
+            max_duration: 最大时长
+            progress_callback: 进度回调函数 (可选)
+            skip_identical: 目标已是相同文件时跳过（增量同步）
             
-            return FileOperationResult(
-                True, 
-                f"成功移动 {success_count} 个文件",
-                success_count
-            )
+        Returns:
+            FileOperationResult: 操作结果
+        """
+        return self._transfer_filtered_videos(
+            TransferMode.LINK, input_dir, output_dir,
+            min_duration, max_duration, progress_callback, skip_identical
+        )
+    
+    def _transfer_filtered_videos(self,
+                                  mode: str,
+                                  input_dir: str,
+                                  output_dir: str,
+                                  min_duration: float,
+                                  max_duration: float,
+                                  progress_callback,
+                                  skip_identical: bool = False) -> FileOperationResult:
+        """
+        扫描输入目录，过滤后按指定方式传输
+        
+        Args:
+            mode: 传输方式，见 TransferMode
+            input_dir: 输入目录
+            output_dir: 输出目录
+            min_duration: 最小时长
+            max_duration: 最大时长
+            progress_callback: 进度回调函数 (可选)
+            skip_identical: 目标已是相同文件时跳过（增量同步）
             
+        Returns:
+            FileOperationResult: 操作结果
+        """
+        # 检查目录是否相同（避免无意义的扫描）
+        if self.file_system_service.paths_are_equal(input_dir, output_dir):
+            return FileOperationResult(False, "输入目录和输出目录不能相同")
+        
+        try:
+            # 过滤条件下推到扫描阶段，不符合的文件不会被探测时长
+            criteria = FilterCriteria(min_duration, max_duration)
+            filtered_videos = self.get_videos_from_directory(input_dir, criteria)
         except Exception as e:
-            return FileOperationResult(False, f"发生错误: {str(e)}")
\ No newline at end of file
+            return FileOperationResult(False, f"发生错误: {str(e)}")
+        
+        plan = self.create_transfer_plan(
+            filtered_videos, output_dir, mode, input_dir, skip_identical=skip_identical
+        )
+        return self.execute_transfer_plan(plan, progress_callback)